@@ -0,0 +1,356 @@
+"""
+Local stand-in for the Tapdata manager API
+
+Serves a synthetic dataset over HTTP so the SDK can be benchmarked offline.
+Only the endpoints the SDK uses are emulated:
+
+    GET    /api/timeStamp
+    POST   /api/users/login
+    GET    /api/Connections            GET /api/Connections/{id}
+    GET    /api/Task                   GET /api/Task/{id}
+    PUT    /api/Task/batchStart        PUT /api/Task/batchStop
+    PATCH  /api/Task/batchRenew        DELETE /api/Task/batchDelete
+    POST   /api/MonitoringLogs/query
+
+Examples:
+    >>> with MockTapdataServer(tasks=2000, latency=0.005) as server:
+    ...     client = TapdataClient(server.url, access_token=server.token)
+    ...     client.tasks.list_all()
+"""
+import gzip
+import json
+import random
+import re
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+
+DATABASE_TYPES = ["Mysql", "Clickhouse", "MongoDB", "PostgreSQL", "Oracle"]
+TASK_STATUSES = ["running", "stop", "error", "complete", "wait_start"]
+LOG_LEVELS = ["INFO", "INFO", "INFO", "WARN", "ERROR"]
+
+
+@dataclass
+class Dataset:
+    """
+    Synthetic dataset served by the mock server
+
+    Args:
+        tasks: Number of tasks
+        connections: Number of connections
+        nodes_per_task: DAG nodes per task (first is the source, last the target)
+        tables_per_task: Tables in the target node's tableNameRelation
+        log_interval_ms: Spacing of generated log records per task
+    """
+    tasks: int = 1000
+    connections: int = 50
+    nodes_per_task: int = 2
+    tables_per_task: int = 20
+    log_interval_ms: int = 100
+
+
+def _match(value, condition) -> bool:
+    """Evaluate one Loopback/Mongo-style where condition"""
+    if not isinstance(condition, dict):
+        return value == condition
+    for op, expected in condition.items():
+        if op in ("$in", "inq") and value not in expected:
+            return False
+        if op in ("$nin", "nin") and value in expected:
+            return False
+        if op in ("$ne", "neq") and value == expected:
+            return False
+        if op in ("$gt", "gt") and not (value is not None and value > expected):
+            return False
+        if op in ("$gte", "gte") and not (value is not None and value >= expected):
+            return False
+        if op in ("$lt", "lt") and not (value is not None and value < expected):
+            return False
+        if op in ("$lte", "lte") and not (value is not None and value <= expected):
+            return False
+        if op in ("like", "$regex"):
+            flags = re.I if condition.get("options") == "i" else 0
+            if value is None or not re.search(str(expected), str(value), flags):
+                return False
+    return True
+
+
+def _where(item: dict, where: dict) -> bool:
+    for key, condition in where.items():
+        if key == "and":
+            if not all(_where(item, sub) for sub in condition):
+                return False
+        elif key == "or":
+            if not any(_where(item, sub) for sub in condition):
+                return False
+        elif not _match(item.get(key), condition):
+            return False
+    return True
+
+
+class MockTapdataServer:
+    """
+    Threaded HTTP server emulating the Tapdata API
+
+    Args:
+        dataset: Dataset description (defaults to Dataset())
+        latency: Seconds added to every request
+        jitter: Random extra seconds (0..jitter) added to every request
+        host: Bind address
+        port: Bind port (0 = pick a free port)
+        compress: Gzip responses of clients accepting it
+        **dataset_kwargs: Shortcut for Dataset fields, e.g. tasks=5000
+    """
+
+    token = "benchmark-token"
+
+    def __init__(
+        self,
+        dataset: Optional[Dataset] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        compress: bool = True,
+        **dataset_kwargs,
+    ):
+        self.dataset = dataset or Dataset(**dataset_kwargs)
+        self.latency = latency
+        self.jitter = jitter
+        self.compress = compress
+        self.request_count = 0
+        # Response body bytes written to the socket
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._build()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "MockTapdataServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Shut the server down"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _build(self) -> None:
+        data = self.dataset
+        base = 1_700_000_000_000
+        self.connections: Dict[str, dict] = {}
+        for i in range(data.connections):
+            conn_id = f"{i:024x}"
+            self.connections[conn_id] = {
+                "id": conn_id,
+                "name": f"connection-{i}",
+                "connection_type": "source" if i % 2 == 0 else "target",
+                "database_type": DATABASE_TYPES[i % len(DATABASE_TYPES)],
+                "status": "ready",
+                "createType": "User",
+                "last_updated": base + i * 1000,
+                "config": {
+                    "host": f"db-{i}.example.internal",
+                    "port": 3306,
+                    "database": f"db_{i}",
+                    "user": "sync",
+                },
+            }
+
+        conn_ids = list(self.connections)
+        self.tasks: Dict[str, dict] = {}
+        for i in range(data.tasks):
+            task_id = f"{i + 1_000_000:024x}"
+            nodes = []
+            for n in range(data.nodes_per_task):
+                node = {
+                    "id": f"{task_id}-node{n}",
+                    "name": f"node-{n}",
+                    "connectionId": conn_ids[(i + n) % len(conn_ids)] if conn_ids else None,
+                    "attrs": {"connectionName": f"connection-{(i + n) % max(len(conn_ids), 1)}"},
+                }
+                if n == data.nodes_per_task - 1:
+                    node["syncObjects"] = [{
+                        "type": "table",
+                        "tableNameRelation": {
+                            f"table_{t}": f"table_{t}_copy" for t in range(data.tables_per_task)
+                        },
+                    }]
+                nodes.append(node)
+            self.tasks[task_id] = {
+                "id": task_id,
+                "name": f"task-{i}",
+                "type": "initial_sync+cdc" if i % 3 else "initial_sync",
+                "status": TASK_STATUSES[i % len(TASK_STATUSES)],
+                "taskRecordId": f"{i + 2_000_000:024x}",
+                "last_updated": base + i * 1000,
+                "dag": {"nodes": nodes, "edges": []},
+            }
+
+    # --- request handling -------------------------------------------------
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # Headers and body are written separately; without this,
+                # Nagle + delayed ACK adds ~40 ms to every response
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def log_message(self, *args):
+                pass
+
+            def _dispatch(self):
+                with server._lock:
+                    server.request_count += 1
+                delay = server.latency + random.random() * server.jitter
+                if delay:
+                    time.sleep(delay)
+
+                parts = urlsplit(self.path)
+                query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                status, payload = server.handle(self.command, parts.path, query, body)
+
+                raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+                accepted = self.headers.get("Accept-Encoding") or ""
+                gzipped = server.compress and "gzip" in accepted
+                if gzipped:
+                    raw = gzip.compress(raw, compresslevel=6)
+                with server._lock:
+                    server.bytes_sent += len(raw)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                if gzipped:
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _dispatch
+
+        return Handler
+
+    def handle(self, method: str, path: str, query: dict, body: Optional[dict]):
+        """Route one request, returning (HTTP status, JSON payload)"""
+        if path == "/api/timeStamp":
+            return 200, {"code": "ok", "data": int(time.time() * 1000)}
+        if path == "/api/users/login" and method == "POST":
+            return 200, {"code": "ok", "data": {
+                "id": self.token,
+                "ttl": 1209600,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime()),
+                "userId": "benchmark-user",
+            }}
+
+        if query.get("access_token") != self.token:
+            return 401, {"code": "UNAUTHORIZED", "message": "Access token required"}
+
+        if path == "/api/MonitoringLogs/query" and method == "POST":
+            return 200, self._logs(body or {})
+
+        match = re.fullmatch(r"/api/(Task|Connections)(?:/(\w+))?", path)
+        if not match:
+            return 404, {"code": "NotFound", "message": path}
+        collection = self.tasks if match.group(1) == "Task" else self.connections
+        item_id = match.group(2)
+
+        if item_id and item_id.startswith("batch"):
+            return 200, self._batch(item_id, query.get("taskIds", ""))
+        if item_id:
+            item = collection.get(item_id)
+            if item is None:
+                return 200, {"code": "NotFound", "message": f"{item_id} not found"}
+            fields = json.loads(query["filter"]).get("fields") if "filter" in query else None
+            return 200, {"code": "ok", "data": self._project(item, fields)}
+        return 200, self._list(collection, json.loads(query.get("filter", "{}")))
+
+    def _project(self, item: dict, fields: Optional[dict]) -> dict:
+        if not fields:
+            return item
+        return {k: v for k, v in item.items() if fields.get(k) or k == "id"}
+
+    def _list(self, collection: Dict[str, dict], query: dict) -> dict:
+        items: List[dict] = [i for i in collection.values() if _where(i, query.get("where") or {})]
+        order = query.get("order") or []
+        # Stable sorts from the last key to the first apply every key
+        for clause in reversed([order] if isinstance(order, str) else order):
+            field, _, direction = clause.partition(" ")
+            items.sort(key=lambda i: i.get(field) or 0, reverse=direction.upper() == "DESC")
+        skip = int(query.get("skip", 0))
+        limit = int(query.get("limit", 20))
+        page = [self._project(i, query.get("fields")) for i in items[skip:skip + limit]]
+        return {"code": "ok", "data": {"items": page, "total": len(items)}}
+
+    def _batch(self, action: str, task_ids: str) -> dict:
+        new_status = {
+            "batchStart": "running",
+            "batchStop": "stop",
+            "batchRenew": "wait_start",
+            "batchDelete": "deleted",
+        }.get(action)
+        results = []
+        for task_id in filter(None, task_ids.split(",")):
+            task = self.tasks.get(task_id)
+            if task is None:
+                results.append({"id": task_id, "code": "Task.NotFound", "message": "not found"})
+                continue
+            if action == "batchDelete":
+                del self.tasks[task_id]
+            elif new_status:
+                task["status"] = new_status
+                task["last_updated"] = int(time.time() * 1000)
+            results.append({"id": task_id, "code": "ok"})
+        return {"code": "ok", "data": results}
+
+    def _logs(self, body: dict) -> dict:
+        task = self.tasks.get(body.get("taskId"))
+        if task is None:
+            return {"code": "ok", "data": {"items": [], "total": 0}}
+        interval = self.dataset.log_interval_ms
+        start, end = int(body["start"]), int(body["end"])
+        first = -(-start // interval) * interval
+        total = max((end - first) // interval + 1, 0)
+        page, page_size = int(body.get("page", 1)), int(body.get("pageSize", 20))
+        offset = (page - 1) * page_size
+        items = []
+        descending = body.get("order") == "desc"
+        for index in range(offset, min(offset + page_size, total)):
+            timestamp = first + (total - 1 - index if descending else index) * interval
+            items.append({
+                "taskId": task["id"],
+                "taskRecordId": body.get("taskRecordId"),
+                "taskName": task["name"],
+                "nodeId": task["dag"]["nodes"][0]["id"],
+                "nodeName": task["dag"]["nodes"][0]["name"],
+                "level": LOG_LEVELS[(timestamp // interval) % len(LOG_LEVELS)],
+                "message": f"processed batch {timestamp // interval} of {task['name']}",
+                "timestamp": timestamp,
+                "date": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(timestamp / 1000)),
+            })
+        return {"code": "ok", "data": {"items": items, "total": total}}
@@ -0,0 +1,372 @@
+"""
+Offline SDK benchmarks
+
+Starts a MockTapdataServer, runs every scenario against the sync client
+(serial and parallel helpers), one sync client shared by a growing number
+of threads, and the async client, and writes the results as JSON.
+
+Usage:
+    python -m benchmarks.run --tasks 5000 --latency 0.005 --output results.json
+    python -m benchmarks.run --baseline previous.json --threshold 0.2
+    python -m benchmarks.run --latency 0.05 --compression auto
+
+With --baseline, scenarios more than --threshold slower than the baseline
+are reported and the exit status is 1.
+"""
+import argparse
+import asyncio
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from tapdata_sdk import TapdataClient, __version__
+
+from .mock_server import Dataset, MockTapdataServer
+
+try:
+    from tapdata_sdk.async_client import AsyncTapdataClient
+except ImportError:
+    AsyncTapdataClient = None
+
+
+@dataclass
+class Config:
+    """Benchmark parameters"""
+    tasks: int = 2000
+    connections: int = 50
+    nodes_per_task: int = 2
+    tables_per_task: int = 20
+    latency: float = 0.002
+    jitter: float = 0.0
+    repeat: int = 5
+    sample: int = 100
+    page_size: int = 100
+    max_workers: int = 8
+    log_window_ms: int = 60_000
+    log_interval_ms: int = 100
+    codec: str = "auto"
+    # Client compression setting; the server gzips when it is accepted
+    compression: str = "identity"
+    threads: str = "1,2,4,8,16"
+
+
+@dataclass
+class Result:
+    """Measurements of one scenario"""
+    name: str
+    client: str
+    runs: int
+    items: int
+    requests: int
+    response_bytes: int
+    seconds: float
+    runs_per_sec: float
+    items_per_sec: float
+    latency: Dict[str, float] = field(default_factory=dict)
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    return {
+        "min": ordered[0],
+        "mean": statistics.mean(ordered),
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "max": ordered[-1],
+    }
+
+
+def _result(
+    name: str,
+    client: str,
+    samples: List[float],
+    items: int,
+    requests: int,
+    response_bytes: int = 0,
+) -> Result:
+    seconds = sum(samples)
+    result = Result(
+        name=name,
+        client=client,
+        runs=len(samples),
+        items=items,
+        requests=requests,
+        response_bytes=response_bytes,
+        seconds=seconds,
+        runs_per_sec=len(samples) / seconds if seconds else 0.0,
+        items_per_sec=items / seconds if seconds else 0.0,
+        latency=_summary(samples),
+    )
+    print(
+        f"{client:>6} {name:<34} {result.latency['p50'] * 1000:9.1f} ms p50 "
+        f"{result.items_per_sec:11.1f} items/s {result.requests:7d} requests "
+        f"{result.response_bytes / 1024:10.1f} KiB",
+        file=sys.stderr,
+    )
+    return result
+
+
+def _measure(
+    server: MockTapdataServer,
+    name: str,
+    client: str,
+    repeat: int,
+    run: Callable[[], int],
+) -> Result:
+    """Run a scenario repeat times; run() returns the number of items it handled"""
+    samples = []
+    items = 0
+    requests_before = server.request_count
+    bytes_before = server.bytes_sent
+    for _ in range(repeat):
+        started = time.perf_counter()
+        items += run()
+        samples.append(time.perf_counter() - started)
+    return _result(
+        name, client, samples, items,
+        server.request_count - requests_before, server.bytes_sent - bytes_before,
+    )
+
+
+def run_sync(server: MockTapdataServer, config: Config) -> List[Result]:
+    """Scenarios for TapdataClient"""
+    results = []
+    client = TapdataClient(
+        server.url,
+        access_token=server.token,
+        codec=config.codec,
+        compression=config.compression,
+    )
+    task_ids = list(server.tasks)[:config.sample]
+    task = server.tasks[task_ids[0]]
+    log_end = int(time.time() * 1000)
+    log_start = log_end - config.log_window_ms
+
+    def bench(name: str, run: Callable[[], int]) -> None:
+        results.append(_measure(server, name, "sync", config.repeat, run))
+
+    with client:
+        bench("tasks.list", lambda: len(client.tasks.list(limit=config.page_size)))
+        bench("tasks.stream", lambda: sum(
+            1 for _ in client.tasks.stream(limit=config.page_size)
+        ))
+        bench("tasks.list_all", lambda: len(client.tasks.list_all(page_size=config.page_size)))
+        bench("tasks.iter_all[prefetch]", lambda: sum(
+            1 for _ in client.tasks.iter_all(page_size=config.page_size, prefetch=True)
+        ))
+        bench("connections.list_all", lambda: len(
+            client.connections.list_all(page_size=config.page_size)
+        ))
+        bench("tasks.get_table_relation[serial]", lambda: len(
+            [client.tasks.get_table_relation(task_id) for task_id in task_ids]
+        ))
+        bench("tasks.get_table_relations", lambda: len(
+            client.tasks.get_table_relations(task_ids, max_workers=config.max_workers)
+        ))
+        bench("tasks.iter_logs", lambda: sum(1 for _ in client.tasks.iter_logs(
+            task["id"], task["taskRecordId"], log_start, log_end, page_size=config.page_size,
+        )))
+        bench("tasks.export_logs", lambda: client.tasks.export_logs(
+            task["id"], task["taskRecordId"], log_start, log_end, io.StringIO(),
+            shard_ms=max(config.log_window_ms // config.max_workers, 1),
+            max_workers=config.max_workers, page_size=config.page_size,
+        ))
+        bench("tasks.tail_logs[catch-up]", lambda: sum(1 for _ in client.tasks.tail_logs(
+            task["id"], task["taskRecordId"], start=int(time.time() * 1000) - config.log_window_ms,
+            page_size=config.page_size, min_interval=0.01, timeout=0.05,
+        )))
+        bench("reports.inventory", lambda: len(
+            client.reports.inventory(max_workers=config.max_workers).tasks
+        ))
+        bench("tasks.stop[serial]", lambda: len(
+            [client.tasks.stop(task_id) for task_id in task_ids]
+        ))
+        bench("tasks.stop_many", lambda: len(client.tasks.stop_many(task_ids)))
+
+    return results
+
+
+def run_threads(server: MockTapdataServer, config: Config) -> List[Result]:
+    """One shared TapdataClient serving tasks.get calls from N threads"""
+    results = []
+    task_ids = list(server.tasks)[:config.sample]
+    counts = [int(count) for count in config.threads.split(",") if count.strip()]
+    client = TapdataClient(
+        server.url,
+        access_token=server.token,
+        codec=config.codec,
+        compression=config.compression,
+        pool_maxsize=max(counts + [1]),
+    )
+
+    with client:
+        for count in counts:
+            with ThreadPoolExecutor(max_workers=count) as executor:
+                def run() -> int:
+                    return len(list(executor.map(client.tasks.get, task_ids)))
+
+                results.append(_measure(
+                    server, f"tasks.get[threads={count}]", "shared", config.repeat, run,
+                ))
+
+    return results
+
+
+def run_async(server: MockTapdataServer, config: Config) -> List[Result]:
+    """Scenarios for AsyncTapdataClient"""
+    results = []
+    task_ids = list(server.tasks)[:config.sample]
+    task = server.tasks[task_ids[0]]
+    log_end = int(time.time() * 1000)
+    log_start = log_end - config.log_window_ms
+
+    def scenarios(client: "AsyncTapdataClient") -> Dict[str, Callable]:
+        async def iter_logs() -> int:
+            count = 0
+            async for _ in client.tasks.iter_logs(
+                task["id"], task["taskRecordId"], log_start, log_end,
+                page_size=config.page_size,
+            ):
+                count += 1
+            return count
+
+        async def list_all() -> int:
+            return len(await client.tasks.list_all(page_size=config.page_size))
+
+        async def relations() -> int:
+            return len(await client.tasks.get_table_relations(
+                task_ids, max_concurrency=config.max_workers * 4,
+            ))
+
+        async def inventory() -> int:
+            return len((await client.reports.inventory(
+                max_concurrency=config.max_workers * 4,
+            )).tasks)
+
+        async def stop_many() -> int:
+            return len(await client.tasks.stop_many(task_ids))
+
+        return {
+            "tasks.list_all": list_all,
+            "tasks.get_table_relations": relations,
+            "tasks.iter_logs": iter_logs,
+            "reports.inventory": inventory,
+            "tasks.stop_many": stop_many,
+        }
+
+    async def main() -> None:
+        async with AsyncTapdataClient(
+            server.url, access_token=server.token, codec=config.codec,
+            compression=config.compression,
+        ) as client:
+            for name, scenario in scenarios(client).items():
+                samples = []
+                items = 0
+                requests_before = server.request_count
+                bytes_before = server.bytes_sent
+                for _ in range(config.repeat):
+                    started = time.perf_counter()
+                    items += await scenario()
+                    samples.append(time.perf_counter() - started)
+                results.append(_result(
+                    name, "async", samples, items,
+                    server.request_count - requests_before,
+                    server.bytes_sent - bytes_before,
+                ))
+
+    asyncio.run(main())
+    return results
+
+
+def compare(results: List[dict], baseline: List[dict], threshold: float) -> List[str]:
+    """
+    Find scenarios whose median latency regressed against a baseline
+
+    Returns:
+        One message per regression
+    """
+    previous = {(r["client"], r["name"]): r for r in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get((result["client"], result["name"]))
+        if not before or not before["latency"]["p50"]:
+            continue
+        ratio = result["latency"]["p50"] / before["latency"]["p50"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{result['client']} {result['name']}: p50 {ratio:.2f}x the baseline"
+            )
+    return regressions
+
+
+def run(config: Config) -> dict:
+    """Run every scenario and return the JSON report"""
+    dataset = Dataset(
+        tasks=config.tasks,
+        connections=config.connections,
+        nodes_per_task=config.nodes_per_task,
+        tables_per_task=config.tables_per_task,
+        log_interval_ms=config.log_interval_ms,
+    )
+    results: List[Result] = []
+    # Every client gets a fresh server so mutations do not leak between runs
+    with MockTapdataServer(dataset, latency=config.latency, jitter=config.jitter) as server:
+        results += run_sync(server, config)
+        results += run_threads(server, config)
+    if AsyncTapdataClient is not None:
+        with MockTapdataServer(dataset, latency=config.latency, jitter=config.jitter) as server:
+            results += run_async(server, config)
+
+    return {
+        "meta": {
+            "sdk_version": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "config": asdict(config),
+        },
+        "results": [asdict(result) for result in results],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    for name, default in asdict(Config()).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(default), default=default)
+    parser.add_argument("--output", help="Write the JSON report to this file (default: stdout)")
+    parser.add_argument("--baseline", help="Previous JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed p50 slowdown against the baseline (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    config = Config(**{name: getattr(args, name) for name in asdict(Config())})
+    report = run(config)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report["results"], json.load(f)["results"], args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,8 +19,27 @@ Examples:
     >>> # Operate tasks
     >>> client.tasks.stop(tasks[0].id)
 """
+import importlib.util
+
 from .client import TapdataClient, ConnectionClient, TaskClient
-from .models import Connection, Task, TaskLog, TaskDetail, TaskRelation
+from .models import (
+    Connection,
+    Task,
+    TaskLog,
+    TaskDetail,
+    TaskRelation,
+    TaskOperationResult,
+    TaskStatusChange,
+    TaskLogBatch,
+    SlottedConnection,
+    SlottedTask,
+    SlottedTaskDetail,
+    SlottedTaskLog,
+    FrozenConnection,
+    FrozenTask,
+    FrozenTaskDetail,
+    FrozenTaskLog,
+)
 from .enums import ConnectionType, DatabaseType, Status, LogLevel
 from .exceptions import (
     TapdataError,
@@ -28,10 +47,36 @@ from .exceptions import (
     TapdataConnectionError,
     TapdataValidationError,
     TapdataTimeoutError,
+    TapdataHTTPError,
+    TapdataTaskStateError,
 )
+from .query import Query
+from .watcher import TaskWatcher, AsyncTaskWatcher
+from .snapshot import RefreshStats, SnapshotStore
+from .reports import Inventory, InventoryTask, ReportClient, AsyncReportClient
+from .auth import (
+    FileTokenStore,
+    KeyringTokenStore,
+    MemoryTokenStore,
+    StoredToken,
+    TokenStore,
+)
+from .retry import RetryPolicy
 
 __version__ = "0.2.0"
 
+# Clients of the asyncio module, which depends on the optional aiohttp package
+_ASYNC_CLIENTS = ("AsyncTapdataClient", "AsyncConnectionClient", "AsyncTaskClient")
+
+
+def __getattr__(name):
+    # The asyncio clients are only imported when first accessed
+    if name in _ASYNC_CLIENTS:
+        from . import async_client
+        return getattr(async_client, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     # Client
     "TapdataClient",
@@ -41,6 +86,17 @@ __all__ = [
     "Connection",
     "Task",
     "TaskLog",
+    "TaskOperationResult",
+    "TaskStatusChange",
+    "TaskLogBatch",
+    "SlottedConnection",
+    "SlottedTask",
+    "SlottedTaskDetail",
+    "SlottedTaskLog",
+    "FrozenConnection",
+    "FrozenTask",
+    "FrozenTaskDetail",
+    "FrozenTaskLog",
     # Enums
     "ConnectionType",
     "DatabaseType",
@@ -52,4 +108,31 @@ __all__ = [
     "TapdataConnectionError",
     "TapdataValidationError",
     "TapdataTimeoutError",
+    "TapdataHTTPError",
+    "TapdataTaskStateError",
+    # Queries
+    "Query",
+    # Watchers
+    "TaskWatcher",
+    "AsyncTaskWatcher",
+    # Snapshots
+    "SnapshotStore",
+    "RefreshStats",
+    # Reports
+    "ReportClient",
+    "AsyncReportClient",
+    "Inventory",
+    "InventoryTask",
+    # Authentication
+    "TokenStore",
+    "MemoryTokenStore",
+    "FileTokenStore",
+    "KeyringTokenStore",
+    "StoredToken",
+    # Configuration
+    "RetryPolicy",
 ]
+
+# Star-imports only include the asyncio clients when aiohttp can be imported
+if importlib.util.find_spec("aiohttp") is not None:
+    __all__ += _ASYNC_CLIENTS
@@ -0,0 +1,391 @@
+"""
+Transport-agnostic parts of the Tapdata API
+
+Request filters and bodies, response parsing and retry decisions shared by
+TapdataClient and AsyncTapdataClient, which only differ in how requests are
+sent.
+"""
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Union
+
+from .codec import JSONCodec
+from .enums import ConnectionType, DatabaseType, LogLevel, Status
+from .exceptions import (
+    TapdataAuthError,
+    TapdataError,
+    TapdataHTTPError,
+    TapdataTaskStateError,
+    TapdataTimeoutError,
+)
+from .models import Connection, Task, TaskLog, TaskOperationResult, TaskRelation
+from .query import Query
+from .retry import RetryPolicy
+from .utils import build_filter
+
+
+logger = logging.getLogger(__name__)
+
+
+def encode_params(
+    params: Optional[dict],
+    access_token: Optional[str],
+    codec: JSONCodec,
+) -> dict:
+    """Build URL parameters with the access token and a serialized filter"""
+    params = dict(params or {})
+    
+    # Add access_token
+    if access_token:
+        params["access_token"] = access_token
+    
+    if params.get("filter"):
+        params["filter"] = codec.dumps_str(params["filter"])
+    
+    return params
+
+
+def http_error(
+    status: int,
+    retry_after: Optional[str],
+    error: Exception,
+) -> TapdataHTTPError:
+    """Build the error raised for an HTTP error status"""
+    return TapdataHTTPError({
+        "message": f"Request failed: {error}",
+        "status": status,
+        "retryAfter": retry_after,
+    })
+
+
+def retry_delay(
+    policy: RetryPolicy,
+    retryable: bool,
+    attempt: int,
+    error: TapdataError,
+    method: str,
+    path: str,
+) -> Optional[float]:
+    """
+    Seconds to wait before retrying a failed attempt
+
+    Args:
+        policy: Retry policy of the client
+        retryable: Whether the policy allows retrying the request's method
+        attempt: Number of the attempt that just failed (1-based)
+        error: The error of that attempt
+        method: HTTP method, for the log
+        path: API path, for the log
+
+    Returns:
+        Delay in seconds, None when the error must be raised
+    """
+    if not (
+        retryable
+        and attempt < policy.max_attempts
+        and policy.is_retryable(error)
+    ):
+        return None
+    delay = policy.delay(attempt, error)
+    logger.warning(
+        f"Retrying {method} {path} in {delay:.2f}s "
+        f"(attempt {attempt} failed: {error.message})"
+    )
+    return delay
+
+
+def check_response(data: dict) -> dict:
+    """Raise on a non-ok business status code"""
+    if data.get("code") != "ok":
+        error_code = data.get("code")
+        if error_code in ["UNAUTHORIZED", "FORBIDDEN"]:
+            raise TapdataAuthError(data)
+        raise TapdataError(data)
+    return data
+
+
+def batch_results(task_ids: List[str], resp: dict) -> List[TaskOperationResult]:
+    """Parse per-task outcomes from a batch task API response"""
+    items = resp.get("data")
+    if not isinstance(items, list):
+        items = []
+    
+    parsed = {}
+    for item in items:
+        if isinstance(item, dict):
+            result = TaskOperationResult.from_dict(item)
+            parsed[result.task_id] = result
+    
+    # Tasks the server did not report on individually share the request outcome
+    return [
+        parsed.get(task_id) or TaskOperationResult(task_id, resp.get("code", "ok"))
+        for task_id in task_ids
+    ]
+
+
+def batch_error_results(
+    task_ids: List[str],
+    error: TapdataError,
+) -> List[TaskOperationResult]:
+    """Mark every task of a failed batch request with the request error"""
+    return [
+        TaskOperationResult(task_id, error.code, error.message)
+        for task_id in task_ids
+    ]
+
+
+def relation_connection_ids(relations: Iterable) -> List[str]:
+    """Distinct connection IDs referenced by the successful relations"""
+    return list(dict.fromkeys(
+        connection_id
+        for relation in relations
+        if isinstance(relation, TaskRelation)
+        for connection_id in (
+            relation.source_connection_id,
+            relation.target_connection_id,
+        )
+        if connection_id
+    ))
+
+
+def attach_connections(
+    outcomes: Dict[str, Union[TaskRelation, TapdataError]],
+    connections: Dict[str, Union[Connection, TapdataError]],
+    return_exceptions: bool,
+) -> Dict[str, Union[TaskRelation, TapdataError]]:
+    """Fill relations with their fetched connections and drop failed tasks"""
+    for task_id, relation in list(outcomes.items()):
+        if isinstance(relation, TaskRelation):
+            source = connections.get(relation.source_connection_id)
+            target = connections.get(relation.target_connection_id)
+            errors = [c for c in (source, target) if isinstance(c, TapdataError)]
+            if errors:
+                outcomes[task_id] = errors[0]
+            else:
+                relation.source_conn = source
+                relation.target_conn = target
+        
+        outcome = outcomes[task_id]
+        if isinstance(outcome, TapdataError):
+            logger.warning(
+                f"Failed to get table relation of task {task_id}: {outcome.message}"
+            )
+            if not return_exceptions:
+                del outcomes[task_id]
+    
+    return outcomes
+
+
+def connection_filter(
+    connection_type: Optional[Union[str, ConnectionType]] = None,
+    database_type: Optional[Union[str, DatabaseType]] = None,
+    status: Optional[Union[str, Status]] = None,
+    name: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 20,
+    query: Optional[Query] = None,
+) -> dict:
+    """Build the /api/Connections list filter"""
+    where = {"createType": {"$ne": "System"}}
+    order = "last_updated DESC"
+    
+    if connection_type:
+        where["connection_type"] = str(connection_type)
+    if database_type:
+        where["database_type"] = str(database_type)
+    if status:
+        where["status"] = str(status)
+    if name:
+        where["name"] = {"like":str(name),"options":"i"}
+    
+    filter_dict = build_filter(order=order, skip=skip, limit=limit, where=where)
+    return query.apply(filter_dict) if query else filter_dict
+
+
+def task_filter(
+    status: Optional[Union[str, Status]] = None,
+    name: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 20,
+    query: Optional[Query] = None,
+) -> dict:
+    """Build the /api/Task list filter"""
+    where = {}
+    if status:
+        where["status"] = str(status)
+
+    if name:
+        where["name"] = {"like": str(name),"options":"i"}
+    
+    fields = {
+        "id": True,
+        "name": True,
+        "type": True,
+        "status": True,
+        "taskRecordId": True,
+    }
+    
+    filter_dict = build_filter(skip=skip, limit=limit, where=where, fields=fields)
+    return query.apply(filter_dict) if query else filter_dict
+
+
+# TaskDetail attributes and the API fields they are read from
+TASK_DETAIL_FIELDS = {"task_record_id": "taskRecordId", "nodes": "dag"}
+
+
+def fields_filter(
+    fields: Optional[Iterable[str]],
+    aliases: Dict[str, str],
+) -> Optional[dict]:
+    """Build a filter projecting the response onto the given fields"""
+    if fields is None:
+        return None
+    projection = {aliases.get(name, name): True for name in fields}
+    projection["id"] = True
+    return {"fields": projection}
+
+
+# Task fields fetched while waiting for an operation to settle
+WAIT_TASK_FIELDS = ("name", "type", "status", "taskRecordId")
+
+# Statuses ending the wait for an operation: (success, failure)
+SETTLED_STATUSES = {
+    "start": ({Status.RUNNING, Status.COMPLETE}, {Status.ERROR}),
+    "stop": ({Status.STOP, Status.COMPLETE}, {Status.ERROR}),
+    "reset": ({Status.WAIT_START, Status.EDIT}, {Status.RENEW_FAILED}),
+    "delete": ({Status.DELETED}, {Status.DELETE_FAILED}),
+}
+
+# Success statuses in which an accepted operation has nothing left to do.
+# Starting a complete task or resetting one runs it again, so those still
+# wait for the status to change.
+NOOP_STATUSES = {
+    "start": {Status.RUNNING},
+    "stop": {Status.STOP, Status.COMPLETE},
+    "reset": set(),
+    "delete": {Status.DELETED},
+}
+
+
+def check_accepted(action: str, task_id: str, resp: dict) -> None:
+    """
+    Raise if the server rejected an operation on a single task
+
+    Raises:
+        TapdataError: The batch response reports a non-ok code for the task
+    """
+    result = batch_results([task_id], resp)[0]
+    if not result.ok:
+        raise TapdataError({
+            "code": result.code,
+            "message": f"Task {task_id} failed to {action}: {result.message or result.code}",
+            "taskId": task_id,
+        })
+
+
+def settled(
+    action: str,
+    task_id: str,
+    task: Optional[Task],
+    before: Optional[str],
+    changed: bool,
+) -> bool:
+    """
+    Whether a waited-for operation has settled
+    
+    A final status is only trusted once the status moved away from the one
+    read before the operation (possibly through a transitional status and
+    back), so restarting an errored task does not fail on its stale status
+    and starting a completed task does not return before it ran.
+    
+    Raises:
+        TapdataTaskStateError: The task ended in a failure status
+        TapdataError: The task does not exist (except when deleting)
+    """
+    success, failure = SETTLED_STATUSES[action]
+    status = task.status if task else None
+    if status is None:
+        if action == "delete":
+            return True
+        raise TapdataError({"message": f"Task {task_id} not found"})
+    if not (changed or status != before):
+        return False
+    if status in success:
+        return True
+    if status in failure:
+        raise TapdataTaskStateError({
+            "code": status,
+            "message": f"Task {task_id} failed to {action}: status is {status}",
+            "taskId": task_id,
+            "status": status,
+        })
+    return False
+
+
+def wait_timeout(action: str, task_id: str, status: Optional[str], timeout: float) -> TapdataTimeoutError:
+    """Build the error raised when an operation did not settle in time"""
+    return TapdataTimeoutError({
+        "message": (
+            f"Timed out after {timeout}s waiting for task {task_id} to {action} "
+            f"(last status: {status})"
+        ),
+    })
+
+
+def logs_query(
+    task_id: str,
+    task_record_id: str,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    page: int = 1,
+    page_size: int = 20,
+    levels: Optional[List[Union[str, LogLevel]]] = None,
+    order: str = "asc",
+) -> dict:
+    """Build the /api/MonitoringLogs/query request body"""
+    if start is None:
+        start = int(time.time()*1000)-1000
+
+    if end is None:
+        end = start + 2000
+
+    if levels is None:
+        levels = [LogLevel.INFO, LogLevel.WARN, LogLevel.ERROR]
+    
+    return {
+        "taskId": task_id,
+        "taskRecordId": task_record_id,
+        "start": start,
+        "end": end,
+        "page": page,
+        "pageSize": page_size,
+        "order": order,
+        "levels": [str(level) for level in levels],
+    }
+
+
+class LogCursor:
+    """
+    Position of a log tail
+    
+    Windows are re-queried from the last seen timestamp (inclusive), so
+    records sharing that millisecond are remembered and skipped.
+    """
+    
+    def __init__(self, position: int):
+        self.position = position
+        self._boundary: set = set()
+    
+    def accept(self, log: TaskLog) -> bool:
+        """Advance past a log, returning False if it was already seen"""
+        if log.timestamp < self.position:
+            return False
+        key = (log.timestamp, log.node_id, log.level, log.message)
+        if log.timestamp == self.position:
+            if key in self._boundary:
+                return False
+            self._boundary.add(key)
+        else:
+            self.position = log.timestamp
+            self._boundary = {key}
+        return True
@@ -0,0 +1,1400 @@
+"""Asyncio Tapdata API Client"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
+from urllib.parse import urljoin
+
+try:
+    import aiohttp
+except ImportError:
+    raise ImportError(
+        "aiohttp is required for AsyncTapdataClient. "
+        "Install it with: pip install tapdata-sdk[async]"
+    )
+
+from .api import (
+    LogCursor,
+    NOOP_STATUSES,
+    TASK_DETAIL_FIELDS,
+    WAIT_TASK_FIELDS,
+    attach_connections,
+    batch_error_results,
+    batch_results,
+    check_accepted,
+    check_response,
+    connection_filter,
+    encode_params,
+    fields_filter,
+    http_error,
+    logs_query,
+    relation_connection_ids,
+    retry_delay,
+    settled,
+    task_filter,
+    wait_timeout,
+)
+from .auth import AUTH_ENDPOINTS, StoredToken, TokenStore, is_auth_failure, token_key
+from .cache import ResponseCache
+from .coalesce import AsyncRequestCoalescer
+from .compression import Compression, accept_encoding, decompressor, supported_encodings
+from .codec import JSONCodec, get_codec
+from .enums import ConnectionType, DatabaseType, LogLevel, Status
+from .exceptions import (
+    TapdataConnectionError,
+    TapdataError,
+    TapdataTimeoutError,
+)
+from .metrics import ClientMetrics, RequestEvent, RequestHook
+from .models import (
+    Connection,
+    Task,
+    TaskDetail,
+    TaskLog,
+    TaskOperationResult,
+    TaskRelation,
+)
+from .query import Query
+from .reports import AsyncReportClient
+from .retry import RetryPolicy
+from .stream import STREAM_CHUNK_SIZE, item_parser
+from .throttle import RequestGovernor
+from .utils import Backoff, chunk_ids, gen_sign, rc4_encrypt, request_key
+from .watcher import AsyncTaskWatcher
+
+
+logger = logging.getLogger(__name__)
+
+
+async def _aiter_pages(
+    fetch_page: Callable[[int, int], Awaitable[list]],
+    page_size: int = 100,
+    prefetch: bool = False,
+) -> AsyncIterator:
+    """Async counterpart of utils.iter_pages"""
+    if page_size <= 0:
+        raise ValueError("page_size must be positive")
+
+    skip = 0
+    pending = asyncio.ensure_future(fetch_page(skip, page_size)) if prefetch else None
+    try:
+        while True:
+            if pending is not None:
+                page = await pending
+                pending = None
+            else:
+                page = await fetch_page(skip, page_size)
+            skip += page_size
+            more = len(page) >= page_size
+            if more and prefetch:
+                pending = asyncio.ensure_future(fetch_page(skip, page_size))
+            for item in page:
+                yield item
+            if not more:
+                return
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+def _auto_decompress(session: "aiohttp.ClientSession") -> bool:
+    """Whether aiohttp decompresses the responses of a session itself"""
+    return getattr(session, "auto_decompress", getattr(session, "_auto_decompress", True))
+
+
+async def _read_body(
+    resp: "aiohttp.ClientResponse",
+    event: RequestEvent,
+    decode: bool,
+) -> AsyncIterator[bytes]:
+    """Yield the body of a response chunk by chunk, decompressed, recording its sizes"""
+    encoding = resp.headers.get("Content-Encoding")
+    if encoding and encoding != "identity":
+        event.content_encoding = encoding
+    decoder = decompressor(encoding) if decode else None
+    async for chunk in resp.content.iter_chunked(STREAM_CHUNK_SIZE):
+        event.bytes_received_wire += len(chunk)
+        if decoder is not None:
+            chunk = decoder.decompress(chunk)
+        event.bytes_received += len(chunk)
+        if chunk:
+            yield chunk
+    if decoder is not None:
+        tail = decoder.flush()
+        event.bytes_received += len(tail)
+        if tail:
+            yield tail
+
+
+def _trace_config() -> "aiohttp.TraceConfig":
+    """Trace DNS and connection setup time into the request's timings dict"""
+    trace = aiohttp.TraceConfig()
+
+    def phase_start(name):
+        async def callback(session, ctx, params):
+            setattr(ctx, f"{name}_started", time.perf_counter())
+        return callback
+
+    def phase_end(name):
+        async def callback(session, ctx, params):
+            timings = ctx.trace_request_ctx
+            started = getattr(ctx, f"{name}_started", None)
+            if isinstance(timings, dict) and started is not None:
+                timings[name] = time.perf_counter() - started
+        return callback
+
+    trace.on_dns_resolvehost_start.append(phase_start("dns"))
+    trace.on_dns_resolvehost_end.append(phase_end("dns"))
+    trace.on_connection_create_start.append(phase_start("connect"))
+    trace.on_connection_create_end.append(phase_end("connect"))
+    return trace
+
+
+class AsyncTapdataClient:
+    """
+    Asyncio Tapdata API Client
+
+    Mirrors TapdataClient on top of a single pooled aiohttp session, so many
+    requests can run concurrently on one event loop.
+
+    Examples:
+        >>> async with AsyncTapdataClient("http://localhost:3030") as client:
+        ...     await client.login("admin@test.com", "password")
+        ...     tasks = await client.tasks.list_running()
+    """
+
+    DEFAULT_TIMEOUT = 30
+    DEFAULT_SECRET = "Gotapd8"
+    DEFAULT_CONNECTION_LIMIT = 100
+
+    def __init__(
+        self,
+        base_url: str,
+        access_token: Optional[str] = None,
+        timeout: int = DEFAULT_TIMEOUT,
+        verify_ssl: bool = True,
+        limit: int = DEFAULT_CONNECTION_LIMIT,
+        limit_per_host: int = 0,
+        session: Optional["aiohttp.ClientSession"] = None,
+        cache: Union[bool, ResponseCache, None] = None,
+        retry: Optional[RetryPolicy] = None,
+        governor: Optional[RequestGovernor] = None,
+        codec: Union[str, JSONCodec, None] = "auto",
+        token_store: Optional[TokenStore] = None,
+        auto_relogin: bool = True,
+        coalesce: bool = True,
+        compression: Compression = "auto",
+    ):
+        """
+        Initialize client
+
+        Args:
+            base_url: API base URL
+            access_token: Access token (optional)
+            timeout: Request timeout in seconds
+            verify_ssl: Whether to verify SSL certificate
+            limit: Maximum number of pooled connections
+            limit_per_host: Maximum pooled connections per host (0 = no limit)
+            session: Existing aiohttp session to share (not closed by close())
+            cache: Response cache for read-mostly GET endpoints; True uses
+                a ResponseCache with default TTLs
+            retry: Retry policy for transient failures; defaults to
+                retrying idempotent requests up to 3 times
+            governor: Rate limits and in-flight caps per endpoint class; may
+                be shared with sync clients running in other threads
+            codec: JSON backend: "auto" (msgspec, orjson or json, whichever
+                is installed first), a backend name or a JSONCodec
+            token_store: Where login() looks for a still valid token before
+                logging in, and saves new tokens
+            auto_relogin: After login(), log in again and replay the request
+                once when the server rejects the access token
+            coalesce: Let concurrent identical GET requests share one
+                in-flight request and its (not to be mutated) response
+            compression: Response compression: "auto" offers gzip, deflate,
+                and br/zstd when brotli/zstandard are installed, None
+                disables it, and an encoding or list of encodings forces
+                those. Bodies are decompressed chunk by chunk by the client.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.access_token = access_token
+        self.timeout = timeout
+        self.verify_ssl = verify_ssl
+        self.token_store = token_store
+        self.auto_relogin = auto_relogin
+        # (email, password, secret) of the last login, for re-login
+        self._credentials: Optional[tuple] = None
+        self._auth_lock: Optional[asyncio.Lock] = None
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.session = session
+        self._owns_session = session is None
+        self.cache = cache if isinstance(cache, ResponseCache) else (
+            ResponseCache() if cache else None
+        )
+        self.retry = retry or RetryPolicy()
+        self.governor = governor
+        self.codec = get_codec(codec)
+        supported = supported_encodings()
+        if session is not None and _auto_decompress(session):
+            # Left to aiohttp, which may not know zstd
+            supported = [encoding for encoding in supported if encoding != "zstd"]
+        self.accept_encoding = accept_encoding(compression, supported)
+        self.coalescer = AsyncRequestCoalescer() if coalesce else None
+        self.metrics = ClientMetrics()
+        self.before_request_hooks: List[RequestHook] = []
+        self.after_request_hooks: List[RequestHook] = []
+
+        # Initialize sub-clients
+        self.connections = AsyncConnectionClient(self)
+        self.tasks = AsyncTaskClient(self)
+        self.reports = AsyncReportClient(self)
+
+    async def __aenter__(self) -> "AsyncTapdataClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Create the pooled session lazily, inside the running event loop"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ssl=None if self.verify_ssl else False,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                trace_configs=[_trace_config()],
+                # Bodies are decompressed by _read_body, which counts the
+                # compressed bytes too
+                auto_decompress=False,
+            )
+            self._owns_session = True
+        return self.session
+
+    async def close(self) -> None:
+        """Close the pooled session if this client created it"""
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+        self.session = None
+
+    def _build_url(self, path: str) -> str:
+        """Build complete URL"""
+        return urljoin(self.base_url, path)
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+        path_params: Optional[dict] = None,
+        idempotent: Optional[bool] = None,
+        model: Optional[type] = None,
+        page: bool = True,
+        **kwargs,
+    ) -> dict:
+        """
+        Send HTTP request
+
+        Args:
+            method: HTTP method
+            path: API path, optionally a template such as "/api/Task/{id}"
+            params: URL parameters
+            json: JSON request body
+            path_params: Values filled into the path template
+            idempotent: Whether the request may be retried, overriding the
+                method-based default of the retry policy
+            model: Model class the response data is decoded into
+            page: Whether the data is a page of model items rather than one object
+            **kwargs: Other request parameters
+
+        Returns:
+            Response data
+
+        Raises:
+            TapdataError: API error
+            TapdataTimeoutError: Request timeout
+            TapdataConnectionError: Connection error
+        """
+        endpoint = path
+        if path_params:
+            path = path.format(**path_params)
+
+        ttl = None
+        if self.cache is not None and method.upper() == "GET":
+            ttl = self.cache.ttl_for(endpoint)
+        if ttl is not None:
+            key = request_key(method, path, params)
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.debug(f"Cache hit: {method} {path}")
+                return cached
+
+        async def send() -> dict:
+            return await self._send(
+                method,
+                path,
+                endpoint,
+                params=params,
+                json=json,
+                idempotent=idempotent,
+                model=model,
+                page=page,
+                **kwargs,
+            )
+
+        async def call() -> dict:
+            token = self.access_token
+            try:
+                data = await send()
+            except TapdataError as e:
+                if not self._can_relogin(e, endpoint):
+                    raise
+                logger.info(f"Access token rejected by {method} {path}, logging in again")
+                await self._relogin(token)
+                data = await send()
+            if ttl is not None:
+                self.cache.set(key, data, ttl, endpoint=endpoint, path_params=path_params)
+            return data
+
+        if self.coalescer is None or method.upper() != "GET":
+            return await call()
+        # Callers decoding into different models must not share a response
+        flight_key = request_key(method, path, params) + (model, page)
+        data, shared = await self.coalescer.do(flight_key, call)
+        if shared:
+            logger.debug(f"Coalesced: {method} {path}")
+            self.metrics.record_coalesced(method, endpoint)
+        return data
+
+    def add_request_hook(
+        self,
+        before: Optional[RequestHook] = None,
+        after: Optional[RequestHook] = None,
+    ) -> None:
+        """Register callbacks run around every request attempt"""
+        if before is not None:
+            self.before_request_hooks.append(before)
+        if after is not None:
+            self.after_request_hooks.append(after)
+
+    def _run_hooks(self, hooks: List[RequestHook], event: RequestEvent) -> None:
+        """Run request hooks, never letting a hook break the request"""
+        for hook in hooks:
+            try:
+                hook(event)
+            except Exception:
+                logger.exception(f"Request hook {hook!r} failed")
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        endpoint: str,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+        idempotent: Optional[bool] = None,
+        model: Optional[type] = None,
+        page: bool = True,
+        **kwargs,
+    ) -> dict:
+        """Perform the request, retrying transient failures per the retry policy"""
+        retryable = self.retry.allows_method(method, idempotent)
+        attempt = 1
+        while True:
+            event = RequestEvent(
+                method=method,
+                endpoint=endpoint,
+                url=self._build_url(path),
+                attempt=attempt,
+            )
+            self._run_hooks(self.before_request_hooks, event)
+            try:
+                async with self._slot(method, endpoint):
+                    data = await self._send_once(
+                        method,
+                        event,
+                        params=params,
+                        json=json,
+                        model=model,
+                        page=page,
+                        **kwargs,
+                    )
+            except TapdataError as e:
+                event.error = e
+                self.metrics.observe(event)
+                self._run_hooks(self.after_request_hooks, event)
+                delay = retry_delay(self.retry, retryable, attempt, e, method, path)
+                if delay is None:
+                    raise
+                self.metrics.record_retry(method, endpoint)
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self.metrics.observe(event)
+            self._run_hooks(self.after_request_hooks, event)
+            return data
+
+    @asynccontextmanager
+    async def _slot(self, method: str, endpoint: str) -> AsyncIterator[None]:
+        """Hold a governor slot for one attempt, if a governor is configured"""
+        if self.governor is None:
+            yield
+            return
+        async with self.governor.slot_async(method, endpoint):
+            yield
+
+    async def _send_once(
+        self,
+        method: str,
+        event: RequestEvent,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+        model: Optional[type] = None,
+        page: bool = True,
+        **kwargs,
+    ) -> dict:
+        """
+        Perform a single HTTP request and check its business status code
+
+        Status, sizes and timings are recorded on the event; "dns" and
+        "connect" (including TLS) are traced when a new connection is made.
+        """
+        url = event.url
+        params = encode_params(params, self.access_token, self.codec)
+        timeout = aiohttp.ClientTimeout(total=kwargs.pop("timeout", self.timeout))
+        headers = {"Accept-Encoding": self.accept_encoding}
+        headers.update(kwargs.pop("headers", None) or {})
+        body = None
+        if json is not None:
+            body = self.codec.dumps(json)
+            headers["Content-Type"] = "application/json"
+            event.bytes_sent = len(body)
+        session = self._get_session()
+        started = time.perf_counter()
+
+        try:
+            logger.debug(f"Request: {method} {url}")
+
+            async with session.request(
+                method,
+                url,
+                params=params,
+                data=body,
+                headers=headers,
+                timeout=timeout,
+                trace_request_ctx=event.timings,
+                **kwargs,
+            ) as resp:
+                headers_at = time.perf_counter()
+                event.status = resp.status
+                event.timings["server"] = headers_at - started
+                resp.raise_for_status()
+                raw = b"".join([
+                    chunk async for chunk in _read_body(resp, event, not _auto_decompress(session))
+                ])
+                read_at = time.perf_counter()
+                event.timings["download"] = read_at - headers_at
+                if model is None:
+                    data = self.codec.loads(raw)
+                elif page:
+                    data = self.codec.loads_page(raw, model)
+                else:
+                    data = self.codec.loads_object(raw, model)
+                event.timings["decode"] = time.perf_counter() - read_at
+
+        except aiohttp.ClientResponseError as e:
+            raise http_error(
+                e.status,
+                e.headers.get("Retry-After") if e.headers else None,
+                e,
+            )
+        except asyncio.TimeoutError as e:
+            raise TapdataTimeoutError({"message": f"Request timeout: {e}"})
+        except aiohttp.ClientConnectionError as e:
+            raise TapdataConnectionError({"message": f"Connection error: {e}"})
+        except aiohttp.ClientError as e:
+            raise TapdataError({"message": f"Request failed: {e}"})
+        except ValueError as e:
+            raise TapdataError({"message": f"Invalid JSON response: {e}"})
+        finally:
+            event.timings["total"] = time.perf_counter() - started
+
+        data = check_response(data)
+        logger.debug(f"Response: {data.get('code')}")
+        return data
+
+    async def _stream(
+        self,
+        method: str,
+        path: str,
+        model: type,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+        idempotent: Optional[bool] = None,
+    ) -> AsyncIterator[Any]:
+        """Perform a page request, yielding its items while the body is read, see TapdataClient._stream"""
+        retryable = self.retry.allows_method(method, idempotent)
+        relogin = True
+        attempt = 1
+        while True:
+            token = self.access_token
+            event = RequestEvent(
+                method=method,
+                endpoint=path,
+                url=self._build_url(path),
+                attempt=attempt,
+            )
+            self._run_hooks(self.before_request_hooks, event)
+            yielded = False
+            try:
+                async for item in self._stream_once(method, event, model, params=params, json=json):
+                    yielded = True
+                    yield item
+            except TapdataError as e:
+                event.error = e
+                self.metrics.observe(event)
+                self._run_hooks(self.after_request_hooks, event)
+                if yielded:
+                    raise
+                if relogin and self._can_relogin(e, path):
+                    relogin = False
+                    logger.info(f"Access token rejected by {method} {path}, logging in again")
+                    await self._relogin(token)
+                    continue
+                delay = retry_delay(self.retry, retryable, attempt, e, method, path)
+                if delay is None:
+                    raise
+                self.metrics.record_retry(method, path)
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except GeneratorExit:
+                # The caller stopped before the end of the page
+                self.metrics.observe(event)
+                self._run_hooks(self.after_request_hooks, event)
+                raise
+            self.metrics.observe(event)
+            self._run_hooks(self.after_request_hooks, event)
+            return
+
+    async def _stream_once(
+        self,
+        method: str,
+        event: RequestEvent,
+        model: type,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Perform a single streamed request, see TapdataClient._stream_once
+
+        The governor slot is only held until the response headers arrive.
+        """
+        params = encode_params(params, self.access_token, self.codec)
+        headers = {"Accept-Encoding": self.accept_encoding}
+        body = None
+        if json is not None:
+            body = self.codec.dumps(json)
+            headers["Content-Type"] = "application/json"
+            event.bytes_sent = len(body)
+        parser = item_parser()
+        session = self._get_session()
+        started = time.perf_counter()
+
+        try:
+            logger.debug(f"Streaming request: {method} {event.url}")
+
+            async with self._slot(method, event.endpoint):
+                resp = await session.request(
+                    method,
+                    event.url,
+                    params=params,
+                    data=body,
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                    trace_request_ctx=event.timings,
+                )
+            async with resp:
+                headers_at = time.perf_counter()
+                event.status = resp.status
+                event.timings["server"] = headers_at - started
+                resp.raise_for_status()
+
+                async for chunk in _read_body(resp, event, not _auto_decompress(session)):
+                    for item in parser.feed(chunk):
+                        yield model.from_dict(item)
+                for item in parser.close():
+                    yield model.from_dict(item)
+                event.timings["download"] = time.perf_counter() - headers_at
+
+        except aiohttp.ClientResponseError as e:
+            raise http_error(
+                e.status,
+                e.headers.get("Retry-After") if e.headers else None,
+                e,
+            )
+        except asyncio.TimeoutError as e:
+            raise TapdataTimeoutError({"message": f"Request timeout: {e}"})
+        except aiohttp.ClientConnectionError as e:
+            raise TapdataConnectionError({"message": f"Connection error: {e}"})
+        except aiohttp.ClientError as e:
+            raise TapdataError({"message": f"Request failed: {e}"})
+        except ValueError as e:
+            raise TapdataError({"message": f"Invalid JSON response: {e}"})
+        finally:
+            event.timings["total"] = time.perf_counter() - started
+
+        check_response(parser.envelope)
+        logger.debug(f"Response: {parser.envelope.get('code')}")
+
+    def _invalidate_tasks(self, task_ids: Iterable[str]) -> None:
+        """Drop cached responses that a task mutation makes stale"""
+        if self.cache is None:
+            return
+        for task_id in task_ids:
+            self.cache.invalidate("/api/Task/{id}", id=task_id)
+        self.cache.invalidate("/api/Task")
+
+    async def get_timestamp(self) -> int:
+        """
+        Get server timestamp
+
+        Returns:
+            Server timestamp
+        """
+        resp = await self._request("GET", "/api/timeStamp")
+        return resp["data"]
+
+    async def login(
+        self,
+        email: str,
+        password: str,
+        secret: str = DEFAULT_SECRET,
+        reuse_token: bool = True,
+    ) -> str:
+        """User login, see TapdataClient.login"""
+        async with self._get_auth_lock():
+            self._credentials = (email, password, secret)
+
+            if reuse_token and self.token_store is not None:
+                stored = self.token_store.load(token_key(self.base_url, email))
+                if stored is not None and not stored.expired():
+                    self.access_token = stored.access_token
+                    logger.info(f"Reusing stored access token: {email}")
+                    return self.access_token
+
+            return await self._login(email, password, secret)
+
+    def _get_auth_lock(self) -> asyncio.Lock:
+        """Lock serializing logins, created lazily so it binds to the running event loop"""
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+        return self._auth_lock
+
+    def _can_relogin(self, error: TapdataError, endpoint: str) -> bool:
+        """Whether a failed request may be replayed after logging in again"""
+        return (
+            self.auto_relogin
+            and self._credentials is not None
+            and endpoint not in AUTH_ENDPOINTS
+            and is_auth_failure(error)
+        )
+
+    async def _relogin(self, rejected: Optional[str]) -> None:
+        """Log in again once for concurrently rejected requests, see TapdataClient._relogin"""
+        async with self._get_auth_lock():
+            if self.access_token != rejected:
+                return
+            email, password, secret = self._credentials
+            if self.token_store is not None:
+                self.token_store.clear(token_key(self.base_url, email))
+            await self._login(email, password, secret)
+
+    async def _login(self, email: str, password: str, secret: str) -> str:
+        """Encrypt the password, log in and store the new token"""
+        enc_pwd = rc4_encrypt(password, secret)
+        stime = await self.get_timestamp()
+        sign = gen_sign(email, enc_pwd, stime, secret)
+
+        resp = await self._request(
+            "POST",
+            "/api/users/login",
+            json={
+                "email": email,
+                "password": enc_pwd,
+                "sign": sign,
+            },
+        )
+
+        self.access_token = resp["data"]["id"]
+        if self.token_store is not None:
+            self.token_store.save(token_key(self.base_url, email), StoredToken.from_login(resp["data"]))
+        logger.info(f"Login successful: {email}")
+
+        return self.access_token
+
+    async def logout(self) -> None:
+        """Logout, keeping the pooled connections open"""
+        async with self._get_auth_lock():
+            if self._credentials is not None and self.token_store is not None:
+                self.token_store.clear(token_key(self.base_url, self._credentials[0]))
+            self.access_token = None
+            self._credentials = None
+        logger.info("Logged out")
+
+    def is_authenticated(self) -> bool:
+        """Check if authenticated"""
+        return self.access_token is not None
+
+
+class AsyncConnectionClient:
+    """Async connection management client"""
+
+    def __init__(self, client: AsyncTapdataClient):
+        self.client = client
+
+    async def list(
+        self,
+        connection_type: Optional[Union[str, ConnectionType]] = None,
+        database_type: Optional[Union[str, DatabaseType]] = None,
+        status: Optional[Union[str, Status]] = None,
+        name: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20,
+        query: Optional[Query] = None,
+    ) -> List[Connection]:
+        """Query connection list, see ConnectionClient.list"""
+        resp = await self.client._request(
+            "GET",
+            "/api/Connections",
+            params={
+                "filter": connection_filter(
+                    connection_type=connection_type,
+                    database_type=database_type,
+                    status=status,
+                    name=name,
+                    skip=skip,
+                    limit=limit,
+                    query=query,
+                )
+            },
+            model=Connection,
+        )
+
+        return list(resp["data"]["items"])
+
+    async def get(self, connection_id: str) -> Connection:
+        """Get single connection details"""
+        resp = await self.client._request(
+            "GET",
+            "/api/Connections/{id}",
+            path_params={"id": connection_id},
+        )
+        return Connection.from_dict(resp["data"])
+
+    def stream(
+        self,
+        connection_type: Optional[Union[str, ConnectionType]] = None,
+        database_type: Optional[Union[str, DatabaseType]] = None,
+        status: Optional[Union[str, Status]] = None,
+        name: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20,
+        query: Optional[Query] = None,
+    ) -> AsyncIterator[Connection]:
+        """Query a connection page, yielding connections while it downloads, see ConnectionClient.stream"""
+        return self.client._stream(
+            "GET",
+            "/api/Connections",
+            Connection,
+            params={
+                "filter": connection_filter(
+                    connection_type=connection_type,
+                    database_type=database_type,
+                    status=status,
+                    name=name,
+                    skip=skip,
+                    limit=limit,
+                    query=query,
+                )
+            },
+        )
+
+    def iter_all(
+        self,
+        connection_type: Optional[Union[str, ConnectionType]] = None,
+        database_type: Optional[Union[str, DatabaseType]] = None,
+        status: Optional[Union[str, Status]] = None,
+        name: Optional[str] = None,
+        page_size: int = 100,
+        prefetch: bool = False,
+        query: Optional[Query] = None,
+    ) -> AsyncIterator[Connection]:
+        """Iterate over all matching connections, see ConnectionClient.iter_all"""
+        query = query or Query()
+
+        async def fetch(skip: int, limit: int) -> List[Connection]:
+            page = query.page(skip, limit)
+            if page is None:
+                return []
+            return await self.list(
+                connection_type=connection_type,
+                database_type=database_type,
+                status=status,
+                name=name,
+                query=page,
+            )
+
+        return _aiter_pages(fetch, page_size=page_size, prefetch=prefetch)
+
+    async def list_all(self, **kwargs) -> List[Connection]:
+        """Query all matching connections, see ConnectionClient.list_all"""
+        return [conn async for conn in self.iter_all(**kwargs)]
+
+
+class AsyncTaskClient:
+    """Async task management client"""
+
+    # URL-encoded length budget for the taskIds parameter of batch requests
+    BATCH_MAX_IDS_LENGTH = 1500
+
+    # Polling interval bounds (seconds) of start/stop/reset/delete with wait
+    WAIT_INTERVAL = 0.5
+    WAIT_MAX_INTERVAL = 5.0
+
+    def __init__(self, client: AsyncTapdataClient):
+        self.client = client
+
+    async def list(
+        self,
+        status: Optional[Union[str, Status]] = None,
+        name: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20,
+        query: Optional[Query] = None,
+    ) -> List[Task]:
+        """Query task list, see TaskClient.list"""
+        resp = await self.client._request(
+            "GET",
+            "/api/Task",
+            params={
+                "filter": task_filter(
+                    status=status,
+                    name=name,
+                    skip=skip,
+                    limit=limit,
+                    query=query,
+                )
+            },
+            model=Task,
+        )
+
+        return list(resp["data"]["items"])
+
+    def stream(
+        self,
+        status: Optional[Union[str, Status]] = None,
+        name: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20,
+        query: Optional[Query] = None,
+    ) -> AsyncIterator[Task]:
+        """Query a task page, yielding tasks while it downloads, see TaskClient.stream"""
+        return self.client._stream(
+            "GET",
+            "/api/Task",
+            Task,
+            params={
+                "filter": task_filter(
+                    status=status,
+                    name=name,
+                    skip=skip,
+                    limit=limit,
+                    query=query,
+                )
+            },
+        )
+
+    async def get(self, task_id: str, fields: Optional[Iterable[str]] = None) -> TaskDetail:
+        """Get single task details, see TaskClient.get"""
+        filter_ = fields_filter(fields, TASK_DETAIL_FIELDS)
+        resp = await self.client._request(
+            "GET",
+            "/api/Task/{id}",
+            params={"filter": filter_} if filter_ else None,
+            path_params={"id": task_id},
+            model=TaskDetail,
+            page=False,
+        )
+        return resp["data"]
+
+    async def get_table_relation(self, task_id: str) -> TaskRelation:
+        """
+        Get Task Table Name Relation
+
+        The source and target connections are fetched concurrently.
+        """
+        task_detail = await self.get(task_id)
+
+        relation = TaskRelation.from_detail(task_detail)
+
+        async def fetch(connection_id: Optional[str]) -> Optional[Connection]:
+            if not connection_id:
+                return None
+            return await self.client.connections.get(connection_id)
+
+        relation.source_conn, relation.target_conn = await asyncio.gather(
+            fetch(relation.source_connection_id),
+            fetch(relation.target_connection_id),
+        )
+
+        return relation
+
+    async def get_table_relations(
+        self,
+        task_ids: Iterable[str],
+        max_concurrency: int = 32,
+        return_exceptions: bool = False,
+    ) -> Dict[str, Union[TaskRelation, TapdataError]]:
+        """
+        Get table name relations for many tasks concurrently
+
+        See TaskClient.get_table_relations; each distinct connection is
+        fetched only once.
+        """
+        task_ids = list(dict.fromkeys(task_ids))
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(fn, key):
+            async with semaphore:
+                try:
+                    return await fn(key)
+                except TapdataError as e:
+                    return e
+
+        details = await asyncio.gather(
+            *(fetch(self.get, task_id) for task_id in task_ids)
+        )
+        outcomes: Dict[str, Union[TaskRelation, TapdataError]] = {}
+        for task_id, detail in zip(task_ids, details):
+            if isinstance(detail, TapdataError):
+                outcomes[task_id] = detail
+            else:
+                outcomes[task_id] = TaskRelation.from_detail(detail)
+
+        connection_ids = relation_connection_ids(outcomes.values())
+        connections = dict(zip(
+            connection_ids,
+            await asyncio.gather(*(
+                fetch(self.client.connections.get, conn_id)
+                for conn_id in connection_ids
+            )),
+        ))
+
+        return attach_connections(outcomes, connections, return_exceptions)
+
+    def iter_all(
+        self,
+        status: Optional[Union[str, Status]] = None,
+        name: Optional[str] = None,
+        page_size: int = 100,
+        prefetch: bool = False,
+        query: Optional[Query] = None,
+    ) -> AsyncIterator[Task]:
+        """Iterate over all matching tasks, see TaskClient.iter_all"""
+        query = query or Query()
+
+        async def fetch(skip: int, limit: int) -> List[Task]:
+            page = query.page(skip, limit)
+            if page is None:
+                return []
+            return await self.list(status=status, name=name, query=page)
+
+        return _aiter_pages(fetch, page_size=page_size, prefetch=prefetch)
+
+    async def list_all(self, **kwargs) -> List[Task]:
+        """Query all matching tasks, see TaskClient.list_all"""
+        return [task async for task in self.iter_all(**kwargs)]
+
+    async def list_running(self) -> List[Task]:
+        """Get all running tasks"""
+        return await self.list_all(status=Status.RUNNING)
+
+    async def list_error(self) -> List[Task]:
+        """Get all error tasks"""
+        return await self.list_all(status=Status.ERROR)
+
+    def watch(
+        self,
+        task_ids: Iterable[str],
+        until: Optional[Iterable[Union[str, Status]]] = None,
+        interval: float = 1.0,
+        max_interval: float = 10.0,
+    ) -> AsyncTaskWatcher:
+        """Watch the status of many tasks with a single polling loop, see TaskClient.watch"""
+        return AsyncTaskWatcher(
+            self.client,
+            task_ids,
+            until=until,
+            interval=interval,
+            max_interval=max_interval,
+        )
+
+    async def start(
+        self,
+        task_id: str,
+        wait: bool = False,
+        timeout: float = 300.0,
+    ) -> Union[dict, Task]:
+        """Start task, see TaskClient.start"""
+        before = await self._current(task_id) if wait else None
+        logger.info(f"Starting task: {task_id}")
+        try:
+            result = await self.client._request(
+                "PUT",
+                "/api/Task/batchStart",
+                params={"taskIds": task_id},
+            )
+        finally:
+            self.client._invalidate_tasks([task_id])
+        return await self._wait("start", task_id, before, result, timeout) if wait else result
+
+    async def stop(
+        self,
+        task_id: str,
+        wait: bool = False,
+        timeout: float = 300.0,
+    ) -> Union[dict, Task]:
+        """Stop task, see TaskClient.stop"""
+        before = await self._current(task_id) if wait else None
+        logger.info(f"Stopping task: {task_id}")
+        try:
+            result = await self.client._request(
+                "PUT",
+                "/api/Task/batchStop",
+                params={"taskIds": task_id},
+            )
+        finally:
+            self.client._invalidate_tasks([task_id])
+        return await self._wait("stop", task_id, before, result, timeout) if wait else result
+
+    async def reset(
+        self,
+        task_id: str,
+        wait: bool = False,
+        timeout: float = 300.0,
+    ) -> Union[dict, Task]:
+        """Reset task, see TaskClient.reset"""
+        before = await self._current(task_id) if wait else None
+        logger.info(f"Resetting task: {task_id}")
+        try:
+            result = await self.client._request(
+                "PATCH",
+                "/api/Task/batchRenew",
+                params={"taskIds": task_id},
+            )
+        finally:
+            self.client._invalidate_tasks([task_id])
+        return await self._wait("reset", task_id, before, result, timeout) if wait else result
+
+    async def delete(
+        self,
+        task_id: str,
+        wait: bool = False,
+        timeout: float = 300.0,
+    ) -> Union[dict, Task, None]:
+        """Delete task, see TaskClient.delete"""
+        before = await self._current(task_id) if wait else None
+        logger.warning(f"Deleting task: {task_id}")
+        try:
+            result = await self.client._request(
+                "DELETE",
+                "/api/Task/batchDelete",
+                params={"taskIds": task_id},
+            )
+        finally:
+            self.client._invalidate_tasks([task_id])
+        return await self._wait("delete", task_id, before, result, timeout) if wait else result
+
+    async def _current(self, task_id: str) -> Optional[Task]:
+        """Task with the fields watched while waiting, None if it does not exist"""
+        tasks = await self.list(query=Query().where(id=task_id).fields(*WAIT_TASK_FIELDS).limit(1))
+        return tasks[0] if tasks else None
+
+    async def _wait(
+        self,
+        action: str,
+        task_id: str,
+        before: Optional[Task],
+        resp: dict,
+        timeout: float,
+    ) -> Optional[Task]:
+        """Poll with backoff until an operation settles, see TaskClient._wait"""
+        check_accepted(action, task_id, resp)
+        status = before.status if before else None
+        if status in NOOP_STATUSES[action]:
+            return before
+        watcher = AsyncTaskWatcher(
+            self.client,
+            [task_id],
+            interval=self.WAIT_INTERVAL,
+            max_interval=self.WAIT_MAX_INTERVAL,
+            fields=WAIT_TASK_FIELDS,
+        )
+        changed = False
+        async for change in watcher.watch(timeout=timeout):
+            changed = changed or change.status != status
+            task = watcher.tasks.get(task_id)
+            if settled(action, task_id, task, status, changed):
+                return task
+        raise wait_timeout(action, task_id, watcher.statuses.get(task_id), timeout)
+
+    async def _batch(
+        self,
+        method: str,
+        path: str,
+        action: str,
+        task_ids: Iterable[str],
+        max_batch_size: Optional[int] = None,
+        max_concurrency: int = 4,
+    ) -> List[TaskOperationResult]:
+        """
+        Run a batch task operation, see TaskClient._batch
+
+        At most max_concurrency chunks are in flight at once, so a large
+        batch does not fire every mutation at the server together.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(chunk: List[str]) -> List[TaskOperationResult]:
+            async with semaphore:
+                logger.info(f"{action} {len(chunk)} tasks")
+                try:
+                    resp = await self.client._request(
+                        method,
+                        path,
+                        params={"taskIds": ",".join(chunk)},
+                    )
+                except TapdataError as e:
+                    logger.warning(f"{action} {len(chunk)} tasks failed: {e.message}")
+                    return batch_error_results(chunk, e)
+                finally:
+                    self.client._invalidate_tasks(chunk)
+                return batch_results(chunk, resp)
+
+        chunks = chunk_ids(
+            task_ids,
+            max_length=self.BATCH_MAX_IDS_LENGTH,
+            max_size=max_batch_size,
+        )
+        results = await asyncio.gather(*(run(chunk) for chunk in chunks))
+        return [result for chunk_results in results for result in chunk_results]
+
+    async def start_many(
+        self,
+        task_ids: Iterable[str],
+        max_batch_size: Optional[int] = None,
+        max_concurrency: int = 4,
+    ) -> List[TaskOperationResult]:
+        """Start many tasks, see TaskClient.start_many; at most max_concurrency requests run at once"""
+        return await self._batch(
+            "PUT",
+            "/api/Task/batchStart",
+            "Starting",
+            task_ids,
+            max_batch_size,
+            max_concurrency,
+        )
+
+    async def stop_many(
+        self,
+        task_ids: Iterable[str],
+        max_batch_size: Optional[int] = None,
+        max_concurrency: int = 4,
+    ) -> List[TaskOperationResult]:
+        """Stop many tasks, see TaskClient.stop_many; at most max_concurrency requests run at once"""
+        return await self._batch(
+            "PUT",
+            "/api/Task/batchStop",
+            "Stopping",
+            task_ids,
+            max_batch_size,
+            max_concurrency,
+        )
+
+    async def reset_many(
+        self,
+        task_ids: Iterable[str],
+        max_batch_size: Optional[int] = None,
+        max_concurrency: int = 4,
+    ) -> List[TaskOperationResult]:
+        """Reset many tasks, see TaskClient.reset_many; at most max_concurrency requests run at once"""
+        return await self._batch(
+            "PATCH",
+            "/api/Task/batchRenew",
+            "Resetting",
+            task_ids,
+            max_batch_size,
+            max_concurrency,
+        )
+
+    async def delete_many(
+        self,
+        task_ids: Iterable[str],
+        max_batch_size: Optional[int] = None,
+        max_concurrency: int = 4,
+    ) -> List[TaskOperationResult]:
+        """Delete many tasks, see TaskClient.delete_many; at most max_concurrency requests run at once"""
+        return await self._batch(
+            "DELETE",
+            "/api/Task/batchDelete",
+            "Deleting",
+            task_ids,
+            max_batch_size,
+            max_concurrency,
+        )
+
+    async def get_logs(
+        self,
+        task_id: str,
+        task_record_id: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        page: int = 1,
+        page_size: int = 20,
+        levels: Optional[List[Union[str, LogLevel]]] = None,
+        order: str = "asc",
+    ) -> List[TaskLog]:
+        """Get task logs, see TaskClient.get_logs"""
+        resp = await self.client._request(
+            "POST",
+            "/api/MonitoringLogs/query",
+            idempotent=True,
+            json=logs_query(
+                task_id,
+                task_record_id,
+                start=start,
+                end=end,
+                page=page,
+                page_size=page_size,
+                levels=levels,
+                order=order,
+            ),
+            model=TaskLog,
+        )
+
+        return list(resp["data"]["items"])
+
+    def stream_logs(
+        self,
+        task_id: str,
+        task_record_id: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        page: int = 1,
+        page_size: int = 20,
+        levels: Optional[List[Union[str, LogLevel]]] = None,
+        order: str = "asc",
+    ) -> AsyncIterator[TaskLog]:
+        """Get a page of task logs, yielding logs while it downloads, see TaskClient.stream_logs"""
+        return self.client._stream(
+            "POST",
+            "/api/MonitoringLogs/query",
+            TaskLog,
+            idempotent=True,
+            json=logs_query(
+                task_id,
+                task_record_id,
+                start=start,
+                end=end,
+                page=page,
+                page_size=page_size,
+                levels=levels,
+                order=order,
+            ),
+        )
+
+    async def iter_logs(
+        self,
+        task_id: str,
+        task_record_id: str,
+        start: int,
+        end: int,
+        page_size: int = 100,
+        levels: Optional[List[Union[str, LogLevel]]] = None,
+    ) -> AsyncIterator[TaskLog]:
+        """Iterate over every log in a time window, see TaskClient.iter_logs"""
+        page = 1
+        while True:
+            logs = await self.get_logs(
+                task_id,
+                task_record_id,
+                start=start,
+                end=end,
+                page=page,
+                page_size=page_size,
+                levels=levels,
+            )
+            for log in logs:
+                yield log
+            if len(logs) < page_size:
+                return
+            page += 1
+
+    async def tail_logs(
+        self,
+        task_id: str,
+        task_record_id: str,
+        start: Optional[int] = None,
+        levels: Optional[List[Union[str, LogLevel]]] = None,
+        page_size: int = 100,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        timeout: Optional[float] = None,
+        stop_event: Optional[asyncio.Event] = None,
+    ) -> AsyncIterator[TaskLog]:
+        """Follow the logs of a running task, see TaskClient.tail_logs"""
+        stop_event = stop_event or asyncio.Event()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        cursor = LogCursor(int(time.time() * 1000) if start is None else start)
+        backoff = Backoff(initial=min_interval, maximum=max_interval)
+
+        while not stop_event.is_set():
+            received = 0
+            async for log in self.iter_logs(
+                task_id,
+                task_record_id,
+                start=cursor.position,
+                end=int(time.time() * 1000),
+                page_size=page_size,
+                levels=levels,
+            ):
+                if cursor.accept(log):
+                    received += 1
+                    yield log
+
+            if received:
+                backoff.reset()
+            delay = backoff.next()
+            if deadline is not None:
+                delay = min(delay, deadline - time.monotonic())
+                if delay <= 0:
+                    return
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
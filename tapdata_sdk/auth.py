@@ -0,0 +1,195 @@
+"""Access token persistence"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from .exceptions import TapdataAuthError, TapdataError, TapdataHTTPError
+
+try:
+    import keyring
+except ImportError:
+    keyring = None
+
+
+logger = logging.getLogger(__name__)
+
+# Endpoints used to log in, never replayed after a re-login
+AUTH_ENDPOINTS = frozenset({"/api/timeStamp", "/api/users/login"})
+
+
+@dataclass
+class StoredToken:
+    """Access token with its expiry"""
+    access_token: str
+    expires_at: Optional[float] = None  # Unix time, None if unknown
+
+    def expired(self, leeway: float = 60.0) -> bool:
+        """Whether the token expires within leeway seconds"""
+        return self.expires_at is not None and time.time() + leeway >= self.expires_at
+
+    @classmethod
+    def from_login(cls, data: dict) -> "StoredToken":
+        """Create from the data of a /api/users/login response (ttl in seconds)"""
+        ttl = data.get("ttl")
+        expires_at = time.time() + ttl if isinstance(ttl, (int, float)) and ttl > 0 else None
+        return cls(access_token=data["id"], expires_at=expires_at)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "StoredToken":
+        """Create from a stored dictionary"""
+        return cls(access_token=data["access_token"], expires_at=data.get("expires_at"))
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary"""
+        return {"access_token": self.access_token, "expires_at": self.expires_at}
+
+
+def token_key(base_url: str, email: str) -> str:
+    """Key of the token of a user on a server"""
+    return f"{base_url.rstrip('/')}|{email.lower()}"
+
+
+def is_auth_failure(error: TapdataError) -> bool:
+    """Whether an error means the access token was rejected"""
+    if isinstance(error, TapdataAuthError):
+        return True
+    return isinstance(error, TapdataHTTPError) and error.status_code == 401
+
+
+class TokenStore(ABC):
+    """
+    Where access tokens are kept between client instances
+
+    Subclasses implement load, save and clear; a missing or unreadable
+    token is reported as None rather than raised.
+    """
+
+    @abstractmethod
+    def load(self, key: str) -> Optional[StoredToken]:
+        """Stored token for a key, None if there is none"""
+
+    @abstractmethod
+    def save(self, key: str, token: StoredToken) -> None:
+        """Store a token"""
+
+    @abstractmethod
+    def clear(self, key: str) -> None:
+        """Forget the token of a key"""
+
+
+class MemoryTokenStore(TokenStore):
+    """Tokens shared by the clients of one process"""
+
+    def __init__(self):
+        self._tokens: Dict[str, StoredToken] = {}
+        self._lock = threading.Lock()
+
+    def load(self, key: str) -> Optional[StoredToken]:
+        with self._lock:
+            return self._tokens.get(key)
+
+    def save(self, key: str, token: StoredToken) -> None:
+        with self._lock:
+            self._tokens[key] = token
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._tokens.pop(key, None)
+
+
+class FileTokenStore(TokenStore):
+    """
+    Tokens kept in a JSON file readable by the current user only
+
+    Writes replace the file atomically, so processes sharing it never
+    read a partial file.
+
+    Args:
+        path: Token file, defaults to ~/.tapdata_sdk/tokens.json
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(os.path.expanduser("~"), ".tapdata_sdk", "tokens.json")
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable token file {self.path}: {e}")
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, data: Dict[str, dict]) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tokens-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def load(self, key: str) -> Optional[StoredToken]:
+        with self._lock:
+            entry = self._read().get(key)
+        try:
+            return StoredToken.from_dict(entry) if entry else None
+        except (KeyError, TypeError):
+            return None
+
+    def save(self, key: str, token: StoredToken) -> None:
+        with self._lock:
+            data = self._read()
+            data[key] = token.to_dict()
+            self._write(data)
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            data = self._read()
+            if data.pop(key, None) is not None:
+                self._write(data)
+
+
+class KeyringTokenStore(TokenStore):
+    """
+    Tokens kept in the system keyring
+
+    Args:
+        service: Keyring service name
+    """
+
+    def __init__(self, service: str = "tapdata-sdk"):
+        if keyring is None:
+            raise ImportError(
+                "keyring is required for KeyringTokenStore. "
+                "Install it with: pip install tapdata-sdk[keyring]"
+            )
+        self.service = service
+
+    def load(self, key: str) -> Optional[StoredToken]:
+        value = keyring.get_password(self.service, key)
+        try:
+            return StoredToken.from_dict(json.loads(value)) if value else None
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def save(self, key: str, token: StoredToken) -> None:
+        keyring.set_password(self.service, key, json.dumps(token.to_dict()))
+
+    def clear(self, key: str) -> None:
+        try:
+            keyring.delete_password(self.service, key)
+        except keyring.errors.PasswordDeleteError:
+            pass
@@ -0,0 +1,176 @@
+"""Response cache for read-mostly API lookups"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+@dataclass
+class CacheStats:
+    """Cache counters"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    size: int = 0
+    maxsize: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups served from the cache"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "size": self.size,
+            "maxsize": self.maxsize,
+            "hit_rate": self.hit_rate,
+        }
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+    endpoint: str
+    path_params: Tuple[Tuple[str, str], ...]
+
+
+class ResponseCache:
+    """
+    Thread-safe TTL + LRU cache for GET responses
+
+    Only endpoints with a TTL (per endpoint template, or default_ttl) are
+    cached. Values are deep-copied when stored and when returned, so a
+    caller mutating its response (e.g. a model) never changes what other
+    callers get.
+
+    Args:
+        maxsize: Maximum number of cached responses
+        ttls: TTL in seconds per endpoint template, e.g.
+            {"/api/Connections/{id}": 300}; merged over DEFAULT_TTLS
+        default_ttl: TTL for endpoints missing from ttls (None = not cached)
+
+    Examples:
+        >>> cache = ResponseCache(maxsize=4096, ttls={"/api/Task/{id}": 5})
+        >>> client = TapdataClient("http://localhost:3030", cache=cache)
+        >>> client.cache.stats().hit_rate
+    """
+
+    DEFAULT_TTLS = {
+        "/api/Connections/{id}": 300.0,
+    }
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: Optional[float] = None,
+    ):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttls = dict(self.DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats(maxsize=maxsize)
+
+    def ttl_for(self, endpoint: str) -> Optional[float]:
+        """TTL of an endpoint template, None if it is not cached"""
+        ttl = self.ttls.get(endpoint, self.default_ttl)
+        return ttl if ttl and ttl > 0 else None
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached value, None on miss or expiry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            value = entry.value
+        return copy.deepcopy(value)
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: float,
+        endpoint: str = "",
+        path_params: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Store a value, evicting the least recently used entries if full"""
+        entry = _Entry(
+            value=copy.deepcopy(value),
+            expires_at=time.monotonic() + ttl,
+            endpoint=endpoint,
+            path_params=tuple(
+                sorted((k, str(v)) for k, v in (path_params or {}).items())
+            ),
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def invalidate(self, endpoint: Optional[str] = None, **path_params: Any) -> int:
+        """
+        Drop cached entries
+
+        Args:
+            endpoint: Endpoint template to match (None = any endpoint)
+            **path_params: Path parameters the entry must have, e.g. id="..."
+
+        Returns:
+            Number of dropped entries
+
+        Examples:
+            >>> client.cache.invalidate("/api/Connections/{id}", id=conn_id)
+        """
+        wanted = {(k, str(v)) for k, v in path_params.items()}
+        with self._lock:
+            keys = [
+                key
+                for key, entry in self._entries.items()
+                if (endpoint is None or entry.endpoint == endpoint)
+                and wanted.issubset(entry.path_params)
+            ]
+            for key in keys:
+                del self._entries[key]
+            self._stats.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop every cached entry"""
+        with self._lock:
+            self._stats.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        """Snapshot of the cache counters"""
+        with self._lock:
+            self._stats.size = len(self._entries)
+            return CacheStats(**vars(self._stats))
+
+    def __len__(self) -> int:
+        return len(self._entries)
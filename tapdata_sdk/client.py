@@ -1,31 +1,134 @@
 """Tapdata API Client"""
 import logging
-from typing import Dict, List, Optional, Union
+import shutil
+import tempfile
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Mapping
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Union
 from urllib.parse import urljoin
 import urllib.parse
-import json as jsonx
+import threading
 import time
+from datetime import timedelta
 
 import requests
 
+from .api import (
+    LogCursor,
+    NOOP_STATUSES,
+    TASK_DETAIL_FIELDS,
+    WAIT_TASK_FIELDS,
+    attach_connections,
+    batch_error_results,
+    batch_results,
+    check_accepted,
+    check_response,
+    connection_filter,
+    encode_params,
+    fields_filter,
+    http_error,
+    logs_query,
+    relation_connection_ids,
+    retry_delay,
+    settled,
+    task_filter,
+    wait_timeout,
+)
+from .auth import AUTH_ENDPOINTS, StoredToken, TokenStore, is_auth_failure, token_key
+from .cache import ResponseCache
+from .coalesce import RequestCoalescer
+from .compression import Compression, accept_encoding
+from .codec import JSONCodec, convert_object, convert_page, get_codec
 from .exceptions import (
-    TapdataAuthError,
     TapdataConnectionError,
     TapdataError,
     TapdataTimeoutError,
 )
-from .models import Connection, Task, TaskDetail, TaskLog, TaskRelation
-from .utils import rc4_encrypt, gen_sign, build_filter
+from .metrics import ClientMetrics, RequestEvent, RequestHook
+from .models import (
+    Connection,
+    Task,
+    TaskDetail,
+    TaskLog,
+    TaskOperationResult,
+    TaskRelation,
+)
+from .query import Query
+from .reports import ReportClient
+from .retry import RetryPolicy
+from .stream import STREAM_CHUNK_SIZE, item_parser
+from .throttle import RequestGovernor
+from .transport import (
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    create_session,
+    decodable_encodings,
+)
+from .utils import (
+    Backoff,
+    bounded_map,
+    chunk_ids,
+    gen_sign,
+    iter_pages,
+    rc4_encrypt,
+    request_key,
+)
+from .watcher import TaskWatcher
 from .enums import ConnectionType, DatabaseType, Status, LogLevel
 
 
 logger = logging.getLogger(__name__)
 
 
+
+def _record_response(
+    event: RequestEvent,
+    resp: requests.Response,
+    elapsed: float,
+) -> None:
+    """Copy status, body sizes and transfer timings of a response to an event"""
+    _record_headers(event, resp)
+    content = resp.content
+    if isinstance(content, bytes):
+        event.bytes_received = len(content)
+    _record_wire_bytes(event, resp)
+    if isinstance(resp.elapsed, timedelta):
+        server = resp.elapsed.total_seconds()
+        event.timings["server"] = server
+        event.timings["download"] = max(elapsed - server, 0.0)
+
+
+def _record_headers(event: RequestEvent, resp: requests.Response) -> None:
+    """Copy status, request body size and content encoding of a response to an event"""
+    if isinstance(resp.status_code, int):
+        event.status = resp.status_code
+    body = getattr(resp.request, "body", None)
+    if isinstance(body, (bytes, str)):
+        event.bytes_sent = len(body)
+    encoding = resp.headers.get("Content-Encoding") if isinstance(resp.headers, Mapping) else None
+    if encoding and encoding != "identity":
+        event.content_encoding = encoding
+
+
+def _record_wire_bytes(event: RequestEvent, resp: requests.Response) -> None:
+    """Record the transferred size of a fully read body"""
+    # urllib3 counts the bytes read from the socket, before decompression
+    tell = getattr(resp.raw, "tell", None)
+    wire = tell() if callable(tell) else None
+    event.bytes_received_wire = wire if isinstance(wire, int) else event.bytes_received
+
+
+
 class TapdataClient:
     """
     Tapdata API Client
     
+    A client is safe to share between threads: requests never modify the
+    caller's arguments or other client state, the connection pool, cache,
+    metrics and governor are lock-protected, and concurrent re-logins
+    after a rejected token are collapsed into one.
+    
     Examples:
         >>> client = TapdataClient("http://localhost:3030")
         >>> client.login("admin@test.com", "password")
@@ -36,12 +139,30 @@ class TapdataClient:
     DEFAULT_TIMEOUT = 30
     DEFAULT_SECRET = "Gotapd8"
     
+    # Clients returned by shared(), keyed by base URL
+    _shared: Dict[str, "TapdataClient"] = {}
+    _shared_lock = threading.Lock()
+    
     def __init__(
         self,
         base_url: str,
         access_token: Optional[str] = None,
         timeout: int = DEFAULT_TIMEOUT,
         verify_ssl: bool = True,
+        session: Optional[requests.Session] = None,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        tcp_keepalive: bool = False,
+        cache: Union[bool, ResponseCache, None] = None,
+        retry: Optional[RetryPolicy] = None,
+        governor: Optional[RequestGovernor] = None,
+        codec: Union[str, JSONCodec, None] = "auto",
+        token_store: Optional[TokenStore] = None,
+        auto_relogin: bool = True,
+        coalesce: bool = True,
+        compression: Compression = "auto",
     ):
         """
         Initialize client
@@ -51,16 +172,116 @@ class TapdataClient:
             access_token: Access token (optional)
             timeout: Request timeout in seconds
             verify_ssl: Whether to verify SSL certificate
+            session: Existing session to share between clients; the pool
+                options below are ignored when it is given
+            pool_connections: Number of per-host connection pools to cache
+            pool_maxsize: Maximum connections kept open per host
+            pool_block: Wait for a free pooled connection instead of opening
+                and discarding an extra one
+            keep_alive: Reuse connections between requests
+            tcp_keepalive: Enable TCP keep-alive probes on idle connections
+            cache: Response cache for read-mostly GET endpoints; True uses
+                a ResponseCache with default TTLs
+            retry: Retry policy for transient failures; defaults to
+                retrying idempotent requests up to 3 times
+            governor: Rate limits and in-flight caps per endpoint class,
+                shared by all sub-clients (and any client given the same one)
+            codec: JSON backend: "auto" (msgspec, orjson or json, whichever
+                is installed first), a backend name or a JSONCodec
+            token_store: Where login() looks for a still valid token before
+                logging in, and saves new tokens
+            auto_relogin: After login(), log in again and replay the request
+                once when the server rejects the access token
+            coalesce: Let concurrent identical GET requests share one
+                in-flight request and its (not to be mutated) response
+            compression: Response compression: "auto" offers every encoding
+                urllib3 can decompress (gzip, deflate, and br/zstd when
+                brotli/zstandard are installed), None disables it, and an
+                encoding or list of encodings forces those
         """
         self.base_url = base_url.rstrip("/")
         self.access_token = access_token
         self.timeout = timeout
         self.verify_ssl = verify_ssl
-        self.session = requests.Session()
+        self.token_store = token_store
+        self.auto_relogin = auto_relogin
+        # (email, password, secret) of the last login, for re-login
+        self._credentials: Optional[tuple] = None
+        self._auth_lock = threading.Lock()
+        self._owns_session = session is None
+        if session is None:
+            session = create_session(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+                keep_alive=keep_alive,
+                tcp_keepalive=tcp_keepalive,
+            )
+        self.session = session
+        self.cache = cache if isinstance(cache, ResponseCache) else (
+            ResponseCache() if cache else None
+        )
+        self.retry = retry or RetryPolicy()
+        self.governor = governor
+        self.codec = get_codec(codec)
+        self.accept_encoding = accept_encoding(compression, decodable_encodings())
+        self.coalescer = RequestCoalescer() if coalesce else None
+        self.metrics = ClientMetrics()
+        self.before_request_hooks: List[RequestHook] = []
+        self.after_request_hooks: List[RequestHook] = []
         
         # Initialize sub-clients
         self.connections = ConnectionClient(self)
         self.tasks = TaskClient(self)
+        self.reports = ReportClient(self)
+    
+    @classmethod
+    def shared(cls, base_url: str, **kwargs) -> "TapdataClient":
+        """
+        Process-wide client for a base URL, created on first use
+        
+        Worker threads calling shared() get the same client, so they share
+        one connection pool and one login.
+        
+        Args:
+            base_url: API base URL
+            **kwargs: TapdataClient arguments, only used when the client is
+                created
+            
+        Returns:
+            Shared client
+            
+        Examples:
+            >>> def worker(task_id):
+            ...     client = TapdataClient.shared("http://localhost:3030")
+            ...     return client.tasks.get(task_id)
+        """
+        key = base_url.rstrip("/")
+        with cls._shared_lock:
+            client = cls._shared.get(key)
+            if client is None:
+                client = cls._shared[key] = cls(base_url, **kwargs)
+            return client
+    
+    @classmethod
+    def close_shared(cls) -> None:
+        """Close and forget every client created by shared()"""
+        with cls._shared_lock:
+            clients = list(cls._shared.values())
+            cls._shared.clear()
+        for client in clients:
+            client.close()
+    
+    def __enter__(self) -> "TapdataClient":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Close the connection pool if this client created it"""
+        if self._owns_session:
+            self.session.close()
     
     def _build_url(self, path: str) -> str:
         """Build complete URL"""
@@ -72,6 +293,10 @@ class TapdataClient:
         path: str,
         params: Optional[dict] = None,
         json: Optional[dict] = None,
+        path_params: Optional[dict] = None,
+        idempotent: Optional[bool] = None,
+        model: Optional[type] = None,
+        page: bool = True,
         **kwargs,
     ) -> dict:
         """
@@ -79,9 +304,14 @@ class TapdataClient:
         
         Args:
             method: HTTP method
-            path: API path
+            path: API path, optionally a template such as "/api/Task/{id}"
             params: URL parameters
             json: JSON request body
+            path_params: Values filled into the path template
+            idempotent: Whether the request may be retried, overriding the
+                method-based default of the retry policy
+            model: Model class the response data is decoded into
+            page: Whether the data is a page of model items rather than one object
             **kwargs: Other request parameters
             
         Returns:
@@ -92,49 +322,387 @@ class TapdataClient:
             TapdataTimeoutError: Request timeout
             TapdataConnectionError: Connection error
         """
-        params = params or {}
+        endpoint = path
+        if path_params:
+            path = path.format(**path_params)
+        
+        ttl = None
+        if self.cache is not None and method.upper() == "GET":
+            ttl = self.cache.ttl_for(endpoint)
+        if ttl is not None:
+            key = request_key(method, path, params)
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.debug(f"Cache hit: {method} {path}")
+                return cached
+        
+        def send() -> dict:
+            return self._send(
+                method,
+                path,
+                endpoint,
+                params=params,
+                json=json,
+                idempotent=idempotent,
+                model=model,
+                page=page,
+                **kwargs,
+            )
         
-        # Add access_token
-        url = self._build_url(path)
-        if self.access_token:
-            params["access_token"] = self.access_token
+        def call() -> dict:
+            token = self.access_token
+            try:
+                data = send()
+            except TapdataError as e:
+                if not self._can_relogin(e, endpoint):
+                    raise
+                logger.info(f"Access token rejected by {method} {path}, logging in again")
+                self._relogin(token)
+                data = send()
+            if ttl is not None:
+                self.cache.set(key, data, ttl, endpoint=endpoint, path_params=path_params)
+            return data
+        
+        if self.coalescer is None or method.upper() != "GET":
+            return call()
+        # Callers decoding into different models must not share a response
+        flight_key = request_key(method, path, params) + (model, page)
+        data, shared = self.coalescer.do(flight_key, call)
+        if shared:
+            logger.debug(f"Coalesced: {method} {path}")
+            self.metrics.record_coalesced(method, endpoint)
+        return data
+    
+    def add_request_hook(
+        self,
+        before: Optional[RequestHook] = None,
+        after: Optional[RequestHook] = None,
+    ) -> None:
+        """
+        Register callbacks run around every request attempt
+        
+        Args:
+            before: Called with the RequestEvent before the request is sent
+            after: Called with the completed RequestEvent (status, sizes,
+                timings and error filled in)
+            
+        Examples:
+            >>> def log_slow(event):
+            ...     if event.timings["total"] > 1:
+            ...         print(event.method, event.endpoint, event.timings)
+            >>> client.add_request_hook(after=log_slow)
+        """
+        if before is not None:
+            self.before_request_hooks.append(before)
+        if after is not None:
+            self.after_request_hooks.append(after)
+    
+    def _run_hooks(self, hooks: List[RequestHook], event: RequestEvent) -> None:
+        """Run request hooks, never letting a hook break the request"""
+        for hook in hooks:
+            try:
+                hook(event)
+            except Exception:
+                logger.exception(f"Request hook {hook!r} failed")
+    
+    def _send(
+        self,
+        method: str,
+        path: str,
+        endpoint: str,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+        idempotent: Optional[bool] = None,
+        model: Optional[type] = None,
+        page: bool = True,
+        **kwargs,
+    ) -> dict:
+        """Perform the request, retrying transient failures per the retry policy"""
+        retryable = self.retry.allows_method(method, idempotent)
+        attempt = 1
+        while True:
+            event = RequestEvent(
+                method=method,
+                endpoint=endpoint,
+                url=self._build_url(path),
+                attempt=attempt,
+            )
+            self._run_hooks(self.before_request_hooks, event)
+            slot = (
+                self.governor.slot(method, endpoint)
+                if self.governor is not None
+                else nullcontext()
+            )
+            try:
+                with slot:
+                    data = self._send_once(
+                        method,
+                        path,
+                        event,
+                        params=params,
+                        json=json,
+                        model=model,
+                        page=page,
+                        **kwargs,
+                    )
+            except TapdataError as e:
+                event.error = e
+                self.metrics.observe(event)
+                self._run_hooks(self.after_request_hooks, event)
+                delay = retry_delay(self.retry, retryable, attempt, e, method, path)
+                if delay is None:
+                    raise
+                self.metrics.record_retry(method, endpoint)
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self.metrics.observe(event)
+            self._run_hooks(self.after_request_hooks, event)
+            return data
+    
+    def _send_once(
+        self,
+        method: str,
+        path: str,
+        event: RequestEvent,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+        model: Optional[type] = None,
+        page: bool = True,
+        **kwargs,
+    ) -> dict:
+        """
+        Perform a single HTTP request and check its business status code
         
-        if params.get('filter'):
-           filter_str = jsonx.dumps(params.get('filter'), separators=(',', ':'))
-           params['filter'] = filter_str
+        Status, sizes and timings are recorded on the event. requests does
+        not expose DNS/connect/TLS phases, so "server" covers everything
+        up to the response headers.
+        """
+        url = event.url
+        params = encode_params(params, self.access_token, self.codec)
+        started = time.perf_counter()
         
         try:
             logger.debug(f"Request: {method} {url}")
             
+            headers = {"Accept-Encoding": self.accept_encoding}
+            headers.update(kwargs.get("headers") or {})
             resp = self.session.request(
                 method=method,
                 url=url,
                 params=params,
                 json=json,
+                headers=headers,
                 timeout=kwargs.get("timeout", self.timeout),
                 verify=self.verify_ssl,
-                **{k: v for k, v in kwargs.items() if k != "timeout"},
+                **{k: v for k, v in kwargs.items() if k not in ("timeout", "headers")},
             )
+            received = time.perf_counter()
+            _record_response(event, resp, received - started)
             resp.raise_for_status()
             
-            data = resp.json()
-            
-            # Check business status code
-            if data.get("code") != "ok":
-                error_code = data.get("code")
-                if error_code in ["UNAUTHORIZED", "FORBIDDEN"]:
-                    raise TapdataAuthError(data)
-                raise TapdataError(data)
+            data = self._decode(resp, model, page)
+            event.timings["decode"] = time.perf_counter() - received
+            data = check_response(data)
             
             logger.debug(f"Response: {data.get('code')}")
             return data
             
+        except requests.exceptions.HTTPError as e:
+            raise http_error(
+                e.response.status_code,
+                e.response.headers.get("Retry-After"),
+                e,
+            )
         except requests.exceptions.Timeout as e:
             raise TapdataTimeoutError({"message": f"Request timeout: {e}"})
         except requests.exceptions.ConnectionError as e:
             raise TapdataConnectionError({"message": f"Connection error: {e}"})
         except requests.exceptions.RequestException as e:
             raise TapdataError({"message": f"Request failed: {e}"})
+        except ValueError as e:
+            raise TapdataError({"message": f"Invalid JSON response: {e}"})
+        finally:
+            event.timings["total"] = time.perf_counter() - started
+    
+    def _decode(
+        self,
+        resp: requests.Response,
+        model: Optional[type],
+        page: bool,
+    ) -> dict:
+        """Decode a response body with the client codec"""
+        raw = resp.content
+        if not isinstance(raw, (bytes, bytearray)):
+            # Responses without a raw body (such as test doubles) only
+            # offer the decoded JSON
+            data = resp.json()
+            if model is None:
+                return data
+            return convert_page(data, model) if page else convert_object(data, model)
+        if model is None:
+            return self.codec.loads(raw)
+        if page:
+            return self.codec.loads_page(raw, model)
+        return self.codec.loads_object(raw, model)
+    
+    def _stream(
+        self,
+        method: str,
+        path: str,
+        model: type,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+        idempotent: Optional[bool] = None,
+    ) -> Iterator[Any]:
+        """
+        Perform a page request, yielding its items while the body is read
+        
+        Failures before the first item are retried and re-logged in like
+        _request; later ones are raised as they are, since a replay would
+        repeat the items already yielded. Streamed pages bypass the cache
+        and request coalescing.
+        
+        Args:
+            method: HTTP method
+            path: API path
+            model: Model class the items are decoded into
+            params: URL parameters
+            json: JSON request body
+            idempotent: Whether the request may be retried
+            
+        Yields:
+            Model instances, one item at a time
+        """
+        retryable = self.retry.allows_method(method, idempotent)
+        relogin = True
+        attempt = 1
+        while True:
+            token = self.access_token
+            event = RequestEvent(
+                method=method,
+                endpoint=path,
+                url=self._build_url(path),
+                attempt=attempt,
+            )
+            self._run_hooks(self.before_request_hooks, event)
+            yielded = False
+            try:
+                for item in self._stream_once(method, event, model, params=params, json=json):
+                    yielded = True
+                    yield item
+            except TapdataError as e:
+                event.error = e
+                self.metrics.observe(event)
+                self._run_hooks(self.after_request_hooks, event)
+                if yielded:
+                    raise
+                if relogin and self._can_relogin(e, path):
+                    relogin = False
+                    logger.info(f"Access token rejected by {method} {path}, logging in again")
+                    self._relogin(token)
+                    continue
+                delay = retry_delay(self.retry, retryable, attempt, e, method, path)
+                if delay is None:
+                    raise
+                self.metrics.record_retry(method, path)
+                time.sleep(delay)
+                attempt += 1
+                continue
+            except GeneratorExit:
+                # The caller stopped before the end of the page
+                self.metrics.observe(event)
+                self._run_hooks(self.after_request_hooks, event)
+                raise
+            self.metrics.observe(event)
+            self._run_hooks(self.after_request_hooks, event)
+            return
+    
+    def _stream_once(
+        self,
+        method: str,
+        event: RequestEvent,
+        model: type,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+    ) -> Iterator[Any]:
+        """
+        Perform a single streamed request and check its business status code
+        
+        The body is read in STREAM_CHUNK_SIZE chunks and parsed
+        incrementally, so memory stays bounded by the largest item.
+        
+        The governor slot is only held until the response headers arrive:
+        the caller may run other requests between items, which would
+        deadlock on a slot held for the whole body.
+        """
+        params = encode_params(params, self.access_token, self.codec)
+        parser = item_parser()
+        slot = (
+            self.governor.slot(method, event.endpoint)
+            if self.governor is not None
+            else nullcontext()
+        )
+        started = time.perf_counter()
+        
+        try:
+            logger.debug(f"Streaming request: {method} {event.url}")
+            
+            with slot:
+                resp = self.session.request(
+                    method=method,
+                    url=event.url,
+                    params=params,
+                    json=json,
+                    headers={"Accept-Encoding": self.accept_encoding},
+                    timeout=self.timeout,
+                    verify=self.verify_ssl,
+                    stream=True,
+                )
+            try:
+                headers_at = time.perf_counter()
+                _record_headers(event, resp)
+                event.timings["server"] = headers_at - started
+                resp.raise_for_status()
+                
+                for chunk in resp.iter_content(STREAM_CHUNK_SIZE):
+                    event.bytes_received += len(chunk)
+                    for item in parser.feed(chunk):
+                        yield model.from_dict(item)
+                for item in parser.close():
+                    yield model.from_dict(item)
+                _record_wire_bytes(event, resp)
+                event.timings["download"] = time.perf_counter() - headers_at
+            finally:
+                resp.close()
+            
+        except requests.exceptions.HTTPError as e:
+            raise http_error(
+                e.response.status_code,
+                e.response.headers.get("Retry-After"),
+                e,
+            )
+        except requests.exceptions.Timeout as e:
+            raise TapdataTimeoutError({"message": f"Request timeout: {e}"})
+        except requests.exceptions.ConnectionError as e:
+            raise TapdataConnectionError({"message": f"Connection error: {e}"})
+        except requests.exceptions.RequestException as e:
+            raise TapdataError({"message": f"Request failed: {e}"})
+        except ValueError as e:
+            raise TapdataError({"message": f"Invalid JSON response: {e}"})
+        finally:
+            event.timings["total"] = time.perf_counter() - started
+        
+        check_response(parser.envelope)
+        logger.debug(f"Response: {parser.envelope.get('code')}")
+    
+    def _invalidate_tasks(self, task_ids: Iterable[str]) -> None:
+        """Drop cached responses that a task mutation makes stale"""
+        if self.cache is None:
+            return
+        for task_id in task_ids:
+            self.cache.invalidate("/api/Task/{id}", id=task_id)
+        self.cache.invalidate("/api/Task")
     
     def get_timestamp(self) -> int:
         """
@@ -151,14 +719,19 @@ class TapdataClient:
         email: str,
         password: str,
         secret: str = DEFAULT_SECRET,
+        reuse_token: bool = True,
     ) -> str:
         """
         User login
         
+        With a token store, a stored token that has not expired is reused
+        without any request.
+        
         Args:
             email: Email
             password: Password (plain text)
             secret: Encryption secret key
+            reuse_token: Use a valid token from the token store
             
         Returns:
             Access token
@@ -166,9 +739,54 @@ class TapdataClient:
         Examples:
             >>> client = TapdataClient("http://localhost:3030")
             >>> token = client.login("admin@test.com", "password")
+            >>>
+            >>> # Cron workers: reuse the token across processes
+            >>> client = TapdataClient(url, token_store=FileTokenStore())
+            >>> client.login("admin@test.com", "password")
         """
-        stime = self.get_timestamp()
+        with self._auth_lock:
+            self._credentials = (email, password, secret)
+            
+            if reuse_token and self.token_store is not None:
+                stored = self.token_store.load(token_key(self.base_url, email))
+                if stored is not None and not stored.expired():
+                    self.access_token = stored.access_token
+                    logger.info(f"Reusing stored access token: {email}")
+                    return self.access_token
+            
+            return self._login(email, password, secret)
+    
+    def _can_relogin(self, error: TapdataError, endpoint: str) -> bool:
+        """Whether a failed request may be replayed after logging in again"""
+        return (
+            self.auto_relogin
+            and self._credentials is not None
+            and endpoint not in AUTH_ENDPOINTS
+            and is_auth_failure(error)
+        )
+    
+    def _relogin(self, rejected: Optional[str]) -> None:
+        """
+        Log in again with the credentials of the last login
+        
+        Threads whose requests were rejected together wait for the first
+        one to log in and then reuse its token.
+        
+        Args:
+            rejected: Access token the failed request was sent with
+        """
+        with self._auth_lock:
+            if self.access_token != rejected:
+                return
+            email, password, secret = self._credentials
+            if self.token_store is not None:
+                self.token_store.clear(token_key(self.base_url, email))
+            self._login(email, password, secret)
+    
+    def _login(self, email: str, password: str, secret: str) -> str:
+        """Encrypt the password, log in and store the new token"""
         enc_pwd = rc4_encrypt(password, secret)
+        stime = self.get_timestamp()
         sign = gen_sign(email, enc_pwd, stime, secret)
         
         resp = self._request(
@@ -182,15 +800,19 @@ class TapdataClient:
         )
         
         self.access_token = resp["data"]["id"]
+        if self.token_store is not None:
+            self.token_store.save(token_key(self.base_url, email), StoredToken.from_login(resp["data"]))
         logger.info(f"Login successful: {email}")
         
         return self.access_token
     
     def logout(self) -> None:
-        """Logout"""
-        self.access_token = None
-        self.session.close()
-        self.session = requests.Session()
+        """Logout, keeping the pooled connections open for reuse"""
+        with self._auth_lock:
+            if self._credentials is not None and self.token_store is not None:
+                self.token_store.clear(token_key(self.base_url, self._credentials[0]))
+            self.access_token = None
+            self._credentials = None
         logger.info("Logged out")
     
     def is_authenticated(self) -> bool:
@@ -212,6 +834,7 @@ class ConnectionClient:
         name: Optional[str] = None,
         skip: int = 0,
         limit: int = 20,
+        query: Optional[Query] = None,
     ) -> List[Connection]:
         """
         Query connection list
@@ -222,6 +845,8 @@ class ConnectionClient:
             status: Status
             skip: Number of records to skip
             limit: Limit on number of results
+            query: Extra conditions, projection, ordering and paging,
+                merged over the arguments above
             
         Returns:
             Connection list
@@ -231,26 +856,28 @@ class ConnectionClient:
             ...     connection_type=ConnectionType.SOURCE,
             ...     database_type=DatabaseType.MYSQL
             ... )
+            >>> connections = client.connections.list(
+            ...     query=Query().where_in("status", ["ready", "invalid"]).fields("name")
+            ... )
         """
-        where = {"createType": {"$ne": "System"}}
-        order = "last_updated DESC"
-        
-        if connection_type:
-            where["connection_type"] = str(connection_type)
-        if database_type:
-            where["database_type"] = str(database_type)
-        if status:
-            where["status"] = str(status)
-        if name:
-            where["name"] = {"like":str(name),"options":"i"}
-        
         resp = self.client._request(
             "GET",
             "/api/Connections",
-            params={"filter": build_filter(order=order, skip=skip, limit=limit, where=where)},
+            params={
+                "filter": connection_filter(
+                    connection_type=connection_type,
+                    database_type=database_type,
+                    status=status,
+                    name=name,
+                    skip=skip,
+                    limit=limit,
+                    query=query,
+                )
+            },
+            model=Connection,
         )
         
-        return [Connection.from_dict(item) for item in resp["data"]["items"]]
+        return list(resp["data"]["items"])
     
     def get(self, connection_id: str) -> Connection:
         """
@@ -262,44 +889,181 @@ class ConnectionClient:
         Returns:
             Connection object
         """
-        resp = self.client._request("GET", f"/api/Connections/{connection_id}")
+        resp = self.client._request(
+            "GET",
+            "/api/Connections/{id}",
+            path_params={"id": connection_id},
+        )
         return Connection.from_dict(resp["data"])
     
+    def stream(
+        self,
+        connection_type: Optional[Union[str, ConnectionType]] = None,
+        database_type: Optional[Union[str, DatabaseType]] = None,
+        status: Optional[Union[str, Status]] = None,
+        name: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20,
+        query: Optional[Query] = None,
+    ) -> Iterator[Connection]:
+        """
+        Query a connection page, yielding connections while it downloads
+        
+        Unlike list, the response is parsed incrementally, so memory stays
+        bounded however large limit is. The request is sent when iteration
+        starts.
+        
+        Args:
+            Same as list
+            
+        Yields:
+            Connection objects
+            
+        Examples:
+            >>> for conn in client.connections.stream(limit=5000):
+            ...     print(conn.name)
+        """
+        return self.client._stream(
+            "GET",
+            "/api/Connections",
+            Connection,
+            params={
+                "filter": connection_filter(
+                    connection_type=connection_type,
+                    database_type=database_type,
+                    status=status,
+                    name=name,
+                    skip=skip,
+                    limit=limit,
+                    query=query,
+                )
+            },
+        )
+    
+    def iter_all(
+        self,
+        connection_type: Optional[Union[str, ConnectionType]] = None,
+        database_type: Optional[Union[str, DatabaseType]] = None,
+        status: Optional[Union[str, Status]] = None,
+        name: Optional[str] = None,
+        page_size: int = 100,
+        prefetch: bool = False,
+        query: Optional[Query] = None,
+    ) -> Iterator[Connection]:
+        """
+        Iterate over all matching connections, page by page
+        
+        Args:
+            connection_type: Connection type
+            database_type: Database type
+            status: Status
+            name: Name filter (case-insensitive match)
+            page_size: Number of connections requested per page
+            prefetch: Fetch the next page in the background while the
+                current one is being consumed
+            query: Extra conditions, projection and ordering; its skip and
+                limit bound the whole iteration, and id breaks ties in its
+                order (pages are sorted by id if it sets none)
+            
+        Yields:
+            Connection objects
+            
+        Examples:
+            >>> for conn in client.connections.iter_all(page_size=200):
+            ...     print(conn.name)
+        """
+        query = query or Query()
+        
+        def fetch(skip: int, limit: int) -> List[Connection]:
+            page = query.page(skip, limit)
+            if page is None:
+                return []
+            return self.list(
+                connection_type=connection_type,
+                database_type=database_type,
+                status=status,
+                name=name,
+                query=page,
+            )
+        
+        return iter_pages(fetch, page_size=page_size, prefetch=prefetch)
+    
+    def list_all(
+        self,
+        connection_type: Optional[Union[str, ConnectionType]] = None,
+        database_type: Optional[Union[str, DatabaseType]] = None,
+        status: Optional[Union[str, Status]] = None,
+        name: Optional[str] = None,
+        page_size: int = 100,
+        prefetch: bool = False,
+        query: Optional[Query] = None,
+    ) -> List[Connection]:
+        """
+        Query all matching connections across every page
+        
+        Args:
+            Same as iter_all
+            
+        Returns:
+            Connection list
+        """
+        return list(
+            self.iter_all(
+                connection_type=connection_type,
+                database_type=database_type,
+                status=status,
+                name=name,
+                page_size=page_size,
+                prefetch=prefetch,
+                query=query,
+            )
+        )
+    
     def list_source(self) -> List[Connection]:
         """Get all source connections"""
-        return self.list(connection_type=ConnectionType.SOURCE)
+        return self.list_all(connection_type=ConnectionType.SOURCE)
     
     def list_target(self) -> List[Connection]:
         """Get all target connections"""
-        return self.list(connection_type=ConnectionType.TARGET)
+        return self.list_all(connection_type=ConnectionType.TARGET)
     
     def list_mysql(self) -> List[Connection]:
         """Get all MySQL connections"""
-        return self.list(database_type=DatabaseType.MYSQL)
+        return self.list_all(database_type=DatabaseType.MYSQL)
     
     def list_clickhouse(self) -> List[Connection]:
         """Get all ClickHouse connections"""
-        return self.list(database_type=DatabaseType.CLICKHOUSE)
+        return self.list_all(database_type=DatabaseType.CLICKHOUSE)
     
     def list_mongodb(self) -> List[Connection]:
         """Get all MongoDB connections"""
-        return self.list(database_type=DatabaseType.MONGODB)
+        return self.list_all(database_type=DatabaseType.MONGODB)
     
     def list_valid(self) -> List[Connection]:
         """Get all valid connections"""
-        return self.list(status=Status.VALID)
+        return self.list_all(status=Status.VALID)
     
     def list_invalid(self) -> List[Connection]:
         """Get all invalid connections"""
-        return self.list(status=Status.INVALID)
+        return self.list_all(status=Status.INVALID)
 
     def list_testing(self) -> List[Connection]:
         """Get all testing connections"""
-        return self.list(status=Status.TESTING)
+        return self.list_all(status=Status.TESTING)
 
 class TaskClient:
     """Task management client"""
     
+    # URL-encoded length budget for the taskIds parameter of batch requests
+    BATCH_MAX_IDS_LENGTH = 1500
+    
+    # Polling interval bounds (seconds) of start/stop/reset/delete with wait
+    WAIT_INTERVAL = 0.5
+    WAIT_MAX_INTERVAL = 5.0
+    
+    # Characters of an export_logs shard kept in memory before spilling to disk
+    EXPORT_SPOOL_SIZE = 1024 * 1024
+    
     def __init__(self, client: TapdataClient):
         self.client = client
     
@@ -309,6 +1073,7 @@ class TaskClient:
         name: Optional[str] = None,
         skip: int = 0,
         limit: int = 20,
+        query: Optional[Query] = None,
     ) -> List[Task]:
         """
         Query task list
@@ -317,52 +1082,104 @@ class TaskClient:
             status: Status filter
             skip: Number of records to skip
             limit: Limit on number of results
+            query: Extra conditions, projection, ordering and paging,
+                merged over the arguments above
             
         Returns:
             Task list
+            
+        Examples:
+            >>> tasks = client.tasks.list(
+            ...     query=Query().where_in("status", [Status.ERROR, Status.STOP])
+            ...     .fields("name", "status")
+            ...     .order_by("-last_updated")
+            ... )
         """
-        where = {}
-        if status:
-            where["status"] = str(status)
-
-        if name:
-            where["name"] = {"like": str(name),"options":"i"}
-        
-        fields = {
-            "id": True,
-            "name": True,
-            "type": True,
-            "status": True,
-            "taskRecordId": True,
-        }
-        
         resp = self.client._request(
             "GET",
             "/api/Task",
             params={
-                "filter": build_filter(
+                "filter": task_filter(
+                    status=status,
+                    name=name,
                     skip=skip,
                     limit=limit,
-                    where=where,
-                    fields=fields,
+                    query=query,
                 )
             },
+            model=Task,
         )
         
-        return [Task.from_dict(item) for item in resp["data"]["items"]]
+        return list(resp["data"]["items"])
     
-    def get(self, task_id: str) -> TaskDetail:
+    def stream(
+        self,
+        status: Optional[Union[str, Status]] = None,
+        name: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20,
+        query: Optional[Query] = None,
+    ) -> Iterator[Task]:
+        """
+        Query a task page, yielding tasks while it downloads
+        
+        Unlike list, the response is parsed incrementally, so memory stays
+        bounded however large limit is. The request is sent when iteration
+        starts.
+        
+        Args:
+            Same as list
+            
+        Yields:
+            Task objects
+            
+        Examples:
+            >>> for task in client.tasks.stream(limit=5000, query=Query().fields("status")):
+            ...     print(task.name, task.status)
+        """
+        return self.client._stream(
+            "GET",
+            "/api/Task",
+            Task,
+            params={
+                "filter": task_filter(
+                    status=status,
+                    name=name,
+                    skip=skip,
+                    limit=limit,
+                    query=query,
+                )
+            },
+        )
+    
+    def get(self, task_id: str, fields: Optional[Iterable[str]] = None) -> TaskDetail:
         """
         Get single task details
         
+        The DAG is converted lazily, node by node, on first access.
+        
         Args:
             task_id: Task ID
+            fields: Only fetch these fields (API names such as "status",
+                or TaskDetail attributes such as "nodes"); the others are
+                None. Leaving out "dag"/"nodes" skips the DAG download.
             
         Returns:
             Task object
+            
+        Examples:
+            >>> client.tasks.get(task_id, fields=["status"]).status
         """
-        resp = self.client._request("GET", f"/api/Task/{task_id}")
-        return TaskDetail.from_dict(resp["data"])
+        filter_ = fields_filter(fields, TASK_DETAIL_FIELDS)
+        resp = self.client._request(
+            "GET",
+            "/api/Task/{id}",
+            params={"filter": filter_} if filter_ else None,
+            path_params={"id": task_id},
+            model=TaskDetail,
+            page=False,
+        )
+        return resp["data"]
 
     def get_table_relation(self, task_id: str) -> TaskRelation:
         """
@@ -376,7 +1193,7 @@ class TaskClient:
         """
         task_detail = self.get(task_id)
 
-        relation = TaskRelation.from_dict(task_detail.to_dict())
+        relation = TaskRelation.from_detail(task_detail)
 
         if relation.source_connection_id:
             relation.source_conn = self.client.connections.get(relation.source_connection_id)
@@ -386,80 +1203,465 @@ class TaskClient:
 
         return relation
     
+    def get_table_relations(
+        self,
+        task_ids: Iterable[str],
+        max_workers: int = 8,
+        return_exceptions: bool = False,
+    ) -> Dict[str, Union[TaskRelation, TapdataError]]:
+        """
+        Get table name relations for many tasks concurrently
+        
+        Task details are fetched in parallel, then every distinct source and
+        target connection is fetched once and shared between tasks.
+        
+        Args:
+            task_ids: Task IDs
+            max_workers: Maximum number of concurrent requests
+            return_exceptions: Put the TapdataError of a failed task in the
+                result instead of leaving the task out
+            
+        Returns:
+            Mapping of task_id to TaskRelation, in request order
+            
+        Examples:
+            >>> relations = client.tasks.get_table_relations(task_ids)
+            >>> for task_id, relation in relations.items():
+            ...     print(task_id, relation.table_name_relation)
+        """
+        task_ids = list(dict.fromkeys(task_ids))
+        outcomes: Dict[str, Union[TaskRelation, TapdataError]] = {}
+        
+        def fetch(fn, key):
+            try:
+                return fn(key)
+            except TapdataError as e:
+                return e
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            details = executor.map(lambda task_id: fetch(self.get, task_id), task_ids)
+            for task_id, detail in zip(task_ids, details):
+                if isinstance(detail, TapdataError):
+                    outcomes[task_id] = detail
+                else:
+                    outcomes[task_id] = TaskRelation.from_detail(detail)
+            
+            connection_ids = relation_connection_ids(outcomes.values())
+            connections = dict(zip(
+                connection_ids,
+                executor.map(
+                    lambda conn_id: fetch(self.client.connections.get, conn_id),
+                    connection_ids,
+                ),
+            ))
+        
+        return attach_connections(outcomes, connections, return_exceptions)
+    
+    def iter_all(
+        self,
+        status: Optional[Union[str, Status]] = None,
+        name: Optional[str] = None,
+        page_size: int = 100,
+        prefetch: bool = False,
+        query: Optional[Query] = None,
+    ) -> Iterator[Task]:
+        """
+        Iterate over all matching tasks, page by page
+        
+        Args:
+            status: Status filter
+            name: Name filter (case-insensitive match)
+            page_size: Number of tasks requested per page
+            prefetch: Fetch the next page in the background while the
+                current one is being consumed
+            query: Extra conditions, projection and ordering; its skip and
+                limit bound the whole iteration, and id breaks ties in its
+                order (pages are sorted by id if it sets none)
+            
+        Yields:
+            Task objects
+        """
+        query = query or Query()
+        
+        def fetch(skip: int, limit: int) -> List[Task]:
+            page = query.page(skip, limit)
+            if page is None:
+                return []
+            return self.list(status=status, name=name, query=page)
+        
+        return iter_pages(fetch, page_size=page_size, prefetch=prefetch)
+    
+    def list_all(
+        self,
+        status: Optional[Union[str, Status]] = None,
+        name: Optional[str] = None,
+        page_size: int = 100,
+        prefetch: bool = False,
+        query: Optional[Query] = None,
+    ) -> List[Task]:
+        """
+        Query all matching tasks across every page
+        
+        Args:
+            Same as iter_all
+            
+        Returns:
+            Task list
+        """
+        return list(
+            self.iter_all(
+                status=status,
+                name=name,
+                page_size=page_size,
+                prefetch=prefetch,
+                query=query,
+            )
+        )
+    
     def list_running(self) -> List[Task]:
         """Get all running tasks"""
-        return self.list(status=Status.RUNNING)
+        return self.list_all(status=Status.RUNNING)
 
     def list_error(self) -> List[Task]:
         """Get all error tasks"""
-        return self.list(status=Status.ERROR)
+        return self.list_all(status=Status.ERROR)
+    
+    def watch(
+        self,
+        task_ids: Iterable[str],
+        until: Optional[Iterable[Union[str, Status]]] = None,
+        interval: float = 1.0,
+        max_interval: float = 10.0,
+    ) -> TaskWatcher:
+        """
+        Watch the status of many tasks with a single polling loop
+        
+        Args:
+            task_ids: Tasks to watch
+            until: Statuses that end the watch of a task
+            interval: Polling interval right after a change (seconds)
+            max_interval: Longest polling interval while nothing changes (seconds)
+            
+        Returns:
+            TaskWatcher; iterate over it, or register callbacks and run() it
+            
+        Examples:
+            >>> for change in client.tasks.watch(ids, until=[Status.RUNNING, Status.ERROR]):
+            ...     print(change.task_id, change.previous, "->", change.status)
+        """
+        return TaskWatcher(
+            self.client,
+            task_ids,
+            until=until,
+            interval=interval,
+            max_interval=max_interval,
+        )
     
-    def start(self, task_id: str) -> dict:
+    def start(
+        self,
+        task_id: str,
+        wait: bool = False,
+        timeout: float = 300.0,
+    ) -> Union[dict, Task]:
         """
         Start task
         
         Args:
             task_id: Task ID
+            wait: Block until the task is running or complete
+            timeout: Longest wait in seconds
             
         Returns:
-            Operation result
+            Operation result, or with wait the final Task
+            
+        Raises:
+            TapdataTaskStateError: With wait, the task ended in error
+            TapdataTimeoutError: With wait, the task did not settle in time
+            TapdataError: With wait, the server rejected the operation
         """
+        before = self._current(task_id) if wait else None
         logger.info(f"Starting task: {task_id}")
-        return self.client._request(
-            "PUT",
-            "/api/Task/batchStart",
-            params={"taskIds": task_id},
-        )
+        try:
+            result = self.client._request(
+                "PUT",
+                "/api/Task/batchStart",
+                params={"taskIds": task_id},
+            )
+        finally:
+            self.client._invalidate_tasks([task_id])
+        return self._wait("start", task_id, before, result, timeout) if wait else result
     
-    def stop(self, task_id: str) -> dict:
+    def stop(
+        self,
+        task_id: str,
+        wait: bool = False,
+        timeout: float = 300.0,
+    ) -> Union[dict, Task]:
         """
         Stop task
         
         Args:
             task_id: Task ID
+            wait: Block until the task is stop or complete
+            timeout: Longest wait in seconds
             
         Returns:
-            Operation result
+            Operation result, or with wait the final Task
+            
+        Raises:
+            TapdataTaskStateError: With wait, the task ended in error
+            TapdataTimeoutError: With wait, the task did not settle in time
+            TapdataError: With wait, the server rejected the operation
         """
+        before = self._current(task_id) if wait else None
         logger.info(f"Stopping task: {task_id}")
-        return self.client._request(
-            "PUT",
-            "/api/Task/batchStop",
-            params={"taskIds": task_id},
-        )
+        try:
+            result = self.client._request(
+                "PUT",
+                "/api/Task/batchStop",
+                params={"taskIds": task_id},
+            )
+        finally:
+            self.client._invalidate_tasks([task_id])
+        return self._wait("stop", task_id, before, result, timeout) if wait else result
     
-    def reset(self, task_id: str) -> dict:
+    def reset(
+        self,
+        task_id: str,
+        wait: bool = False,
+        timeout: float = 300.0,
+    ) -> Union[dict, Task]:
         """
         Reset task
         
         Args:
             task_id: Task ID
+            wait: Block until the task is wait_start or edit
+            timeout: Longest wait in seconds
             
         Returns:
-            Operation result
+            Operation result, or with wait the final Task
+            
+        Raises:
+            TapdataTaskStateError: With wait, the task ended in renew_failed
+            TapdataTimeoutError: With wait, the task did not settle in time
+            TapdataError: With wait, the server rejected the operation
         """
+        before = self._current(task_id) if wait else None
         logger.info(f"Resetting task: {task_id}")
-        return self.client._request(
-            "PATCH",
-            "/api/Task/batchRenew",
-            params={"taskIds": task_id},
-        )
+        try:
+            result = self.client._request(
+                "PATCH",
+                "/api/Task/batchRenew",
+                params={"taskIds": task_id},
+            )
+        finally:
+            self.client._invalidate_tasks([task_id])
+        return self._wait("reset", task_id, before, result, timeout) if wait else result
     
-    def delete(self, task_id: str) -> dict:
+    def delete(
+        self,
+        task_id: str,
+        wait: bool = False,
+        timeout: float = 300.0,
+    ) -> Union[dict, Task, None]:
         """
         Delete task
         
         Args:
             task_id: Task ID
+            wait: Block until the task is deleted or gone
+            timeout: Longest wait in seconds
             
         Returns:
-            Operation result
+            Operation result, or with wait the final Task (None once
+                the task is gone)
+            
+        Raises:
+            TapdataTaskStateError: With wait, the task ended in delete_failed
+            TapdataTimeoutError: With wait, the task did not settle in time
+            TapdataError: With wait, the server rejected the operation
         """
+        before = self._current(task_id) if wait else None
         logger.warning(f"Deleting task: {task_id}")
-        return self.client._request(
+        try:
+            result = self.client._request(
+                "DELETE",
+                "/api/Task/batchDelete",
+                params={"taskIds": task_id},
+            )
+        finally:
+            self.client._invalidate_tasks([task_id])
+        return self._wait("delete", task_id, before, result, timeout) if wait else result
+    
+    def _current(self, task_id: str) -> Optional[Task]:
+        """Task with the fields watched while waiting, None if it does not exist"""
+        tasks = self.list(query=Query().where(id=task_id).fields(*WAIT_TASK_FIELDS).limit(1))
+        return tasks[0] if tasks else None
+    
+    def _wait(
+        self,
+        action: str,
+        task_id: str,
+        before: Optional[Task],
+        resp: dict,
+        timeout: float,
+    ) -> Optional[Task]:
+        """
+        Poll with backoff until an operation settles, see settled
+        
+        A rejected operation raises at once, and an operation the task
+        needs no work for returns the task read before it.
+        """
+        check_accepted(action, task_id, resp)
+        status = before.status if before else None
+        if status in NOOP_STATUSES[action]:
+            return before
+        watcher = TaskWatcher(
+            self.client,
+            [task_id],
+            interval=self.WAIT_INTERVAL,
+            max_interval=self.WAIT_MAX_INTERVAL,
+            fields=WAIT_TASK_FIELDS,
+        )
+        changed = False
+        for change in watcher.watch(timeout=timeout):
+            changed = changed or change.status != status
+            task = watcher.tasks.get(task_id)
+            if settled(action, task_id, task, status, changed):
+                return task
+        raise wait_timeout(action, task_id, watcher.statuses.get(task_id), timeout)
+    
+    def _batch(
+        self,
+        method: str,
+        path: str,
+        action: str,
+        task_ids: Iterable[str],
+        max_batch_size: Optional[int] = None,
+    ) -> List[TaskOperationResult]:
+        """
+        Run a batch task operation, chunking IDs to keep URLs short
+        
+        A failed chunk is reported per task instead of aborting the
+        remaining chunks.
+        """
+        results = []
+        for chunk in chunk_ids(
+            task_ids,
+            max_length=self.BATCH_MAX_IDS_LENGTH,
+            max_size=max_batch_size,
+        ):
+            logger.info(f"{action} {len(chunk)} tasks")
+            try:
+                resp = self.client._request(
+                    method,
+                    path,
+                    params={"taskIds": ",".join(chunk)},
+                )
+            except TapdataError as e:
+                logger.warning(f"{action} {len(chunk)} tasks failed: {e.message}")
+                results.extend(batch_error_results(chunk, e))
+                continue
+            finally:
+                self.client._invalidate_tasks(chunk)
+            results.extend(batch_results(chunk, resp))
+        return results
+    
+    def start_many(
+        self,
+        task_ids: Iterable[str],
+        max_batch_size: Optional[int] = None,
+    ) -> List[TaskOperationResult]:
+        """
+        Start many tasks with as few requests as possible
+        
+        Args:
+            task_ids: Task IDs
+            max_batch_size: Maximum number of tasks per request
+            
+        Returns:
+            Per-task operation results, in request order
+            
+        Examples:
+            >>> results = client.tasks.start_many(task_ids)
+            >>> failed = [r.task_id for r in results if not r.ok]
+        """
+        return self._batch(
+            "PUT",
+            "/api/Task/batchStart",
+            "Starting",
+            task_ids,
+            max_batch_size,
+        )
+    
+    def stop_many(
+        self,
+        task_ids: Iterable[str],
+        max_batch_size: Optional[int] = None,
+    ) -> List[TaskOperationResult]:
+        """
+        Stop many tasks with as few requests as possible
+        
+        Args:
+            task_ids: Task IDs
+            max_batch_size: Maximum number of tasks per request
+            
+        Returns:
+            Per-task operation results, in request order
+        """
+        return self._batch(
+            "PUT",
+            "/api/Task/batchStop",
+            "Stopping",
+            task_ids,
+            max_batch_size,
+        )
+    
+    def reset_many(
+        self,
+        task_ids: Iterable[str],
+        max_batch_size: Optional[int] = None,
+    ) -> List[TaskOperationResult]:
+        """
+        Reset many tasks with as few requests as possible
+        
+        Args:
+            task_ids: Task IDs
+            max_batch_size: Maximum number of tasks per request
+            
+        Returns:
+            Per-task operation results, in request order
+        """
+        return self._batch(
+            "PATCH",
+            "/api/Task/batchRenew",
+            "Resetting",
+            task_ids,
+            max_batch_size,
+        )
+    
+    def delete_many(
+        self,
+        task_ids: Iterable[str],
+        max_batch_size: Optional[int] = None,
+    ) -> List[TaskOperationResult]:
+        """
+        Delete many tasks with as few requests as possible
+        
+        Args:
+            task_ids: Task IDs
+            max_batch_size: Maximum number of tasks per request
+            
+        Returns:
+            Per-task operation results, in request order
+        """
+        return self._batch(
             "DELETE",
             "/api/Task/batchDelete",
-            params={"taskIds": task_id},
+            "Deleting",
+            task_ids,
+            max_batch_size,
         )
     
     def get_logs(
@@ -471,6 +1673,7 @@ class TaskClient:
         page: int = 1,
         page_size: int = 20,
         levels: Optional[List[Union[str, LogLevel]]] = None,
+        order: str = "asc",
     ) -> List[TaskLog]:
         """
         Get task logs
@@ -483,32 +1686,262 @@ class TaskClient:
             page: Page number
             page_size: Items per page
             levels: Log level filter
+            order: "asc" for oldest first, "desc" for newest first
             
         Returns:
             Log data
         """
-        if start is None:
-            start = int(time.time()*1000)-1000
-
-        if end is None:
-            end = start + 2000
-
-        if levels is None:
-            levels = [LogLevel.INFO, LogLevel.WARN, LogLevel.ERROR]
-        
+        # A log query is a read, so it may be retried despite being a POST
         resp = self.client._request(
             "POST",
             "/api/MonitoringLogs/query",
-            json={
-                "taskId": task_id,
-                "taskRecordId": task_record_id,
-                "start": start,
-                "end": end,
-                "page": page,
-                "pageSize": page_size,
-                "order": "asc",
-                "levels": [str(level) for level in levels],
-            },
+            idempotent=True,
+            json=logs_query(
+                task_id,
+                task_record_id,
+                start=start,
+                end=end,
+                page=page,
+                page_size=page_size,
+                levels=levels,
+                order=order,
+            ),
+            model=TaskLog,
         )
 
-        return [TaskLog.from_dict(item) for item in resp["data"]["items"]]
+        return list(resp["data"]["items"])
+    
+    def stream_logs(
+        self,
+        task_id: str,
+        task_record_id: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        page: int = 1,
+        page_size: int = 20,
+        levels: Optional[List[Union[str, LogLevel]]] = None,
+        order: str = "asc",
+    ) -> Iterator[TaskLog]:
+        """
+        Get a page of task logs, yielding logs while it downloads
+        
+        Unlike get_logs, the response is parsed incrementally, so memory
+        stays bounded however large page_size is.
+        
+        Args:
+            Same as get_logs
+            
+        Yields:
+            TaskLog objects
+            
+        Examples:
+            >>> for log in client.tasks.stream_logs(task.id, task.task_record_id, page_size=10000):
+            ...     print(log.date, log.message)
+        """
+        return self.client._stream(
+            "POST",
+            "/api/MonitoringLogs/query",
+            TaskLog,
+            idempotent=True,
+            json=logs_query(
+                task_id,
+                task_record_id,
+                start=start,
+                end=end,
+                page=page,
+                page_size=page_size,
+                levels=levels,
+                order=order,
+            ),
+        )
+    
+    def iter_logs(
+        self,
+        task_id: str,
+        task_record_id: str,
+        start: int,
+        end: int,
+        page_size: int = 100,
+        levels: Optional[List[Union[str, LogLevel]]] = None,
+    ) -> Iterator[TaskLog]:
+        """
+        Iterate over every log in a time window, page by page
+        
+        Args:
+            task_id: Task ID
+            task_record_id: Task record ID
+            start: Start timestamp (ms)
+            end: End timestamp (ms)
+            page_size: Items per page
+            levels: Log level filter
+            
+        Yields:
+            TaskLog objects in ascending time order
+        """
+        page = 1
+        while True:
+            logs = self.get_logs(
+                task_id,
+                task_record_id,
+                start=start,
+                end=end,
+                page=page,
+                page_size=page_size,
+                levels=levels,
+            )
+            yield from logs
+            if len(logs) < page_size:
+                return
+            page += 1
+    
+    def tail_logs(
+        self,
+        task_id: str,
+        task_record_id: str,
+        start: Optional[int] = None,
+        levels: Optional[List[Union[str, LogLevel]]] = None,
+        page_size: int = 100,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        timeout: Optional[float] = None,
+        stop_event: Optional[threading.Event] = None,
+    ) -> Iterator[TaskLog]:
+        """
+        Follow the logs of a running task
+        
+        Each poll fetches every page from the last seen timestamp to now, so
+        nothing is downloaded twice. The polling interval resets to
+        min_interval when new logs arrive and doubles up to max_interval
+        while the task is quiet.
+        
+        Args:
+            task_id: Task ID
+            task_record_id: Task record ID
+            start: Timestamp (ms) to start from, defaults to now
+            levels: Log level filter
+            page_size: Items per page
+            min_interval: Polling interval while logs keep arriving (seconds)
+            max_interval: Longest polling interval when quiet (seconds)
+            timeout: Stop following after this many seconds
+            stop_event: Stop following once this event is set
+            
+        Yields:
+            New TaskLog objects in ascending time order
+            
+        Examples:
+            >>> for log in client.tasks.tail_logs(task.id, task.task_record_id):
+            ...     print(log.date, log.level, log.message)
+        """
+        stop_event = stop_event or threading.Event()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        cursor = LogCursor(int(time.time() * 1000) if start is None else start)
+        backoff = Backoff(initial=min_interval, maximum=max_interval)
+        
+        while not stop_event.is_set():
+            received = 0
+            for log in self.iter_logs(
+                task_id,
+                task_record_id,
+                start=cursor.position,
+                end=int(time.time() * 1000),
+                page_size=page_size,
+                levels=levels,
+            ):
+                if cursor.accept(log):
+                    received += 1
+                    yield log
+            
+            if received:
+                backoff.reset()
+            delay = backoff.next()
+            if deadline is not None:
+                delay = min(delay, deadline - time.monotonic())
+                if delay <= 0:
+                    return
+            stop_event.wait(delay)
+    
+    def export_logs(
+        self,
+        task_id: str,
+        task_record_id: str,
+        start: int,
+        end: int,
+        sink: IO[str],
+        shard_ms: int = 15 * 60 * 1000,
+        max_workers: int = 4,
+        page_size: int = 500,
+        levels: Optional[List[Union[str, LogLevel]]] = None,
+    ) -> int:
+        """
+        Export the logs of a time range to a file as JSON Lines
+        
+        The range is split into shards of shard_ms milliseconds which are
+        fetched concurrently (each fully paginated) and written in time
+        order. Every worker spools its shard to a temporary file page by
+        page, so memory stays bounded by about max_workers pages (plus
+        EXPORT_SPOOL_SIZE each) however large a shard is.
+        
+        Args:
+            task_id: Task ID
+            task_record_id: Task record ID
+            start: Start timestamp (ms, inclusive)
+            end: End timestamp (ms, inclusive)
+            sink: Text file-like object to write to
+            shard_ms: Length of one shard in milliseconds
+            max_workers: Maximum number of shards fetched concurrently
+            page_size: Items per page
+            levels: Log level filter
+            
+        Returns:
+            Number of exported logs
+            
+        Examples:
+            >>> with open("task.jsonl", "w") as f:
+            ...     count = client.tasks.export_logs(task_id, record_id, start, end, f)
+        """
+        if shard_ms <= 0:
+            raise ValueError("shard_ms must be positive")
+        
+        shards = (
+            (shard_start, min(shard_start + shard_ms - 1, end))
+            for shard_start in range(start, end + 1, shard_ms)
+        )
+        
+        def fetch(shard) -> tuple:
+            spool = tempfile.SpooledTemporaryFile(
+                max_size=self.EXPORT_SPOOL_SIZE, mode="w+", encoding="utf-8",
+            )
+            written = 0
+            try:
+                for log in self.iter_logs(
+                    task_id,
+                    task_record_id,
+                    start=shard[0],
+                    end=shard[1],
+                    page_size=page_size,
+                    levels=levels,
+                ):
+                    spool.write(self.client.codec.dumps_str(log.to_dict()))
+                    spool.write("\n")
+                    written += 1
+            except BaseException:
+                spool.close()
+                raise
+            return spool, written
+        
+        count = 0
+        spools = bounded_map(
+            fetch,
+            shards,
+            max_workers=max_workers,
+            # Shards fetched ahead of a failed one are closed, deleting their files
+            discard=lambda result: result[0].close(),
+        )
+        for spool, written in spools:
+            with spool:
+                spool.seek(0)
+                shutil.copyfileobj(spool, sink)
+            count += written
+        
+        logger.info(f"Exported {count} logs of task {task_id}")
+        return count
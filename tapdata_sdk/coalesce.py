@@ -0,0 +1,135 @@
+"""Single-flight coalescing of identical concurrent requests"""
+import asyncio
+import copy
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    """One in-flight call and the outcome its waiters receive"""
+
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class RequestCoalescer:
+    """
+    Share one in-flight call between threads asking for the same key
+
+    The first caller of a key runs the call; callers arriving while it is
+    in flight wait for it and receive its result (or exception). Once the
+    call finishes the key is forgotten, so later callers start a new call:
+    nothing is cached.
+
+    When a call was shared, every caller receives its own copy of the
+    result, so one caller mutating it (e.g. a model) never affects another.
+
+    Args:
+        copy_result: Function copying a shared result, defaults to
+            copy.deepcopy
+
+    Examples:
+        >>> coalescer = RequestCoalescer()
+        >>> data, shared = coalescer.do(key, lambda: fetch(key))
+    """
+
+    def __init__(self, copy_result: Callable[[Any], Any] = copy.deepcopy):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self._copy = copy_result
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn, or wait for the in-flight call of the same key
+
+        Args:
+            key: Call identity, e.g. a request_key
+            fn: Call run by the first caller
+
+        Returns:
+            (result, shared), shared being True if another caller ran fn
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return self._copy(call.result), True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        # Nobody can join once the key is gone; the original is only read
+        if call.waiters:
+            return self._copy(call.result), False
+        return call.result, False
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+class _Flight:
+    """One in-flight async call and the number of callers awaiting it"""
+
+    __slots__ = ("task", "callers")
+
+    def __init__(self, task: "asyncio.Future"):
+        self.task = task
+        self.callers = 1
+
+
+class AsyncRequestCoalescer:
+    """
+    Async counterpart of RequestCoalescer for one event loop
+
+    The call runs in its own task, so cancelling one of the callers does
+    not cancel the request the others are waiting for.
+    """
+
+    def __init__(self, copy_result: Callable[[Any], Any] = copy.deepcopy):
+        self._calls: Dict[Hashable, _Flight] = {}
+        self._copy = copy_result
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        if self._calls.get(key) is flight:
+            del self._calls[key]
+        if not flight.task.cancelled():
+            # Mark the exception retrieved in case every caller was cancelled
+            flight.task.exception()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Run fn, or wait for the in-flight call of the same key, see RequestCoalescer.do"""
+        flight = self._calls.get(key)
+        shared = flight is not None
+        if shared:
+            flight.callers += 1
+        else:
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._calls[key] = flight
+            flight.task.add_done_callback(lambda done: self._forget(key, flight))
+        result = await asyncio.shield(flight.task)
+        # Callers resume one by one, so each copies the untouched original
+        if flight.callers > 1:
+            return self._copy(result), shared
+        return result, shared
+
+    def __len__(self) -> int:
+        return len(self._calls)
@@ -0,0 +1,351 @@
+"""JSON encoding and decoding backends"""
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+
+from .models import Connection, LazyNodes, Task, TaskDetail, TaskLog
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def convert_page(data: Any, model: type) -> Any:
+    """
+    Convert the items of a successful page response to model instances
+
+    Pages look like {"code": "ok", "data": {"items": [...], "total": n}};
+    anything else is returned unchanged.
+    """
+    if not isinstance(data, dict) or data.get("code") != "ok":
+        return data
+    page = data.get("data")
+    if isinstance(page, dict) and isinstance(page.get("items"), list):
+        page["items"] = [model.from_dict(item) for item in page["items"]]
+    return data
+
+
+def convert_object(data: Any, model: type) -> Any:
+    """Convert the data of a successful single-object response to a model instance"""
+    if not isinstance(data, dict) or data.get("code") != "ok":
+        return data
+    if isinstance(data.get("data"), dict):
+        data["data"] = model.from_dict(data["data"])
+    return data
+
+
+class JSONCodec:
+    """
+    Standard library codec
+
+    Subclasses swap in faster parsers; every codec raises ValueError on
+    malformed input.
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode a request body"""
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def dumps_str(self, obj: Any) -> str:
+        """Encode a value embedded in the URL, such as the filter parameter"""
+        return self.dumps(obj).decode("utf-8")
+
+    def loads(self, raw: Union[bytes, str]) -> Any:
+        """Decode a response body"""
+        return json.loads(raw)
+
+    def loads_page(self, raw: Union[bytes, str], model: type) -> Any:
+        """
+        Decode a page response with its items converted to model instances
+
+        Args:
+            raw: Response body
+            model: Model class with a from_dict classmethod
+
+        Returns:
+            Response data; items are models when the response code is "ok"
+        """
+        return convert_page(self.loads(raw), model)
+
+    def loads_object(self, raw: Union[bytes, str], model: type) -> Any:
+        """
+        Decode a single-object response with its data converted to a model instance
+
+        Args:
+            raw: Response body
+            model: Model class with a from_dict classmethod
+
+        Returns:
+            Response data; data is a model when the response code is "ok"
+        """
+        return convert_object(self.loads(raw), model)
+
+
+class OrjsonCodec(JSONCodec):
+    """Codec backed by orjson"""
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError(
+                "orjson is required for OrjsonCodec. "
+                "Install it with: pip install tapdata-sdk[orjson]"
+            )
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, raw: Union[bytes, str]) -> Any:
+        return orjson.loads(raw)
+
+
+def _msgspec_models() -> Dict[type, Tuple[type, Callable[[Any], Any]]]:
+    """Wire structs of the page item models and their conversion to models"""
+
+    class ConnectionConfig(msgspec.Struct):
+        uri: Optional[str] = None
+        host: Optional[str] = None
+        port: Any = ""
+        database: Any = ""
+        user: Any = ""
+
+    class ConnectionWire(msgspec.Struct):
+        id: str
+        name: Optional[str] = None
+        connection_type: Optional[str] = None
+        status: Optional[str] = None
+        database_type: Optional[str] = None
+        config: ConnectionConfig = msgspec.field(default_factory=ConnectionConfig)
+        last_updated: Any = None
+
+    class TaskWire(msgspec.Struct, rename={"task_record_id": "taskRecordId"}):
+        id: str
+        name: Optional[str] = None
+        type: Optional[str] = None
+        status: Optional[str] = None
+        task_record_id: Optional[str] = None
+        last_updated: Any = None
+
+    class TaskDetailWire(msgspec.Struct, rename={"task_record_id": "taskRecordId"}):
+        id: str
+        name: Optional[str] = None
+        type: Optional[str] = None
+        status: Optional[str] = None
+        task_record_id: Optional[str] = None
+        # Kept undecoded until the nodes are first accessed
+        dag: Optional[msgspec.Raw] = None
+
+    class TaskLogWire(msgspec.Struct, rename="camel"):
+        task_id: str
+        task_record_id: str
+        task_name: str
+        level: str
+        message: str
+        timestamp: int
+        date: str
+        node_id: str = ""
+        node_name: str = ""
+
+    def connection(wire: ConnectionWire) -> Connection:
+        config = wire.config
+        return Connection(
+            id=wire.id,
+            name=wire.name,
+            connection_type=wire.connection_type,
+            database_type=wire.database_type,
+            status=wire.status,
+            endpoint=config.uri or config.host,
+            port=config.port,
+            database=config.database,
+            user=config.user,
+            last_updated=wire.last_updated,
+        )
+
+    def task(wire: TaskWire) -> Task:
+        return Task(
+            wire.id, wire.name, wire.type, wire.status, wire.task_record_id, wire.last_updated,
+        )
+
+    def task_detail(wire: TaskDetailWire) -> TaskDetail:
+        dag = wire.dag
+
+        def nodes() -> list:
+            return (msgspec.json.decode(dag) or {}).get("nodes", []) if dag else []
+
+        return TaskDetail(
+            id=wire.id,
+            name=wire.name,
+            type=wire.type,
+            status=wire.status,
+            task_record_id=wire.task_record_id,
+            nodes=LazyNodes(nodes),
+        )
+
+    def task_log(wire: TaskLogWire) -> TaskLog:
+        return TaskLog(
+            task_id=wire.task_id,
+            task_record_id=wire.task_record_id,
+            task_name=wire.task_name,
+            node_id=wire.node_id,
+            node_name=wire.node_name,
+            level=wire.level,
+            message=wire.message,
+            timestamp=wire.timestamp,
+            date=wire.date,
+        )
+
+    return {
+        Connection: (ConnectionWire, connection),
+        Task: (TaskWire, task),
+        TaskDetail: (TaskDetailWire, task_detail),
+        TaskLog: (TaskLogWire, task_log),
+    }
+
+
+class MsgspecCodec(JSONCodec):
+    """
+    Codec backed by msgspec
+
+    Pages of Connection, Task and TaskLog are decoded straight into typed
+    structs, so fields the models do not use (task DAGs, connection
+    schemas, ...) are skipped instead of materialized as dicts. The DAG of
+    a TaskDetail is kept as raw JSON until its nodes are first accessed.
+    """
+
+    name = "msgspec"
+
+    def __init__(self):
+        if msgspec is None:
+            raise ImportError(
+                "msgspec is required for MsgspecCodec. "
+                "Install it with: pip install tapdata-sdk[msgspec]"
+            )
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+        self._models = _msgspec_models()
+        self._page_decoders: Dict[type, Any] = {}
+        self._object_decoders: Dict[type, Any] = {}
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, raw: Union[bytes, str]) -> Any:
+        try:
+            return self._decoder.decode(raw)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    def _page_decoder(self, model: type):
+        decoder = self._page_decoders.get(model)
+        if decoder is None:
+            wire = self._models[model][0]
+            page = msgspec.defstruct("Page", [("items", List[wire]), ("total", int, 0)])
+            envelope = msgspec.defstruct("Envelope", [
+                ("code", str),
+                ("data", page),
+                ("message", Any, None),
+            ])
+            decoder = msgspec.json.Decoder(envelope)
+            self._page_decoders[model] = decoder
+        return decoder
+
+    def _object_decoder(self, model: type):
+        decoder = self._object_decoders.get(model)
+        if decoder is None:
+            envelope = msgspec.defstruct("Envelope", [
+                ("code", str),
+                ("data", self._models[model][0]),
+                ("message", Any, None),
+            ])
+            decoder = msgspec.json.Decoder(envelope)
+            self._object_decoders[model] = decoder
+        return decoder
+
+    def loads_page(self, raw: Union[bytes, str], model: type) -> Any:
+        if model not in self._models:
+            return super().loads_page(raw, model)
+        try:
+            envelope = self._page_decoder(model).decode(raw)
+        except msgspec.ValidationError:
+            # Error responses and unexpected shapes take the generic path
+            return super().loads_page(raw, model)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+        if envelope.code != "ok":
+            return super().loads_page(raw, model)
+
+        convert = self._models[model][1]
+        return {
+            "code": envelope.code,
+            "message": envelope.message,
+            "data": {
+                "items": [convert(item) for item in envelope.data.items],
+                "total": envelope.data.total,
+            },
+        }
+
+    def loads_object(self, raw: Union[bytes, str], model: type) -> Any:
+        if model not in self._models:
+            return super().loads_object(raw, model)
+        try:
+            envelope = self._object_decoder(model).decode(raw)
+        except msgspec.ValidationError:
+            return super().loads_object(raw, model)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+        if envelope.code != "ok":
+            return super().loads_object(raw, model)
+
+        convert = self._models[model][1]
+        return {
+            "code": envelope.code,
+            "message": envelope.message,
+            "data": convert(envelope.data),
+        }
+
+
+CODECS: Dict[str, Type[JSONCodec]] = {
+    "json": JSONCodec,
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+}
+
+
+def get_codec(codec: Union[str, JSONCodec, None] = "auto") -> JSONCodec:
+    """
+    Resolve a codec
+
+    Args:
+        codec: Codec instance, a name from CODECS, or "auto"/None for the
+            fastest installed backend (msgspec, then orjson, then json)
+
+    Returns:
+        Codec instance
+
+    Examples:
+        >>> get_codec("json").name
+        'json'
+        >>> client = TapdataClient("http://localhost:3030", codec="json")
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec in (None, "auto"):
+        if msgspec is not None:
+            return MsgspecCodec()
+        if orjson is not None:
+            return OrjsonCodec()
+        return JSONCodec()
+    try:
+        return CODECS[codec]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown codec {codec!r}, expected one of: auto, {', '.join(CODECS)}"
+        )
@@ -0,0 +1,187 @@
+"""Response compression negotiation and streaming decompression"""
+import zlib
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional, Union
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Encodings offered to the server, most preferred first
+ENCODINGS = ("zstd", "br", "gzip", "deflate")
+
+Compression = Union[str, Iterable[str], None]
+
+
+def supported_encodings() -> List[str]:
+    """Encodings the installed libraries can decompress, most preferred first"""
+    available = {"gzip", "deflate"}
+    if brotli is not None:
+        available.add("br")
+    if zstandard is not None:
+        available.add("zstd")
+    return [encoding for encoding in ENCODINGS if encoding in available]
+
+
+def accept_encoding(
+    compression: Compression = "auto",
+    supported: Optional[Iterable[str]] = None,
+) -> str:
+    """
+    Build the Accept-Encoding header for a compression setting
+
+    Args:
+        compression: "auto" for every supported encoding, None (or
+            "identity") to disable compression, or the encodings to force,
+            e.g. "gzip" or ["br", "gzip"]
+        supported: Encodings the transport can decompress, defaults to
+            supported_encodings()
+
+    Returns:
+        Header value
+
+    Raises:
+        ValueError: A forced encoding cannot be decompressed
+
+    Examples:
+        >>> accept_encoding("auto", ["gzip", "deflate"])
+        'gzip, deflate'
+        >>> accept_encoding(None)
+        'identity'
+    """
+    supported = list(supported_encodings() if supported is None else supported)
+    if compression is None or compression is False or compression == "identity":
+        return "identity"
+    if compression == "auto":
+        return ", ".join(supported)
+    wanted = [compression] if isinstance(compression, str) else list(compression)
+    missing = [encoding for encoding in wanted if encoding not in supported]
+    if missing:
+        raise ValueError(
+            f"Unsupported compression {', '.join(missing)}, expected any of: "
+            f"{', '.join(supported)} (br needs brotli, zstd needs zstandard)"
+        )
+    return ", ".join(wanted)
+
+
+class Decompressor(ABC):
+    """
+    Incremental decoder of one response body
+
+    Chunks are decoded as they arrive, so a body never has to be held in
+    compressed and decompressed form at once. Corrupt data raises
+    ValueError.
+    """
+
+    def decompress(self, chunk: bytes) -> bytes:
+        """Decode a chunk, returning the bytes it completed"""
+        try:
+            return self._decompress(chunk)
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Invalid compressed response: {e}") from e
+
+    def flush(self) -> bytes:
+        """Decode what is left at the end of the body"""
+        try:
+            return self._flush()
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Invalid compressed response: {e}") from e
+
+    @abstractmethod
+    def _decompress(self, chunk: bytes) -> bytes:
+        """Decode a chunk; library errors are wrapped by decompress"""
+
+    def _flush(self) -> bytes:
+        return b""
+
+
+class _ZlibDecompressor(Decompressor):
+    def __init__(self, wbits: int):
+        self._obj = zlib.decompressobj(wbits)
+
+    def _decompress(self, chunk: bytes) -> bytes:
+        return self._obj.decompress(chunk)
+
+    def _flush(self) -> bytes:
+        return self._obj.flush()
+
+
+class _DeflateDecompressor(_ZlibDecompressor):
+    """Deflate with a zlib header, falling back to raw deflate as some servers send"""
+
+    def __init__(self):
+        super().__init__(zlib.MAX_WBITS)
+        self._first = True
+
+    def _decompress(self, chunk: bytes) -> bytes:
+        if not self._first:
+            return super()._decompress(chunk)
+        self._first = False
+        try:
+            return super()._decompress(chunk)
+        except zlib.error:
+            self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+            return super()._decompress(chunk)
+
+
+class _BrotliDecompressor(Decompressor):
+    def __init__(self):
+        obj = brotli.Decompressor()
+        # brotli names it process, brotlicffi decompress
+        self._process = getattr(obj, "process", None) or obj.decompress
+
+    def _decompress(self, chunk: bytes) -> bytes:
+        return self._process(chunk)
+
+
+class _ZstdDecompressor(Decompressor):
+    def __init__(self):
+        self._obj = zstandard.ZstdDecompressor().decompressobj()
+
+    def _decompress(self, chunk: bytes) -> bytes:
+        parts = []
+        while chunk:
+            parts.append(self._obj.decompress(chunk))
+            # A body may hold several frames, each needing a fresh object
+            chunk = self._obj.unused_data if getattr(self._obj, "eof", False) else b""
+            if chunk:
+                self._obj = zstandard.ZstdDecompressor().decompressobj()
+        return b"".join(parts)
+
+
+def decompressor(content_encoding: Optional[str]) -> Optional[Decompressor]:
+    """
+    Decompressor for a Content-Encoding header
+
+    Returns:
+        None for identity (no header)
+
+    Raises:
+        ValueError: The encoding is unknown or its library is not installed
+    """
+    encoding = (content_encoding or "identity").strip().lower()
+    if encoding == "identity":
+        return None
+    if encoding in ("gzip", "x-gzip"):
+        return _ZlibDecompressor(16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        return _DeflateDecompressor()
+    if encoding == "br" and brotli is not None:
+        return _BrotliDecompressor()
+    if encoding == "zstd" and zstandard is not None:
+        return _ZstdDecompressor()
+    raise ValueError(f"Unsupported Content-Encoding: {content_encoding}")
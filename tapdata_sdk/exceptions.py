@@ -29,3 +29,21 @@ class TapdataValidationError(TapdataError):
 class TapdataTimeoutError(TapdataError):
     """Timeout error"""
     pass
+
+
+class TapdataHTTPError(TapdataError):
+    """HTTP error status returned by the server"""
+    
+    def __init__(self, resp: dict):
+        super().__init__(resp)
+        self.status_code = resp.get("status")
+        self.retry_after = resp.get("retryAfter")
+
+
+class TapdataTaskStateError(TapdataError):
+    """Task ended in a failure status while waiting for an operation"""
+    
+    def __init__(self, resp: dict):
+        super().__init__(resp)
+        self.task_id = resp.get("taskId")
+        self.status = resp.get("status")
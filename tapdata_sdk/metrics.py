@@ -0,0 +1,269 @@
+"""Client-side request metrics"""
+import bisect
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+    0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+@dataclass
+class RequestEvent:
+    """
+    One attempt of an API request, passed to request hooks
+
+    Before hooks see the request fields only; after hooks also get the
+    outcome, sizes and timings.
+
+    Attributes:
+        method: HTTP method
+        endpoint: Path template, e.g. "/api/Task/{id}"
+        url: Full request URL without query string
+        attempt: Attempt number, starting at 1
+        status: HTTP status code (None if no response was received)
+        bytes_sent: Size of the request body
+        bytes_received: Size of the response body (decompressed)
+        bytes_received_wire: Size of the response body as transferred,
+            compressed if the server compressed it
+        content_encoding: Content-Encoding of the response, None if
+            uncompressed
+        timings: Seconds spent per phase; "total" always, plus any of
+            "dns", "connect", "server" (until response headers),
+            "download" and "decode" when the transport exposes them
+        error: Error raised by the attempt, if any
+    """
+    method: str
+    endpoint: str
+    url: str
+    attempt: int = 1
+    status: Optional[int] = None
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    bytes_received_wire: int = 0
+    content_encoding: Optional[str] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+    error: Optional[Exception] = None
+
+
+RequestHook = Callable[[RequestEvent], None]
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram
+
+    Memory use is constant; percentiles are interpolated within buckets.
+
+    Args:
+        buckets: Sorted bucket upper bounds in seconds
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add one observation"""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate a percentile
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            Estimated value in seconds (0 when empty)
+        """
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                fraction = (rank - seen) / bucket_count
+                return min(lower + (upper - lower) * fraction, self.max)
+            seen += bucket_count
+        return self.max
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """(upper bound, cumulative count) pairs, ending with +Inf"""
+        pairs = []
+        total = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), self.counts):
+            total += bucket_count
+            pairs.append((bound, total))
+        return pairs
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary"""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+@dataclass
+class EndpointStats:
+    """Counters and latency of one endpoint"""
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    coalesced: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    bytes_received_wire: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary"""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "coalesced": self.coalesced,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "bytes_received_wire": self.bytes_received_wire,
+            "latency": self.latency.to_dict(),
+        }
+
+
+class ClientMetrics:
+    """
+    Thread-safe per-endpoint request metrics
+
+    Endpoints are keyed by method and path template, e.g.
+    "GET /api/Task/{id}".
+
+    Examples:
+        >>> client.metrics.snapshot()["GET /api/Task/{id}"]["latency"]["p95"]
+        >>> print(client.metrics.to_prometheus())
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._endpoints: Dict[Tuple[str, str], EndpointStats] = {}
+
+    def _stats(self, method: str, endpoint: str) -> EndpointStats:
+        key = (method.upper(), endpoint)
+        stats = self._endpoints.get(key)
+        if stats is None:
+            stats = EndpointStats(latency=LatencyHistogram(self.buckets))
+            self._endpoints[key] = stats
+        return stats
+
+    def record_retry(self, method: str, endpoint: str) -> None:
+        """Count one retry of a request"""
+        with self._lock:
+            self._stats(method, endpoint).retries += 1
+
+    def record_coalesced(self, method: str, endpoint: str) -> None:
+        """Count one request served by an identical in-flight request"""
+        with self._lock:
+            self._stats(method, endpoint).coalesced += 1
+
+    def observe(self, event: RequestEvent) -> None:
+        """Record a finished request attempt"""
+        with self._lock:
+            stats = self._stats(event.method, event.endpoint)
+            stats.requests += 1
+            if event.error is not None:
+                stats.errors += 1
+            stats.bytes_sent += event.bytes_sent
+            stats.bytes_received += event.bytes_received
+            stats.bytes_received_wire += event.bytes_received_wire
+            if "total" in event.timings:
+                stats.latency.observe(event.timings["total"])
+
+    def snapshot(self) -> Dict[str, dict]:
+        """
+        Copy of the current metrics
+
+        Returns:
+            Mapping of "METHOD endpoint" to its counters and latency
+            summary (count, sum, max, p50, p95, p99 in seconds)
+        """
+        with self._lock:
+            return {
+                f"{method} {endpoint}": stats.to_dict()
+                for (method, endpoint), stats in sorted(self._endpoints.items())
+            }
+
+    def reset(self) -> None:
+        """Clear all metrics"""
+        with self._lock:
+            self._endpoints.clear()
+
+    def to_prometheus(self, prefix: str = "tapdata_client") -> str:
+        """
+        Render the metrics in the Prometheus text exposition format
+
+        Args:
+            prefix: Metric name prefix
+
+        Returns:
+            Exposition text, e.g. for a /metrics HTTP handler
+        """
+        with self._lock:
+            items = sorted(
+                (key, stats.to_dict(), stats.latency.cumulative())
+                for key, stats in self._endpoints.items()
+            )
+
+        lines = []
+        counters = [
+            ("requests", "Request attempts"),
+            ("errors", "Failed request attempts"),
+            ("retries", "Retried requests"),
+            ("coalesced", "Requests served by an identical in-flight request"),
+            ("bytes_sent", "Request body bytes sent"),
+            ("bytes_received", "Response body bytes received (decompressed)"),
+            ("bytes_received_wire", "Response body bytes transferred (compressed)"),
+        ]
+        for name, help_text in counters:
+            lines.append(f"# HELP {prefix}_{name}_total {help_text}")
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            for (method, endpoint), values, _ in items:
+                labels = _labels(method, endpoint)
+                lines.append(f"{prefix}_{name}_total{{{labels}}} {values[name]}")
+
+        name = f"{prefix}_request_duration_seconds"
+        lines.append(f"# HELP {name} Request latency")
+        lines.append(f"# TYPE {name} histogram")
+        for (method, endpoint), values, cumulative in items:
+            labels = _labels(method, endpoint)
+            for bound, total in cumulative:
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{name}_bucket{{{labels},le="{le}"}} {total}')
+            lines.append(f"{name}_sum{{{labels}}} {values['latency']['sum']}")
+            lines.append(f"{name}_count{{{labels}}} {values['latency']['count']}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(method: str, endpoint: str) -> str:
+    """Render Prometheus labels, escaping label values"""
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return f'method="{escape(method)}",endpoint="{escape(endpoint)}"'
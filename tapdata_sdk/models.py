@@ -1,6 +1,74 @@
 """Data model definitions"""
-from dataclasses import dataclass
-from typing import Optional, List, Dict
+import collections.abc
+import threading
+from array import array
+from dataclasses import dataclass, field, fields, make_dataclass
+from typing import Optional, List, Dict, Iterable, Iterator, Callable, Sequence, Union
+
+
+def _slotted(cls: type) -> type:
+    """
+    Rebuild a dataclass with __slots__ instead of a per-instance __dict__
+    
+    Equivalent to @dataclass(slots=True), which needs Python 3.10.
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = dict(cls.__dict__)
+    for name in names:
+        # Defaults live in the generated __init__; class attributes of the
+        # same name would clash with the slot descriptors
+        namespace.pop(name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = names
+    
+    if cls.__dataclass_params__.frozen:
+        # Frozen instances cannot be restored with setattr when unpickled
+        def __getstate__(self):
+            return [getattr(self, name) for name in names]
+        
+        def __setstate__(self, state):
+            for name, value in zip(names, state):
+                object.__setattr__(self, name, value)
+        
+        namespace["__getstate__"] = __getstate__
+        namespace["__setstate__"] = __setstate__
+    
+    slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
+
+
+def _variant(cls: type, frozen: bool = False, unhashable: Sequence[str] = ()) -> type:
+    """
+    Slotted copy of a model class, optionally immutable and hashable
+    
+    Args:
+        cls: Model dataclass
+        frozen: Make instances immutable and hashable
+        unhashable: Fields left out of the hash (still compared for equality)
+    """
+    namespace = {
+        name: value
+        for name, value in cls.__dict__.items()
+        if name in ("from_dict", "to_dict")
+    }
+    namespace["__doc__"] = f"{cls.__doc__} ({'immutable' if frozen else 'slotted'})"
+    namespace["__module__"] = cls.__module__
+    variant = make_dataclass(
+        f"{'Frozen' if frozen else 'Slotted'}{cls.__name__}",
+        [
+            (f.name, f.type, field(
+                default=f.default,
+                default_factory=f.default_factory,
+                hash=False if f.name in unhashable else None,
+            ))
+            for f in fields(cls)
+        ],
+        namespace=namespace,
+        frozen=frozen,
+    )
+    return _slotted(variant)
 
 
 @dataclass
@@ -15,24 +83,30 @@ class Connection:
     port: Optional[str]
     database: Optional[str]
     user: Optional[str]
+    last_updated: Optional[str] = None  # As sent by the API
 
     @classmethod
     def from_dict(cls, data: dict) -> "Connection":
-        """Create connection object from API response"""
-        config = data.get("config", {})
+        """
+        Create connection object from API response
+        
+        Fields left out by a projection are None.
+        """
+        config = data.get("config") or {}
         uri = config.get("uri")
         host = config.get("host")
         
         return cls(
             id=data["id"],
-            name=data["name"],
-            connection_type=data["connection_type"],
+            name=data.get("name"),
+            connection_type=data.get("connection_type"),
             database_type=data.get("database_type"),
-            status=data["status"],
+            status=data.get("status"),
             endpoint=uri or host,
             user=config.get("user",""),
             database=config.get("database",""),
-            port=config.get("port","")
+            port=config.get("port",""),
+            last_updated=data.get("last_updated"),
         )
 
     def to_dict(self) -> dict:
@@ -58,16 +132,22 @@ class Task:
     type: str
     status: str
     task_record_id: Optional[str] = None
+    last_updated: Optional[str] = None  # As sent by the API
 
     @classmethod
     def from_dict(cls, data: dict) -> "Task":
-        """Create task object from API response"""
+        """
+        Create task object from API response
+        
+        Fields left out by a projection are None.
+        """
         return cls(
             id=data["id"],
-            name=data["name"],
-            type=data["type"],
-            status=data["status"],
+            name=data.get("name"),
+            type=data.get("type"),
+            status=data.get("status"),
             task_record_id=data.get("taskRecordId"),
+            last_updated=data.get("last_updated"),
         )
 
     def to_dict(self) -> dict:
@@ -80,6 +160,81 @@ class Task:
             "taskRecordId": self.task_record_id,
         }
 
+def _parse_node(node: dict) -> dict:
+    """Convert a raw DAG node to the TaskDetail node shape"""
+    attrs = node.get("attrs") or {}
+    return {
+        "id": node.get("id"),
+        "name": node.get("name"),
+        "connectionId": node.get("connectionId"),
+        "connectionName": attrs.get("connectionName"),
+        "connectionType": attrs.get("__connectionType"),
+        "syncObjects": node.get("syncObjects", [])
+    }
+
+
+# Guards the first load of LazyNodes shared between threads
+_LOAD_LOCK = threading.Lock()
+
+
+class LazyNodes(collections.abc.Sequence):
+    """
+    DAG nodes of a task, converted on first access
+    
+    Nodes are converted one by one as they are indexed, so reading the
+    source and target of a DAG with thousands of tables only touches two
+    nodes. The source may also be a callable returning the raw nodes, which
+    lets codecs defer decoding the DAG itself until it is first used.
+    
+    Args:
+        source: Raw DAG nodes, or a callable returning them
+    """
+    
+    __slots__ = ("_source", "_raw", "_nodes")
+    
+    def __init__(self, source: Union[List[dict], Callable[[], List[dict]], None] = None):
+        self._source = source
+        self._raw: Optional[List[dict]] = None
+        self._nodes: Optional[List[Optional[dict]]] = None
+    
+    def _load(self) -> List[dict]:
+        if self._raw is None:
+            with _LOAD_LOCK:
+                if self._raw is None:
+                    source = self._source() if callable(self._source) else self._source
+                    raw = list(source or [])
+                    self._nodes = [None] * len(raw)
+                    self._raw = raw
+                    self._source = None
+        return self._raw
+    
+    def __len__(self) -> int:
+        return len(self._load())
+    
+    def __getitem__(self, index):
+        raw = self._load()
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(raw)))]
+        if index < 0:
+            index += len(raw)
+        if not 0 <= index < len(raw):
+            raise IndexError("node index out of range")
+        node = self._nodes[index]
+        if node is None:
+            node = self._nodes[index] = _parse_node(raw[index])
+        return node
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, collections.abc.Sequence) and not isinstance(other, str):
+            return list(self) == list(other)
+        return NotImplemented
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
 @dataclass
 class TaskDetail:
     """Task detail model"""
@@ -88,29 +243,22 @@ class TaskDetail:
     type: str
     status: str
     task_record_id: str
-    nodes: List[dict]
+    nodes: Sequence[dict]
 
     @classmethod
     def from_dict(cls, data: dict) -> "TaskDetail":
-        """Create task object from API response"""
-        nodes = []
-        for node in data.get("dag",{}).get("nodes",[]):
-            attrs = node.get("attrs",{})
-            nodes.append({
-                "id": node.get("id"),
-                "name": node.get("name"),
-                "connectionId": node.get("connectionId"),
-                "connectionName": attrs.get("connectionName"),
-                "connectionType": attrs.get("__connectionType"),
-                "syncObjects": node.get("syncObjects",[])
-            })
+        """
+        Create task object from API response
+        
+        Fields left out by a projection are None; nodes are converted lazily.
+        """
         return cls(
             id=data["id"],
-            name=data["name"],
-            type=data["type"],
-            status=data["status"],
+            name=data.get("name"),
+            type=data.get("type"),
+            status=data.get("status"),
             task_record_id=data.get("taskRecordId"),
-            nodes=nodes
+            nodes=LazyNodes((data.get("dag") or {}).get("nodes", []))
         )
 
     def to_dict(self) -> dict:
@@ -121,7 +269,7 @@ class TaskDetail:
             "type": self.type,
             "status": self.status,
             "taskRecordId": self.task_record_id,
-            "nodes": self.nodes
+            "nodes": list(self.nodes)
         }
 
 @dataclass
@@ -162,6 +310,16 @@ class TaskRelation:
             table_name_relation=relations
         )
 
+    @classmethod
+    def from_detail(cls, detail: "TaskDetail") -> "TaskRelation":
+        """
+        Create TaskRelation from a TaskDetail
+        
+        Only the source and target nodes are read, so the other nodes of a
+        lazily parsed DAG are left unconverted.
+        """
+        return cls.from_dict({"nodes": detail.nodes})
+
     def to_dict(self) -> dict:
         """
         Convert to dictionary including nested connection details
@@ -174,6 +332,53 @@ class TaskRelation:
             "target": self.target_conn.to_dict() if self.target_conn else None
         }
 
+@dataclass
+class TaskOperationResult:
+    """Outcome of a batch task operation for a single task"""
+    task_id: str
+    code: str
+    message: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the operation succeeded for this task"""
+        return self.code == "ok"
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TaskOperationResult":
+        """Create result object from one entry of a batch API response"""
+        return cls(
+            task_id=data.get("id") or data.get("taskId"),
+            code=data.get("code", "ok"),
+            message=data.get("message"),
+        )
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary"""
+        return {
+            "task_id": self.task_id,
+            "code": self.code,
+            "message": self.message,
+        }
+
+@_slotted
+@dataclass
+class TaskStatusChange:
+    """Status transition of a watched task"""
+    task_id: str
+    previous: Optional[str]  # None on the first observation
+    status: Optional[str]  # None once the task no longer exists
+    timestamp: float  # Unix time of the poll that observed the change
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary"""
+        return {
+            "task_id": self.task_id,
+            "previous": self.previous,
+            "status": self.status,
+            "timestamp": self.timestamp,
+        }
+
 @dataclass
 class TaskLog:
     """Task log"""
@@ -212,6 +417,233 @@ class TaskLog:
             "node_name": self.node_name,
             "level": self.level,
             "message": self.message,
-            "timestamp": self.timestap,
+            "timestamp": self.timestamp,
             "date": self.date
         }
+
+
+# Slotted variants without a per-instance __dict__, for large result sets
+SlottedConnection = _variant(Connection)
+SlottedTask = _variant(Task)
+SlottedTaskDetail = _variant(TaskDetail)
+SlottedTaskLog = _variant(TaskLog)
+
+# Immutable, hashable variants, e.g. for sets or dict keys; DAG nodes are
+# compared but not hashed
+FrozenConnection = _variant(Connection, frozen=True)
+FrozenTask = _variant(Task, frozen=True)
+FrozenTaskDetail = _variant(TaskDetail, frozen=True, unhashable=("nodes",))
+FrozenTaskLog = _variant(TaskLog, frozen=True)
+
+
+class TaskLogBatch:
+    """
+    Columnar, memory-compact container of task logs
+    
+    Timestamps are kept in a 64-bit integer array. Repeated strings (IDs,
+    names, levels, dates) are stored once per batch and referenced by a
+    32-bit code per row, so a log costs a few dozen bytes plus its message
+    instead of a full object.
+    
+    Examples:
+        >>> batch = TaskLogBatch.from_logs(client.tasks.iter_logs(task_id, record_id, start, end))
+        >>> len(batch), batch.timestamps[-1]
+        >>> df = batch.to_pandas()
+    """
+    
+    # Dictionary-encoded columns
+    STRING_COLUMNS = (
+        "task_id",
+        "task_record_id",
+        "task_name",
+        "node_id",
+        "node_name",
+        "level",
+        "date",
+    )
+    COLUMNS = STRING_COLUMNS[:-1] + ("message", "timestamp", "date")
+    
+    def __init__(self):
+        self.timestamps = array("q")
+        self.messages: List[str] = []
+        self._codes = {name: array("I") for name in self.STRING_COLUMNS}
+        self._values: Dict[str, List[str]] = {name: [] for name in self.STRING_COLUMNS}
+        self._lookup: Dict[str, Dict[str, int]] = {name: {} for name in self.STRING_COLUMNS}
+    
+    @classmethod
+    def from_logs(cls, logs: Iterable["TaskLog"]) -> "TaskLogBatch":
+        """Build a batch from TaskLog objects"""
+        batch = cls()
+        batch.extend(logs)
+        return batch
+    
+    @classmethod
+    def from_dicts(cls, items: Iterable[dict]) -> "TaskLogBatch":
+        """Build a batch from raw API log records, without creating TaskLog objects"""
+        batch = cls()
+        for item in items:
+            batch._append(
+                item["taskId"],
+                item["taskRecordId"],
+                item["taskName"],
+                item.get("nodeId", ""),
+                item.get("nodeName", ""),
+                item["level"],
+                item["date"],
+                item["message"],
+                item["timestamp"],
+            )
+        return batch
+    
+    def _encode(self, column: str, value: str) -> None:
+        lookup = self._lookup[column]
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(lookup)
+            self._values[column].append(value)
+        self._codes[column].append(code)
+    
+    def _append(
+        self,
+        task_id: str,
+        task_record_id: str,
+        task_name: str,
+        node_id: str,
+        node_name: str,
+        level: str,
+        date: str,
+        message: str,
+        timestamp: int,
+    ) -> None:
+        self._encode("task_id", task_id)
+        self._encode("task_record_id", task_record_id)
+        self._encode("task_name", task_name)
+        self._encode("node_id", node_id)
+        self._encode("node_name", node_name)
+        self._encode("level", level)
+        self._encode("date", date)
+        self.messages.append(message)
+        self.timestamps.append(timestamp)
+    
+    def append(self, log: "TaskLog") -> None:
+        """Add one log"""
+        self._append(
+            log.task_id,
+            log.task_record_id,
+            log.task_name,
+            log.node_id,
+            log.node_name,
+            log.level,
+            log.date,
+            log.message,
+            log.timestamp,
+        )
+    
+    def extend(self, logs: Iterable["TaskLog"]) -> None:
+        """Add many logs"""
+        for log in logs:
+            self.append(log)
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union["TaskLog", "TaskLogBatch"]:
+        """One log, or a new batch for a slice"""
+        if isinstance(index, slice):
+            sliced = type(self)()
+            for row in map(self._row, range(len(self))[index]):
+                sliced._append(**row)
+            return sliced
+        if not isinstance(index, int):
+            raise TypeError("TaskLogBatch indices must be integers or slices")
+        return TaskLog(**self._row(index))
+    
+    def __iter__(self) -> Iterator["TaskLog"]:
+        for index in range(len(self)):
+            yield TaskLog(**self._row(index))
+    
+    def _row(self, index: int) -> dict:
+        row = {
+            name: self._values[name][self._codes[name][index]]
+            for name in self.STRING_COLUMNS
+        }
+        row["message"] = self.messages[index]
+        row["timestamp"] = self.timestamps[index]
+        return row
+    
+    def categories(self, column: str) -> List[str]:
+        """Distinct values of a string column, in order of first appearance"""
+        return list(self._values[column])
+    
+    def to_rows(self) -> List[dict]:
+        """Convert to a list of dictionaries shaped like TaskLog.to_dict()"""
+        return [
+            {name: row[name] for name in self.COLUMNS}
+            for row in map(self._row, range(len(self)))
+        ]
+    
+    def to_columns(self) -> Dict[str, list]:
+        """Convert to a dictionary of column lists"""
+        columns: Dict[str, list] = {}
+        for name in self.COLUMNS:
+            if name == "message":
+                columns[name] = list(self.messages)
+            elif name == "timestamp":
+                columns[name] = self.timestamps.tolist()
+            else:
+                values = self._values[name]
+                columns[name] = [values[code] for code in self._codes[name]]
+        return columns
+    
+    def to_pandas(self):
+        """
+        Convert to a pandas DataFrame
+        
+        String columns become categoricals sharing the batch dictionaries.
+        """
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError(
+                "pandas is required for TaskLogBatch.to_pandas. "
+                "Install it with: pip install pandas"
+            )
+        
+        data = {}
+        for name in self.COLUMNS:
+            if name == "message":
+                data[name] = self.messages
+            elif name == "timestamp":
+                data[name] = pd.array(self.timestamps, dtype="int64")
+            else:
+                data[name] = pd.Categorical.from_codes(
+                    self._codes[name], categories=self._values[name]
+                )
+        return pd.DataFrame(data)
+    
+    def to_arrow(self):
+        """
+        Convert to a pyarrow Table
+        
+        String columns become dictionary arrays sharing the batch dictionaries.
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError(
+                "pyarrow is required for TaskLogBatch.to_arrow. "
+                "Install it with: pip install pyarrow"
+            )
+        
+        arrays = []
+        for name in self.COLUMNS:
+            if name == "message":
+                arrays.append(pa.array(self.messages, type=pa.string()))
+            elif name == "timestamp":
+                arrays.append(pa.array(self.timestamps, type=pa.int64()))
+            else:
+                arrays.append(pa.DictionaryArray.from_arrays(
+                    pa.array(self._codes[name], type=pa.uint32()),
+                    pa.array(self._values[name], type=pa.string()),
+                ))
+        return pa.Table.from_arrays(arrays, names=list(self.COLUMNS))
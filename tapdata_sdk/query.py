@@ -0,0 +1,209 @@
+"""Composable filters for list queries"""
+from enum import Enum
+from typing import Any, Dict, Iterable, Optional
+
+from .utils import build_filter
+
+# Tie-breaker keeping the pages of a walk in a deterministic order
+PAGE_ORDER = "id ASC"
+
+
+def _value(value: Any) -> Any:
+    """Serialize enum members (and lists of them) to their API value"""
+    if isinstance(value, Enum):
+        return str(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_value(item) for item in value]
+    return value
+
+
+class Query:
+    """
+    Server-side filter, projection, ordering and paging for list endpoints
+
+    Queries are immutable: every method returns a new Query, so a base query
+    can be shared and refined. Pass one to ConnectionClient.list or
+    TaskClient.list (and their iter_all/list_all); its clauses are merged
+    over the keyword filters of those methods.
+
+    Examples:
+        >>> query = (
+        ...     Query()
+        ...     .where_in("status", [Status.RUNNING, Status.ERROR])
+        ...     .gte("last_updated", since)
+        ...     .fields("id", "name", "status")
+        ...     .order_by("-last_updated")
+        ...     .limit(500)
+        ... )
+        >>> tasks = client.tasks.list_all(query=query)
+    """
+
+    def __init__(self):
+        self._where: Dict[str, Any] = {}
+        self._fields: Optional[Dict[str, bool]] = None
+        self._order: Optional[list] = None
+        self._skip: Optional[int] = None
+        self._limit: Optional[int] = None
+
+    def _copy(self, **changes) -> "Query":
+        query = Query()
+        query._where = dict(self._where)
+        query._fields = self._fields
+        query._order = self._order
+        query._skip = self._skip
+        query._limit = self._limit
+        for name, value in changes.items():
+            setattr(query, f"_{name}", value)
+        return query
+
+    def _operator(self, field: str, operator: str, value: Any) -> "Query":
+        where = dict(self._where)
+        condition = where.get(field)
+        # Operators on the same field combine, e.g. a $gte/$lt range
+        condition = dict(condition) if isinstance(condition, dict) else {}
+        condition[operator] = _value(value)
+        where[field] = condition
+        return self._copy(where=where)
+
+    def where(self, **conditions: Any) -> "Query":
+        """
+        Add equality conditions (or raw operator documents)
+
+        Examples:
+            >>> Query().where(status=Status.RUNNING, type="initial_sync")
+            >>> Query().where(name={"like": "^orders", "options": "i"})
+        """
+        where = dict(self._where)
+        where.update({field: _value(value) for field, value in conditions.items()})
+        return self._copy(where=where)
+
+    def where_in(self, field: str, values: Iterable[Any]) -> "Query":
+        """Match any of the values"""
+        return self._operator(field, "$in", list(values))
+
+    def where_not_in(self, field: str, values: Iterable[Any]) -> "Query":
+        """Match none of the values"""
+        return self._operator(field, "$nin", list(values))
+
+    def ne(self, field: str, value: Any) -> "Query":
+        """Field is not equal to value"""
+        return self._operator(field, "$ne", value)
+
+    def gt(self, field: str, value: Any) -> "Query":
+        """Field is greater than value"""
+        return self._operator(field, "$gt", value)
+
+    def gte(self, field: str, value: Any) -> "Query":
+        """Field is greater than or equal to value"""
+        return self._operator(field, "$gte", value)
+
+    def lt(self, field: str, value: Any) -> "Query":
+        """Field is less than value"""
+        return self._operator(field, "$lt", value)
+
+    def lte(self, field: str, value: Any) -> "Query":
+        """Field is less than or equal to value"""
+        return self._operator(field, "$lte", value)
+
+    def like(self, field: str, pattern: str, ignore_case: bool = True) -> "Query":
+        """Field matches a regular expression"""
+        condition = {"like": pattern}
+        if ignore_case:
+            condition["options"] = "i"
+        return self.where(**{field: condition})
+
+    def fields(self, *names: str) -> "Query":
+        """
+        Only return these fields (the id is always included)
+
+        Model attributes whose field is left out are None.
+        """
+        projection = {name: True for name in names}
+        projection["id"] = True
+        return self._copy(fields=projection)
+
+    def order_by(self, *fields: str) -> "Query":
+        """
+        Sort the results
+
+        Args:
+            *fields: Field names, prefixed with "-" for descending order,
+                or Loopback order strings such as "last_updated DESC"
+        """
+        order = []
+        for field in fields:
+            if field.startswith("-"):
+                order.append(f"{field[1:]} DESC")
+            elif " " in field:
+                order.append(field)
+            else:
+                order.append(f"{field} ASC")
+        return self._copy(order=order)
+
+    def skip(self, count: int) -> "Query":
+        """Skip the first results"""
+        if count < 0:
+            raise ValueError("skip must not be negative")
+        return self._copy(skip=count)
+
+    def limit(self, count: int) -> "Query":
+        """Return at most count results (across all pages for iter_all/list_all)"""
+        if count <= 0:
+            raise ValueError("limit must be positive")
+        return self._copy(limit=count)
+
+    def page(self, skip: int, limit: int) -> Optional["Query"]:
+        """
+        Query for one page of a walk over this query's results
+
+        Pages are sorted by id, after this query's own order if any, so
+        page boundaries are deterministic and a walk neither repeats nor
+        misses records that tie on the sort fields.
+
+        Args:
+            skip: Offset of the page, relative to this query's skip
+            limit: Page size
+
+        Returns:
+            Page query, or None once this query's limit is reached
+        """
+        if self._limit is not None:
+            limit = min(limit, self._limit - skip)
+            if limit <= 0:
+                return None
+        order = list(self._order or [])
+        if not any(field.split(" ", 1)[0] == "id" for field in order):
+            order.append(PAGE_ORDER)
+        return self._copy(skip=(self._skip or 0) + skip, limit=limit, order=order)
+
+    def apply(self, filter_dict: dict) -> dict:
+        """
+        Merge this query into a filter
+
+        Args:
+            filter_dict: Filter built by utils.build_filter
+
+        Returns:
+            New filter; clauses of this query take precedence
+        """
+        merged = dict(filter_dict)
+        if self._where:
+            where = dict(merged.get("where") or {})
+            where.update(self._where)
+            merged["where"] = where
+        if self._fields is not None:
+            merged["fields"] = dict(self._fields)
+        if self._order:
+            merged["order"] = self._order[0] if len(self._order) == 1 else list(self._order)
+        if self._skip is not None:
+            merged["skip"] = self._skip
+        if self._limit is not None:
+            merged["limit"] = self._limit
+        return merged
+
+    def to_filter(self) -> dict:
+        """Standalone Loopback filter of this query"""
+        return self.apply(build_filter(limit=self._limit or 20))
+
+    def __repr__(self) -> str:
+        return f"Query({self.to_filter()!r})"
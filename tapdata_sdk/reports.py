@@ -0,0 +1,352 @@
+"""Cluster-wide reports assembled from many API calls"""
+import asyncio
+import csv
+import json
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import IO, Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .enums import LogLevel, Status
+from .exceptions import TapdataError
+from .models import Connection, Task, TaskLog, TaskRelation
+from .query import Query
+from .utils import bounded_map
+
+
+logger = logging.getLogger(__name__)
+
+# Task fields downloaded for an inventory
+_INVENTORY_FIELDS = ("name", "type", "status", "taskRecordId")
+
+# Columns of Inventory.to_csv, one row per task
+CSV_COLUMNS = (
+    "id",
+    "name",
+    "type",
+    "status",
+    "task_record_id",
+    "source_connection_id",
+    "source_name",
+    "source_database_type",
+    "source_endpoint",
+    "target_connection_id",
+    "target_name",
+    "target_database_type",
+    "target_endpoint",
+    "tables",
+    "error_log_count",
+    "last_error",
+    "problems",
+)
+
+
+def _endpoint(conn: Optional[Connection]) -> Optional[str]:
+    if conn is None or not conn.endpoint:
+        return None
+    return f"{conn.endpoint}:{conn.port}" if conn.port else conn.endpoint
+
+
+@dataclass
+class InventoryTask:
+    """
+    One task of an inventory
+
+    relation and error_logs are left empty when they were not requested or
+    could not be fetched; the reason of a failure is kept in problems.
+    """
+    task: Task
+    relation: Optional[TaskRelation] = None
+    error_logs: List[TaskLog] = field(default_factory=list)  # Oldest first
+    problems: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary"""
+        return {
+            **self.task.to_dict(),
+            "relation": self.relation.to_dict() if self.relation else None,
+            "error_logs": [log.to_dict() for log in self.error_logs],
+            "problems": list(self.problems),
+        }
+
+    def to_row(self) -> Dict[str, Any]:
+        """Flat CSV row, keyed by CSV_COLUMNS"""
+        relation = self.relation or TaskRelation()
+        row = {
+            "id": self.task.id,
+            "name": self.task.name,
+            "type": self.task.type,
+            "status": self.task.status,
+            "task_record_id": self.task.task_record_id,
+            "tables": len(relation.table_name_relation or {}),
+            "error_log_count": len(self.error_logs),
+            "last_error": self.error_logs[-1].message if self.error_logs else None,
+            "problems": "; ".join(self.problems) or None,
+        }
+        for side, conn_id, conn in (
+            ("source", relation.source_connection_id, relation.source_conn),
+            ("target", relation.target_connection_id, relation.target_conn),
+        ):
+            row[f"{side}_connection_id"] = conn_id
+            row[f"{side}_name"] = conn.name if conn else None
+            row[f"{side}_database_type"] = conn.database_type if conn else None
+            row[f"{side}_endpoint"] = _endpoint(conn)
+        return row
+
+
+@dataclass
+class Inventory:
+    """
+    Inventory of the tasks of a cluster
+
+    Examples:
+        >>> inventory = client.reports.inventory()
+        >>> inventory.by_status
+        {'running': 812, 'error': 3, ...}
+        >>> for entry in inventory.error_tasks:
+        ...     print(entry.task.name, entry.error_logs[-1].message)
+        >>> with open("inventory.csv", "w", newline="") as f:
+        ...     inventory.to_csv(f)
+    """
+    tasks: List[InventoryTask]
+    generated_at: float = field(default_factory=time.time)  # Unix time
+    duration: float = 0.0  # Seconds spent collecting
+
+    @property
+    def by_status(self) -> Dict[str, int]:
+        """Number of tasks per status"""
+        return dict(Counter(entry.task.status for entry in self.tasks))
+
+    @property
+    def by_type(self) -> Dict[str, int]:
+        """Number of tasks per type"""
+        return dict(Counter(entry.task.type for entry in self.tasks))
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """Number of tasks per status and type, e.g. {"error": {"initial_sync": 2}}"""
+        counts: Dict[str, Dict[str, int]] = {}
+        for entry in self.tasks:
+            by_type = counts.setdefault(entry.task.status, {})
+            by_type[entry.task.type] = by_type.get(entry.task.type, 0) + 1
+        return counts
+
+    @property
+    def error_tasks(self) -> List[InventoryTask]:
+        """Tasks in error status"""
+        return [entry for entry in self.tasks if entry.task.status == Status.ERROR]
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary"""
+        return {
+            "generated_at": datetime.fromtimestamp(self.generated_at, timezone.utc).isoformat(),
+            "duration": self.duration,
+            "total": len(self.tasks),
+            "by_status": self.by_status,
+            "by_type": self.by_type,
+            "summary": self.summary(),
+            "tasks": [entry.to_dict() for entry in self.tasks],
+        }
+
+    def to_json(self, fp: Optional[IO[str]] = None, indent: Optional[int] = 2) -> Optional[str]:
+        """
+        Export as JSON
+
+        Args:
+            fp: Text file to write to; the JSON is returned when omitted
+            indent: Indentation, None for a single line
+
+        Returns:
+            JSON text if fp is None
+        """
+        data = self.to_dict()
+        if fp is None:
+            return json.dumps(data, indent=indent, ensure_ascii=False)
+        json.dump(data, fp, indent=indent, ensure_ascii=False)
+        return None
+
+    def to_csv(self, fp: IO[str]) -> int:
+        """
+        Export one row per task as CSV, see CSV_COLUMNS
+
+        Args:
+            fp: Text file to write to, opened with newline=""
+
+        Returns:
+            Number of rows written
+        """
+        writer = csv.DictWriter(fp, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        for entry in self.tasks:
+            writer.writerow(entry.to_row())
+        return len(self.tasks)
+
+
+def _inventory_query(query: Optional[Query]) -> Query:
+    return (query or Query()).fields(*_INVENTORY_FIELDS)
+
+
+def _apply_relations(
+    entries: Dict[str, InventoryTask],
+    outcomes: Dict[str, Union[TaskRelation, TapdataError]],
+) -> None:
+    for task_id, outcome in outcomes.items():
+        if isinstance(outcome, TapdataError):
+            entries[task_id].problems.append(f"relation: {outcome.message}")
+        else:
+            entries[task_id].relation = outcome
+
+
+def _error_log_targets(entries: Iterable[InventoryTask]) -> List[InventoryTask]:
+    """Error tasks whose logs can be looked up"""
+    return [
+        entry for entry in entries
+        if entry.task.status == Status.ERROR and entry.task.task_record_id
+    ]
+
+
+def _log_window(log_window: float) -> Tuple[int, int]:
+    end = int(time.time() * 1000)
+    return end - int(log_window * 1000), end
+
+
+def _apply_error_logs(entry: InventoryTask, outcome: Union[List[TaskLog], TapdataError]) -> None:
+    if isinstance(outcome, TapdataError):
+        entry.problems.append(f"logs: {outcome.message}")
+    else:
+        # Fetched newest first so the page holds the last lines
+        entry.error_logs = list(reversed(outcome))
+
+
+class ReportClient:
+    """Reports built from many API calls, available as client.reports"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def inventory(
+        self,
+        query: Optional[Query] = None,
+        relations: bool = True,
+        error_log_lines: int = 5,
+        log_window: float = 24 * 3600,
+        max_workers: int = 8,
+        page_size: int = 500,
+    ) -> Inventory:
+        """
+        Collect an inventory of the cluster's tasks
+
+        Tasks are listed with a projection of the fields the report needs.
+        Task details are then fetched concurrently and every distinct
+        source and target connection is looked up once, however many tasks
+        share it. Error logs are only queried for tasks in error status.
+
+        A task whose relation or logs cannot be fetched stays in the report
+        with the error recorded in its problems.
+
+        Args:
+            query: Restricts which tasks are included (its projection is
+                replaced by the report's)
+            relations: Include source and target connections and tables
+            error_log_lines: Last ERROR log lines kept per error task, 0 to
+                skip log queries
+            log_window: Seconds of logs searched for those lines
+            max_workers: Maximum number of concurrent requests
+            page_size: Tasks requested per page
+
+        Returns:
+            Inventory
+
+        Examples:
+            >>> inventory = client.reports.inventory(error_log_lines=10)
+            >>> print(inventory.summary())
+            >>> inventory.to_json(open("inventory.json", "w"))
+        """
+        started = time.perf_counter()
+        tasks = self.client.tasks.list_all(page_size=page_size, query=_inventory_query(query))
+        entries = {task.id: InventoryTask(task) for task in tasks}
+
+        if relations and entries:
+            _apply_relations(entries, self.client.tasks.get_table_relations(
+                list(entries), max_workers=max_workers, return_exceptions=True,
+            ))
+
+        targets = _error_log_targets(entries.values()) if error_log_lines > 0 else []
+        if targets:
+            start, end = _log_window(log_window)
+
+            def fetch(entry: InventoryTask) -> Union[List[TaskLog], TapdataError]:
+                try:
+                    return self.client.tasks.get_logs(
+                        entry.task.id,
+                        entry.task.task_record_id,
+                        start=start,
+                        end=end,
+                        page_size=error_log_lines,
+                        levels=[LogLevel.ERROR],
+                        order="desc",
+                    )
+                except TapdataError as e:
+                    return e
+
+            for entry, outcome in zip(targets, bounded_map(fetch, targets, max_workers)):
+                _apply_error_logs(entry, outcome)
+
+        duration = time.perf_counter() - started
+        logger.info(f"Inventory of {len(entries)} tasks collected in {duration:.2f}s")
+        return Inventory(tasks=list(entries.values()), duration=duration)
+
+
+class AsyncReportClient:
+    """Async counterpart of ReportClient, available as client.reports"""
+
+    def __init__(self, client):
+        self.client = client
+
+    async def inventory(
+        self,
+        query: Optional[Query] = None,
+        relations: bool = True,
+        error_log_lines: int = 5,
+        log_window: float = 24 * 3600,
+        max_concurrency: int = 32,
+        page_size: int = 500,
+    ) -> Inventory:
+        """Collect an inventory of the cluster's tasks, see ReportClient.inventory"""
+        started = time.perf_counter()
+        tasks = await self.client.tasks.list_all(page_size=page_size, query=_inventory_query(query))
+        entries = {task.id: InventoryTask(task) for task in tasks}
+
+        if relations and entries:
+            _apply_relations(entries, await self.client.tasks.get_table_relations(
+                list(entries), max_concurrency=max_concurrency, return_exceptions=True,
+            ))
+
+        targets = _error_log_targets(entries.values()) if error_log_lines > 0 else []
+        if targets:
+            start, end = _log_window(log_window)
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+            async def fetch(entry: InventoryTask) -> Union[List[TaskLog], TapdataError]:
+                async with semaphore:
+                    try:
+                        return await self.client.tasks.get_logs(
+                            entry.task.id,
+                            entry.task.task_record_id,
+                            start=start,
+                            end=end,
+                            page_size=error_log_lines,
+                            levels=[LogLevel.ERROR],
+                            order="desc",
+                        )
+                    except TapdataError as e:
+                        return e
+
+            outcomes = await asyncio.gather(*(fetch(entry) for entry in targets))
+            for entry, outcome in zip(targets, outcomes):
+                _apply_error_logs(entry, outcome)
+
+        duration = time.perf_counter() - started
+        logger.info(f"Inventory of {len(entries)} tasks collected in {duration:.2f}s")
+        return Inventory(tasks=list(entries.values()), duration=duration)
@@ -0,0 +1,123 @@
+"""Retry policy for transient request failures"""
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, Optional
+
+from .exceptions import (
+    TapdataConnectionError,
+    TapdataError,
+    TapdataHTTPError,
+    TapdataTimeoutError,
+)
+
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Retry policy with exponential backoff and jitter
+
+    Timeouts, connection errors and retryable HTTP statuses are retried.
+    Only idempotent methods are retried unless retry_non_idempotent is set
+    or the request itself is marked idempotent.
+
+    Args:
+        max_attempts: Total attempts including the first one (1 = no retry)
+        backoff_factor: Base delay; attempt n waits backoff_factor * 2 ** (n - 1)
+        max_backoff: Upper bound of a single delay in seconds
+        jitter: Random fraction (0-1) of the delay to subtract
+        retry_statuses: HTTP statuses worth retrying
+        methods: Methods retried automatically
+        retry_non_idempotent: Also retry PUT/PATCH/DELETE/POST requests
+        respect_retry_after: Wait as long as a Retry-After header asks
+        max_retry_after: Upper bound of a Retry-After wait in seconds
+
+    Examples:
+        >>> client = TapdataClient(
+        ...     "http://localhost:3030",
+        ...     retry=RetryPolicy(max_attempts=5, backoff_factor=1),
+        ... )
+    """
+    max_attempts: int = 3
+    backoff_factor: float = 0.5
+    max_backoff: float = 30.0
+    jitter: float = 0.5
+    retry_statuses: FrozenSet[int] = frozenset({429, 502, 503, 504})
+    methods: FrozenSet[str] = field(default_factory=lambda: IDEMPOTENT_METHODS)
+    retry_non_idempotent: bool = False
+    respect_retry_after: bool = True
+    max_retry_after: float = 60.0
+
+    @classmethod
+    def disabled(cls) -> "RetryPolicy":
+        """Policy that never retries"""
+        return cls(max_attempts=1)
+
+    def allows_method(self, method: str, idempotent: Optional[bool] = None) -> bool:
+        """
+        Whether requests with this method may be retried
+
+        Args:
+            method: HTTP method
+            idempotent: Per-request override; True opts a request in,
+                False opts it out
+        """
+        if idempotent is not None:
+            return idempotent
+        return self.retry_non_idempotent or method.upper() in self.methods
+
+    def is_retryable(self, error: TapdataError) -> bool:
+        """Whether an error is transient"""
+        if isinstance(error, (TapdataTimeoutError, TapdataConnectionError)):
+            return True
+        if isinstance(error, TapdataHTTPError):
+            return error.status_code in self.retry_statuses
+        return False
+
+    def delay(self, attempt: int, error: Optional[TapdataError] = None) -> float:
+        """
+        Seconds to wait before the next attempt
+
+        Args:
+            attempt: Number of the attempt that just failed (1-based)
+            error: The error of that attempt
+        """
+        retry_after = getattr(error, "retry_after", None)
+        if self.respect_retry_after and retry_after:
+            seconds = parse_retry_after(retry_after)
+            if seconds is not None:
+                return min(seconds, self.max_retry_after)
+
+        delay = min(self.backoff_factor * (2 ** (attempt - 1)), self.max_backoff)
+        if self.jitter:
+            delay -= delay * self.jitter * random.random()
+        return delay
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """
+    Parse a Retry-After header value
+
+    Args:
+        value: Delay in seconds or an HTTP date
+
+    Returns:
+        Seconds to wait, None if the value cannot be parsed
+    """
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if when is None:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
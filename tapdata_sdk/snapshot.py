@@ -0,0 +1,374 @@
+"""Persistent local snapshot of connection and task metadata"""
+import json
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .enums import ConnectionType, DatabaseType, Status
+from .exceptions import TapdataError
+from .models import Connection, Task, TaskDetail
+from .query import Query
+from .utils import bounded_map, chunk_ids
+
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS connections (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    connection_type TEXT,
+    database_type TEXT,
+    status TEXT,
+    last_updated,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS connections_status ON connections (status);
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    type TEXT,
+    status TEXT,
+    last_updated,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status);
+CREATE TABLE IF NOT EXISTS task_details (
+    id TEXT PRIMARY KEY,
+    last_updated,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS watermarks (
+    kind TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# API fields downloaded for each record kind
+_CONNECTION_FIELDS = (
+    "name", "connection_type", "database_type", "status", "config", "last_updated",
+)
+_TASK_FIELDS = ("name", "type", "status", "taskRecordId", "last_updated")
+
+# Longest ID list of one $in lookup, as in TaskWatcher
+_MAX_IDS_LENGTH = 6000
+
+
+@dataclass
+class RefreshStats:
+    """Records written by one SnapshotStore.refresh"""
+    connections: int = 0
+    tasks: int = 0
+    task_details: int = 0
+    deleted: int = 0
+    full: bool = False
+
+
+def _dumps(data: dict) -> str:
+    return json.dumps(data, separators=(",", ":"))
+
+
+def _task_detail_from_row(data: dict) -> TaskDetail:
+    return TaskDetail(
+        id=data["id"],
+        name=data.get("name"),
+        type=data.get("type"),
+        status=data.get("status"),
+        task_record_id=data.get("taskRecordId"),
+        nodes=data.get("nodes") or [],
+    )
+
+
+class SnapshotStore:
+    """
+    SQLite snapshot of connections, tasks and task details
+
+    A refresh only downloads the records whose last_updated is at or after
+    the newest one seen by the previous refresh, walking the list endpoints
+    in last_updated DESC order. Reads never touch the API, so they work
+    offline and take milliseconds.
+
+    Incremental refreshes cannot see deletions; run refresh(full=True) now
+    and then to drop records that no longer exist.
+
+    The store may be shared between threads.
+
+    Args:
+        path: Database file, or ":memory:" for a throwaway snapshot
+
+    Examples:
+        >>> with SnapshotStore("tapdata.db") as store:
+        ...     store.refresh(client, details=True)
+        ...     failed = store.tasks(status=Status.ERROR)
+        ...     mysql = store.connections(database_type=DatabaseType.MYSQL)
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database"""
+        self._db.close()
+
+    def __enter__(self) -> "SnapshotStore":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # --- refresh ------------------------------------------------------------
+
+    def watermark(self, kind: str) -> Any:
+        """
+        Newest last_updated stored for a kind ("connections" or "tasks")
+
+        Returns:
+            The value as sent by the API, None before the first refresh
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM watermarks WHERE kind = ?", (kind,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def refresh(
+        self,
+        client: Any,
+        full: bool = False,
+        details: bool = False,
+        page_size: int = 500,
+        max_workers: int = 4,
+    ) -> RefreshStats:
+        """
+        Bring the snapshot up to date
+
+        Args:
+            client: TapdataClient
+            full: Download everything and drop records that no longer exist
+                (implied by the first refresh)
+            details: Also store the TaskDetail of every new or changed task
+            page_size: Records requested per page
+            max_workers: Task details fetched concurrently
+
+        Returns:
+            Counts of the records written
+        """
+        if self.watermark("connections") is None or self.watermark("tasks") is None:
+            full = True
+        stats = RefreshStats(full=full)
+
+        written, deleted = self._refresh_kind(
+            "connections",
+            lambda query: client.connections.iter_all(query=query, page_size=page_size),
+            _CONNECTION_FIELDS,
+            full,
+        )
+        stats.connections = len(written)
+        stats.deleted += deleted
+
+        written, deleted = self._refresh_kind(
+            "tasks",
+            lambda query: client.tasks.iter_all(query=query, page_size=page_size),
+            _TASK_FIELDS,
+            full,
+        )
+        stats.tasks = len(written)
+        stats.deleted += deleted
+
+        if details:
+            stats.task_details = self._refresh_details(client, written, max_workers)
+
+        logger.info(f"Snapshot refreshed: {stats}")
+        return stats
+
+    def _refresh_kind(
+        self,
+        kind: str,
+        iter_all: Callable[[Query], Iterator[Union[Connection, Task]]],
+        fields: Iterable[str],
+        full: bool,
+    ) -> Tuple[List[str], int]:
+        """Download new records of a kind; returns (written IDs, deleted count)"""
+        watermark = None if full else self.watermark(kind)
+        full = watermark is None
+        query = Query().fields(*fields).order_by("-last_updated")
+        if watermark is not None:
+            # Records sharing the watermark's timestamp are downloaded again,
+            # so an update landing in the same millisecond is not missed
+            query = query.gte("last_updated", watermark)
+
+        newest = watermark
+        seen: Dict[str, None] = {}
+        rows = []
+        for record in iter_all(query):
+            # A record updated during the walk moves to the front and may
+            # show up twice
+            if record.id in seen:
+                continue
+            seen[record.id] = None
+            if not rows and record.last_updated is not None:
+                # Pages are ordered by last_updated DESC
+                newest = record.last_updated
+            rows.append(self._row(record))
+
+        stale = []
+        if full:
+            with self._lock:
+                stored = [row[0] for row in self._db.execute(f"SELECT id FROM {kind}")]
+            # Records inserted or removed during the walk shift the pages, so a
+            # live record may have been skipped: only drop IDs a lookup confirms
+            missing = [record_id for record_id in stored if record_id not in seen]
+            for chunk in chunk_ids(missing, max_length=_MAX_IDS_LENGTH, separator='","'):
+                for record in iter_all(Query().where_in("id", chunk).fields(*fields)):
+                    if record.id not in seen:
+                        seen[record.id] = None
+                        rows.append(self._row(record))
+            stale = [(record_id,) for record_id in missing if record_id not in seen]
+
+        with self._lock, self._db:
+            if kind == "connections":
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO connections "
+                    "(id, name, connection_type, database_type, status, last_updated, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+            else:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO tasks "
+                    "(id, name, type, status, last_updated, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+            if stale:
+                self._db.executemany(f"DELETE FROM {kind} WHERE id = ?", stale)
+                if kind == "tasks":
+                    self._db.executemany("DELETE FROM task_details WHERE id = ?", stale)
+            if newest is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO watermarks (kind, value) VALUES (?, ?)",
+                    (kind, json.dumps(newest)),
+                )
+        return list(seen), len(stale)
+
+    @staticmethod
+    def _row(record: Union[Connection, Task]) -> tuple:
+        data = record.to_dict()
+        if isinstance(record, Connection):
+            # The model keeps what is needed from config (no credentials)
+            return (
+                record.id, record.name, record.connection_type, record.database_type,
+                record.status, record.last_updated, _dumps(data),
+            )
+        return (
+            record.id, record.name, record.type, record.status,
+            record.last_updated, _dumps(data),
+        )
+
+    def _refresh_details(self, client: Any, changed: List[str], max_workers: int) -> int:
+        """Fetch the details of changed tasks and of tasks stored without one"""
+        with self._lock:
+            missing = [row[0] for row in self._db.execute(
+                "SELECT id FROM tasks WHERE id NOT IN (SELECT id FROM task_details)"
+            )]
+            last_updated = dict(self._db.execute("SELECT id, last_updated FROM tasks"))
+        task_ids = list(dict.fromkeys(changed + missing))
+
+        def fetch(task_id: str) -> Optional[TaskDetail]:
+            try:
+                return client.tasks.get(task_id)
+            except TapdataError as e:
+                logger.warning(f"Failed to get details of task {task_id}: {e.message}")
+                return None
+
+        rows = []
+        for detail in bounded_map(fetch, task_ids, max_workers=max_workers):
+            if detail is None:
+                continue
+            rows.append((detail.id, last_updated.get(detail.id), _dumps(detail.to_dict())))
+
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO task_details (id, last_updated, data) VALUES (?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    # --- queries ------------------------------------------------------------
+
+    def _select(self, table: str, conditions: Dict[str, Any], name: Optional[str]) -> Iterator[dict]:
+        sql = f"SELECT data, last_updated FROM {table}"
+        clauses = [f"{column} = ?" for column in conditions]
+        args = [str(value) for value in conditions.values()]
+        if name:
+            clauses.append("name LIKE ?")
+            args.append(f"%{name}%")
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY last_updated DESC"
+        with self._lock:
+            rows = self._db.execute(sql, args).fetchall()
+        # last_updated is kept in its column, out of the serialized model
+        return ({**json.loads(data), "last_updated": last_updated} for data, last_updated in rows)
+
+    def connections(
+        self,
+        connection_type: Optional[Union[str, ConnectionType]] = None,
+        database_type: Optional[Union[str, DatabaseType]] = None,
+        status: Optional[Union[str, Status]] = None,
+        name: Optional[str] = None,
+    ) -> List[Connection]:
+        """
+        Stored connections, newest first
+
+        Args:
+            connection_type: Connection type
+            database_type: Database type
+            status: Status
+            name: Name filter (case-insensitive substring)
+        """
+        conditions = {
+            "connection_type": connection_type,
+            "database_type": database_type,
+            "status": status,
+        }
+        conditions = {k: v for k, v in conditions.items() if v}
+        return [Connection(**data) for data in self._select("connections", conditions, name)]
+
+    def connection(self, connection_id: str) -> Optional[Connection]:
+        """Stored connection, None if unknown"""
+        found = list(self._select("connections", {"id": connection_id}, None))
+        return Connection(**found[0]) if found else None
+
+    def tasks(
+        self,
+        status: Optional[Union[str, Status]] = None,
+        name: Optional[str] = None,
+        type: Optional[str] = None,
+    ) -> List[Task]:
+        """
+        Stored tasks, newest first
+
+        Args:
+            status: Status filter
+            name: Name filter (case-insensitive substring)
+            type: Task type, e.g. "initial_sync+cdc"
+        """
+        conditions = {k: v for k, v in {"status": status, "type": type}.items() if v}
+        return [Task.from_dict(data) for data in self._select("tasks", conditions, name)]
+
+    def task(self, task_id: str) -> Optional[Task]:
+        """Stored task, None if unknown"""
+        found = list(self._select("tasks", {"id": task_id}, None))
+        return Task.from_dict(found[0]) if found else None
+
+    def task_detail(self, task_id: str) -> Optional[TaskDetail]:
+        """Stored task details, None if unknown or not refreshed with details"""
+        found = list(self._select("task_details", {"id": task_id}, None))
+        return _task_detail_from_row(found[0]) if found else None
@@ -0,0 +1,266 @@
+"""Incremental parsing of page responses"""
+import codecs
+import json
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+except ImportError:
+    ijson = None
+
+# Bytes read from the socket per chunk while streaming
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Characters that may continue a number cut off by a chunk boundary
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+
+# Envelope fields kept besides the items: top-level code/message, data.total
+_ENVELOPE_FIELDS = {"code": "code", "message": "message", "data.total": "total"}
+
+
+class ItemParser(ABC):
+    """
+    Push parser yielding the items of a page response as they arrive
+
+    Pages look like {"code": "ok", "data": {"items": [...], "total": n}}.
+    Chunks of the body are fed as they are received and every item is
+    returned as soon as it is complete, so only one item (plus a chunk) is
+    held in memory however large the page is. The code, message and total
+    are collected in `envelope`.
+
+    Malformed or truncated bodies raise ValueError.
+
+    Examples:
+        >>> parser = item_parser()
+        >>> for chunk in resp.iter_content(STREAM_CHUNK_SIZE):
+        ...     for item in parser.feed(chunk):
+        ...         handle(item)
+        >>> for item in parser.close():
+        ...     handle(item)
+        >>> parser.envelope["code"]
+    """
+
+    def __init__(self):
+        self.envelope: Dict[str, Any] = {}
+
+    @abstractmethod
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Parse a chunk of the body, returning the items it completed"""
+
+    @abstractmethod
+    def close(self) -> List[Any]:
+        """Finish parsing, returning the last items"""
+
+
+class _NeedMore(Exception):
+    """The buffered text ends inside the value being decoded"""
+
+
+class JSONItemParser(ItemParser):
+    """
+    Standard library item parser
+
+    Walks the envelope by hand and decodes each item with
+    json.JSONDecoder.raw_decode once its text is fully buffered.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        # Buffered characters needed before decoding is worth retrying
+        self._need = 0
+        self._eof = False
+        self._state = "start"
+        # Enclosing envelope objects: "top" and then "data"
+        self._levels: List[str] = []
+        self._key = None
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        self._buf += self._utf8.decode(chunk)
+        return self._run()
+
+    def close(self) -> List[Any]:
+        self._buf += self._utf8.decode(b"", final=True)
+        self._eof = True
+        items = self._run()
+        if self._state != "done":
+            raise ValueError("Truncated JSON response")
+        if _WHITESPACE.match(self._buf).end() != len(self._buf):
+            raise ValueError("Extra data after JSON response")
+        return items
+
+    def _run(self) -> List[Any]:
+        items: List[Any] = []
+        if self._eof or len(self._buf) - self._pos >= self._need:
+            self._need = 0
+            try:
+                while self._state != "done" and self._step(items):
+                    pass
+            except _NeedMore:
+                pass
+        # Drop the parsed text so the buffer only holds the current value
+        self._buf = self._buf[self._pos:]
+        self._pos = 0
+        return items
+
+    def _decode(self, pos: int) -> Any:
+        try:
+            value, end = self._decoder.raw_decode(self._buf, pos)
+        except json.JSONDecodeError:
+            if self._eof:
+                raise
+            # Wait for the buffer to double instead of reparsing every chunk
+            self._pos = pos
+            self._need = 2 * (len(self._buf) - pos)
+            raise _NeedMore
+        if (
+            not self._eof
+            and isinstance(value, (int, float))
+            and _NUMBER_TAIL.match(self._buf, end).end() == len(self._buf)
+        ):
+            # The number may continue in the next chunk, e.g. "1e" + "3"
+            self._pos = pos
+            self._need = len(self._buf) - pos + 1
+            raise _NeedMore
+        self._pos = end
+        return value
+
+    def _close_object(self, pos: int) -> None:
+        self._levels.pop()
+        self._state = "after_value" if self._levels else "done"
+        self._pos = pos + 1
+
+    def _step(self, items: List[Any]) -> bool:
+        pos = _WHITESPACE.match(self._buf, self._pos).end()
+        self._pos = pos
+        if pos == len(self._buf):
+            return False
+        char = self._buf[pos]
+        state = self._state
+
+        if state == "start":
+            if char != "{":
+                raise ValueError("Expected a JSON object")
+            self._levels.append("top")
+            self._state = "key"
+            self._pos = pos + 1
+        elif state == "key":
+            if char == "}":
+                self._close_object(pos)
+            elif char == '"':
+                self._key = self._decode(pos)
+                self._state = "colon"
+            else:
+                raise ValueError(f"Expected a key at character {pos}")
+        elif state == "colon":
+            if char != ":":
+                raise ValueError(f"Expected ':' at character {pos}")
+            self._state = "value"
+            self._pos = pos + 1
+        elif state == "value":
+            level = self._levels[-1]
+            if level == "top" and self._key == "data" and char == "{":
+                self._levels.append("data")
+                self._state = "key"
+                self._pos = pos + 1
+            elif level == "data" and self._key == "items" and char == "[":
+                self._state = "item"
+                self._pos = pos + 1
+            else:
+                value = self._decode(pos)
+                path = self._key if level == "top" else f"data.{self._key}"
+                if path in _ENVELOPE_FIELDS:
+                    self.envelope[_ENVELOPE_FIELDS[path]] = value
+                self._state = "after_value"
+        elif state == "after_value":
+            if char == "}":
+                self._close_object(pos)
+            elif char == ",":
+                self._state = "key"
+                self._pos = pos + 1
+            else:
+                raise ValueError(f"Expected ',' or '}}' at character {pos}")
+        elif state == "item":
+            if char == "]":
+                self._state = "after_value"
+                self._pos = pos + 1
+            else:
+                items.append(self._decode(pos))
+                self._state = "after_item"
+        elif state == "after_item":
+            if char == "]":
+                self._state = "after_value"
+            elif char == ",":
+                self._state = "item"
+            else:
+                raise ValueError(f"Expected ',' or ']' at character {pos}")
+            self._pos = pos + 1
+        return True
+
+
+class IjsonItemParser(ItemParser):
+    """Item parser backed by ijson (its C backend when available)"""
+
+    def __init__(self):
+        if ijson is None:
+            raise ImportError(
+                "ijson is required for IjsonItemParser. "
+                "Install it with: pip install tapdata-sdk[stream]"
+            )
+        super().__init__()
+        self._events = ijson.sendable_list()
+        self._coro = ijson.parse_coro(self._events, use_float=True)
+        self._builder = None
+        self._done = False
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        try:
+            self._coro.send(chunk)
+        except ijson.JSONError as e:
+            raise ValueError(str(e)) from e
+        return self._drain()
+
+    def close(self) -> List[Any]:
+        try:
+            self._coro.close()
+        except ijson.JSONError as e:
+            raise ValueError(str(e)) from e
+        items = self._drain()
+        if not self._done:
+            raise ValueError("Truncated JSON response")
+        return items
+
+    def _drain(self) -> List[Any]:
+        items = []
+        for prefix, event, value in self._events:
+            if self._builder is not None:
+                self._builder.event(event, value)
+                if prefix == "data.items.item" and event in ("end_map", "end_array"):
+                    items.append(self._builder.value)
+                    self._builder = None
+            elif prefix == "data.items.item":
+                if event in ("start_map", "start_array"):
+                    self._builder = ObjectBuilder()
+                    self._builder.event(event, value)
+                else:
+                    items.append(value)
+            elif prefix in _ENVELOPE_FIELDS and event in ("string", "number", "boolean", "null"):
+                self.envelope[_ENVELOPE_FIELDS[prefix]] = value
+            elif prefix == "" and event == "end_map":
+                self._done = True
+        del self._events[:]
+        return items
+
+
+def item_parser() -> ItemParser:
+    """Item parser using ijson when installed, the standard library otherwise"""
+    if ijson is not None:
+        return IjsonItemParser()
+    return JSONItemParser()
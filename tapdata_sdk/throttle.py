@@ -0,0 +1,212 @@
+"""Client-side rate limiting and concurrency control"""
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterator, Optional
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter usable from threads and asyncio
+
+    Callers reserve a token up front and then wait until it becomes
+    available, so waiters are served in arrival order without busy polling.
+
+    Args:
+        rate: Tokens added per second
+        burst: Bucket capacity (defaults to one second worth of tokens)
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token, returning how many seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            refill = (now - self._updated) * self.rate
+            self._tokens = min(self.burst, self._tokens + refill)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """Block until a token is available"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Wait without blocking the event loop until a token is available"""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class ConcurrencyLimit:
+    """
+    Maximum number of in-flight requests, usable from threads and asyncio
+
+    Args:
+        max_in_flight: Maximum number of concurrent holders
+    """
+
+    ASYNC_POLL_MAX = 0.05
+
+    def __init__(self, max_in_flight: int):
+        if max_in_flight <= 0:
+            raise ValueError("max_in_flight must be positive")
+        self.max_in_flight = max_in_flight
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        """Current number of holders"""
+        return self._in_flight
+
+    def try_acquire(self) -> bool:
+        """Take a slot if one is free"""
+        with self._cond:
+            if self._in_flight >= self.max_in_flight:
+                return False
+            self._in_flight += 1
+            return True
+
+    def acquire(self) -> None:
+        """Block until a slot is free"""
+        with self._cond:
+            while self._in_flight >= self.max_in_flight:
+                self._cond.wait()
+            self._in_flight += 1
+
+    async def acquire_async(self) -> None:
+        """Wait without blocking the event loop until a slot is free"""
+        # Slots may be released by other threads, so poll instead of relying
+        # on loop-bound primitives
+        delay = 0.001
+        while not self.try_acquire():
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.ASYNC_POLL_MAX)
+
+    def release(self) -> None:
+        """Give a slot back"""
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+
+@dataclass
+class Limit:
+    """
+    Limits of one endpoint class
+
+    Args:
+        rate: Requests per second (None = unlimited)
+        burst: Requests allowed in a burst above the rate
+        max_in_flight: Maximum concurrent requests (None = unlimited)
+    """
+    rate: Optional[float] = None
+    burst: Optional[float] = None
+    max_in_flight: Optional[int] = None
+
+
+class RequestGovernor:
+    """
+    Rate limiter and in-flight cap per endpoint class
+
+    Requests are classified as "read" (GET), "mutation" (other methods) or
+    "logs" (log queries). One governor can be shared by several clients.
+
+    Args:
+        read: Limit for read requests
+        mutation: Limit for mutating requests
+        logs: Limit for log queries
+
+    Examples:
+        >>> governor = RequestGovernor(
+        ...     read=Limit(rate=50, max_in_flight=16),
+        ...     mutation=Limit(rate=5, max_in_flight=2),
+        ...     logs=Limit(rate=10, max_in_flight=4),
+        ... )
+        >>> client = TapdataClient("http://localhost:3030", governor=governor)
+    """
+
+    READ = "read"
+    MUTATION = "mutation"
+    LOGS = "logs"
+
+    def __init__(
+        self,
+        read: Optional[Limit] = None,
+        mutation: Optional[Limit] = None,
+        logs: Optional[Limit] = None,
+    ):
+        self.limits = {
+            self.READ: read or Limit(),
+            self.MUTATION: mutation or Limit(),
+            self.LOGS: logs or Limit(),
+        }
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._slots: Dict[str, ConcurrencyLimit] = {}
+        for name, limit in self.limits.items():
+            if limit.rate is not None:
+                self._buckets[name] = TokenBucket(limit.rate, limit.burst)
+            if limit.max_in_flight is not None:
+                self._slots[name] = ConcurrencyLimit(limit.max_in_flight)
+
+    @classmethod
+    def classify(cls, method: str, endpoint: str) -> str:
+        """Endpoint class of a request"""
+        if endpoint.startswith("/api/MonitoringLogs"):
+            return cls.LOGS
+        if method.upper() in ("GET", "HEAD", "OPTIONS"):
+            return cls.READ
+        return cls.MUTATION
+
+    @contextmanager
+    def slot(self, method: str, endpoint: str) -> Iterator[None]:
+        """
+        Hold a rate-limited, concurrency-limited slot for one request
+
+        The rate token is waited for before a slot is taken, so callers
+        held back by the rate do not occupy slots other requests could use.
+        """
+        name = self.classify(method, endpoint)
+        bucket = self._buckets.get(name)
+        slots = self._slots.get(name)
+        if bucket is not None:
+            bucket.acquire()
+        if slots is not None:
+            slots.acquire()
+        try:
+            yield
+        finally:
+            if slots is not None:
+                slots.release()
+
+    @asynccontextmanager
+    async def slot_async(self, method: str, endpoint: str) -> AsyncIterator[None]:
+        """Async counterpart of slot()"""
+        name = self.classify(method, endpoint)
+        bucket = self._buckets.get(name)
+        slots = self._slots.get(name)
+        if bucket is not None:
+            await bucket.acquire_async()
+        if slots is not None:
+            await slots.acquire_async()
+        try:
+            yield
+        finally:
+            if slots is not None:
+                slots.release()
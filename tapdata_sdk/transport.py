@@ -0,0 +1,108 @@
+"""HTTP transport (connection pool) configuration"""
+import socket
+from typing import List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.response import HTTPResponse
+
+from .compression import ENCODINGS
+
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 32
+
+
+def _tcp_keepalive_options(
+    idle: int = 60,
+    interval: int = 10,
+    count: int = 6,
+) -> List[Tuple[int, int, int]]:
+    """Build socket options enabling TCP keep-alive probes where supported"""
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle))
+    elif hasattr(socket, "TCP_KEEPALIVE"):
+        # macOS spells TCP_KEEPIDLE as TCP_KEEPALIVE
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, idle))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, interval))
+    if hasattr(socket, "TCP_KEEPCNT"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPCNT, count))
+    return options
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter with configurable socket options
+
+    Args:
+        socket_options: Extra socket options applied to every new connection
+        **kwargs: Passed through to requests.adapters.HTTPAdapter
+    """
+
+    def __init__(self, socket_options: Optional[list] = None, **kwargs):
+        self.socket_options = socket_options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.socket_options:
+            kwargs["socket_options"] = (
+                HTTPConnection.default_socket_options + list(self.socket_options)
+            )
+        super().init_poolmanager(*args, **kwargs)
+
+
+def decodable_encodings() -> List[str]:
+    """Content encodings urllib3 decompresses, most preferred first"""
+    decoders = getattr(HTTPResponse, "CONTENT_DECODERS", ["gzip", "deflate"])
+    return [encoding for encoding in ENCODINGS if encoding in decoders]
+
+
+def create_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    pool_block: bool = False,
+    keep_alive: bool = True,
+    tcp_keepalive: bool = False,
+    max_retries: int = 0,
+) -> requests.Session:
+    """
+    Create a pooled requests.Session
+
+    The returned session can be passed to several TapdataClient instances
+    so they share one warm connection pool.
+
+    Args:
+        pool_connections: Number of per-host connection pools to cache
+        pool_maxsize: Maximum connections kept open per host
+        pool_block: Wait for a free connection instead of opening (and then
+            discarding) an extra one when the pool is exhausted
+        keep_alive: Reuse connections between requests (HTTP keep-alive)
+        tcp_keepalive: Enable TCP keep-alive probes on idle connections
+        max_retries: Low-level connection retries done by urllib3
+
+    Returns:
+        Configured session
+
+    Examples:
+        >>> session = create_session(pool_maxsize=64, pool_block=True)
+        >>> a = TapdataClient("http://localhost:3030", session=session)
+        >>> b = TapdataClient("http://localhost:3030", session=session)
+    """
+    session = requests.Session()
+    adapter = PooledHTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+        max_retries=max_retries,
+        socket_options=_tcp_keepalive_options() if tcp_keepalive else None,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+
+    return session
@@ -1,7 +1,12 @@
 """Utility functions"""
 import base64
 import hashlib
-from typing import Optional
+import json
+import random
+from urllib.parse import quote
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, TypeVar
 
 try:
     from Crypto.Cipher import ARC4
@@ -14,6 +19,10 @@ except ImportError:
     )
 
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+
 def encrypt_rc4_cryptojs(plaintext, password):
     """
     Simulate CryptoJS.RC4.encrypt behavior
@@ -108,3 +117,201 @@ def build_filter(
     filter_dict["noSchema"] = 1
     
     return filter_dict
+
+
+class Backoff:
+    """
+    Exponential backoff delay generator
+    
+    Args:
+        initial: First delay in seconds
+        maximum: Upper bound of the delay in seconds
+        factor: Multiplier applied after each delay
+        jitter: Random fraction (0-1) of the delay to subtract, spreading
+            out callers that back off at the same time
+    
+    Examples:
+        >>> backoff = Backoff(initial=1, maximum=30)
+        >>> [backoff.next() for _ in range(4)]
+        [1, 2, 4, 8]
+    """
+    
+    def __init__(
+        self,
+        initial: float = 1.0,
+        maximum: float = 30.0,
+        factor: float = 2.0,
+        jitter: float = 0.0,
+    ):
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+        self.current = initial
+    
+    def next(self) -> float:
+        """Return the next delay and grow the following one"""
+        delay = min(self.current, self.maximum)
+        self.current = min(self.current * self.factor, self.maximum)
+        if self.jitter:
+            delay -= delay * self.jitter * random.random()
+        return delay
+    
+    def reset(self) -> None:
+        """Start over from the initial delay"""
+        self.current = self.initial
+
+
+def iter_pages(
+    fetch_page: Callable[[int, int], List[T]],
+    page_size: int = 100,
+    prefetch: bool = False,
+) -> Iterator[T]:
+    """
+    Walk a skip/limit paginated endpoint lazily
+    
+    Args:
+        fetch_page: Callable taking (skip, limit) and returning one page
+        page_size: Number of records requested per page
+        prefetch: Whether to fetch the next page in a background thread
+            while the caller consumes the current one
+        
+    Yields:
+        Records in server order, one page in memory at a time
+    """
+    if page_size <= 0:
+        raise ValueError("page_size must be positive")
+    
+    if not prefetch:
+        skip = 0
+        while True:
+            page = fetch_page(skip, page_size)
+            yield from page
+            if len(page) < page_size:
+                return
+            skip += page_size
+    
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        skip = 0
+        future = executor.submit(fetch_page, skip, page_size)
+        while future is not None:
+            page = future.result()
+            skip += page_size
+            future = None
+            if len(page) >= page_size:
+                future = executor.submit(fetch_page, skip, page_size)
+            yield from page
+    finally:
+        executor.shutdown(wait=False)
+
+
+def bounded_map(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int = 4,
+    discard: Optional[Callable[[R], None]] = None,
+) -> Iterator[R]:
+    """
+    Map a function over items on a thread pool, yielding results in order
+    
+    At most max_workers items are in flight or buffered at any time, so
+    memory stays bounded however many items there are.
+    
+    Args:
+        fn: Function to apply
+        items: Input items, consumed lazily
+        max_workers: Number of worker threads
+        discard: Called with every result computed but never yielded, when
+            an item fails or the caller stops early (e.g. to close files)
+        
+    Yields:
+        Results in input order
+    """
+    if max_workers <= 0:
+        raise ValueError("max_workers must be positive")
+    
+    items = iter(items)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending: deque = deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= max_workers:
+                break
+        while pending:
+            result = pending.popleft().result()
+            for item in items:
+                pending.append(executor.submit(fn, item))
+                break
+            yield result
+    finally:
+        for future in pending:
+            if not future.cancel() and discard is not None:
+                # Runs at once for finished items, on completion otherwise
+                future.add_done_callback(lambda done: _discard_result(done, discard))
+        executor.shutdown(wait=False)
+
+
+def _discard_result(future: Future, discard: Callable[[R], None]) -> None:
+    if future.exception() is None:
+        discard(future.result())
+
+
+def chunk_ids(
+    ids: Iterable[str],
+    max_length: int = 2000,
+    max_size: Optional[int] = None,
+    separator: str = ",",
+) -> Iterator[List[str]]:
+    """
+    Split IDs into chunks whose URL-encoded joined length stays under a limit
+    
+    Duplicate IDs are dropped, keeping the first occurrence.
+    
+    Args:
+        ids: IDs to split
+        max_length: Maximum URL-encoded length of the separator-joined chunk
+        max_size: Maximum number of IDs per chunk
+        separator: Separator used when the chunk is joined
+        
+    Yields:
+        Lists of IDs
+    """
+    sep_length = len(quote(separator, safe=""))
+    seen = set()
+    chunk: List[str] = []
+    length = 0
+    for id_ in ids:
+        if id_ in seen:
+            continue
+        seen.add(id_)
+        id_length = len(quote(id_, safe=""))
+        extra = id_length + (sep_length if chunk else 0)
+        full = max_size is not None and len(chunk) >= max_size
+        if chunk and (full or length + extra > max_length):
+            yield chunk
+            chunk, length, extra = [], 0, id_length
+        chunk.append(id_)
+        length += extra
+    if chunk:
+        yield chunk
+
+
+def request_key(method: str, path: str, params: Optional[dict] = None) -> tuple:
+    """
+    Build a hashable key identifying a request
+    
+    The access token is left out so a key stays valid across re-logins.
+    
+    Args:
+        method: HTTP method
+        path: Request path with path parameters filled in
+        params: URL parameters (filter may still be a dict)
+        
+    Returns:
+        Key tuple
+    """
+    params = {k: v for k, v in (params or {}).items() if k != "access_token"}
+    normalized = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+    return (method.upper(), path, normalized)
@@ -0,0 +1,291 @@
+"""Multiplexed task status polling"""
+import asyncio
+import inspect
+import logging
+import threading
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .enums import Status
+from .models import Task, TaskStatusChange
+from .query import Query
+from .utils import Backoff, chunk_ids
+
+
+logger = logging.getLogger(__name__)
+
+StatusCallback = Callable[[TaskStatusChange], Any]
+
+
+class _WatchState:
+    """Status bookkeeping shared by TaskWatcher and AsyncTaskWatcher"""
+
+    # URL-encoded length budget for the IDs of one status query (about 180
+    # ObjectIds), keeping the URL under the common 8 KB request line limit
+    MAX_IDS_LENGTH = 6000
+
+    def __init__(
+        self,
+        client: Any,
+        task_ids: Iterable[str],
+        until: Optional[Iterable[Union[str, Status]]] = None,
+        interval: float = 1.0,
+        max_interval: float = 10.0,
+        fields: Iterable[str] = ("status",),
+    ):
+        self.client = client
+        self.task_ids = list(dict.fromkeys(task_ids))
+        self.until = frozenset(str(status) for status in until or ())
+        self.interval = interval
+        self.max_interval = max_interval
+        self.fields = tuple(fields)
+        self.statuses: Dict[str, Optional[str]] = {}
+        self.tasks: Dict[str, Task] = {}
+        self._callbacks: List[StatusCallback] = []
+
+    def on_change(self, callback: StatusCallback) -> StatusCallback:
+        """
+        Register a callback invoked with every TaskStatusChange
+
+        Returns the callback, so it can be used as a decorator.
+        """
+        self._callbacks.append(callback)
+        return callback
+
+    def _settled(self, task_id: str) -> bool:
+        if task_id not in self.statuses:
+            return False
+        status = self.statuses[task_id]
+        return status is None or status in self.until
+
+    @property
+    def pending(self) -> List[str]:
+        """Tasks still polled: not seen yet, or not in an `until` status"""
+        return [task_id for task_id in self.task_ids if not self._settled(task_id)]
+
+    @property
+    def done(self) -> bool:
+        """Whether every task reached an `until` status (or no longer exists)"""
+        return not self.pending
+
+    def _queries(self) -> Iterator[Tuple[List[str], Query]]:
+        """One list query per chunk of pending task IDs"""
+        # Quoted, comma-separated as in the JSON filter
+        for chunk in chunk_ids(self.pending, max_length=self.MAX_IDS_LENGTH, separator='","'):
+            yield chunk, Query().where_in("id", chunk).fields(*self.fields).limit(len(chunk))
+
+    def _update(self, chunk: List[str], tasks: List[Task]) -> List[TaskStatusChange]:
+        now = time.time()
+        found = {task.id: task for task in tasks}
+        events = []
+        for task_id in chunk:
+            task = found.get(task_id)
+            status = task.status if task else None
+            if task:
+                self.tasks[task_id] = task
+            else:
+                self.tasks.pop(task_id, None)
+            if task_id in self.statuses and self.statuses[task_id] == status:
+                continue
+            events.append(TaskStatusChange(
+                task_id=task_id,
+                previous=self.statuses.get(task_id),
+                status=status,
+                timestamp=now,
+            ))
+            self.statuses[task_id] = status
+        return events
+
+
+class TaskWatcher(_WatchState):
+    """
+    Poll the status of many tasks with one list request per interval
+
+    Every poll sends a single /api/Task query with an `$in` filter over the
+    pending IDs (split only if the IDs would not fit in the URL) and a
+    projection limited to id and status. Changes are reported as
+    TaskStatusChange events through callbacks and iteration; the first poll
+    reports every task with previous=None. Tasks that reached one of the
+    `until` statuses, or no longer exist (status None), stop being polled.
+
+    The interval starts at `interval` seconds and doubles up to
+    `max_interval` while nothing changes.
+
+    Args:
+        client: TapdataClient
+        task_ids: Tasks to watch
+        until: Statuses that end the watch of a task; empty to watch until
+            the timeout or stop event
+        interval: Polling interval right after a change (seconds)
+        max_interval: Longest polling interval while nothing changes (seconds)
+        fields: Task fields fetched besides the id; the latest Task of each
+            watched task is kept in `tasks`
+
+    Examples:
+        >>> watcher = client.tasks.watch(task_ids, until=[Status.RUNNING, Status.ERROR])
+        >>> watcher.on_change(lambda change: print(change.task_id, change.status))
+        >>> statuses = watcher.run(timeout=300)
+        >>>
+        >>> for change in client.tasks.watch(task_ids, until=[Status.STOP]):
+        ...     print(change.task_id, change.previous, "->", change.status)
+    """
+
+    def _dispatch(self, events: List[TaskStatusChange]) -> None:
+        for event in events:
+            for callback in self._callbacks:
+                try:
+                    callback(event)
+                except Exception:
+                    logger.exception(f"Task watcher callback {callback!r} failed")
+
+    def poll(self) -> List[TaskStatusChange]:
+        """
+        Fetch the status of the pending tasks once
+
+        Returns:
+            Status changes since the previous poll
+        """
+        events = []
+        for chunk, query in self._queries():
+            events += self._update(chunk, self.client.tasks.list(query=query))
+        self._dispatch(events)
+        return events
+
+    def watch(
+        self,
+        timeout: Optional[float] = None,
+        stop_event: Optional[threading.Event] = None,
+    ) -> Iterator[TaskStatusChange]:
+        """
+        Poll until every task settles
+
+        Args:
+            timeout: Stop polling after this many seconds
+            stop_event: Stop polling once this event is set
+
+        Yields:
+            TaskStatusChange objects
+        """
+        stop_event = stop_event or threading.Event()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        backoff = Backoff(initial=self.interval, maximum=self.max_interval)
+
+        while not stop_event.is_set():
+            events = self.poll()
+            yield from events
+            if self.done:
+                return
+
+            if events:
+                backoff.reset()
+            delay = backoff.next()
+            if deadline is not None:
+                delay = min(delay, deadline - time.monotonic())
+                if delay <= 0:
+                    return
+            stop_event.wait(delay)
+
+    def __iter__(self) -> Iterator[TaskStatusChange]:
+        return self.watch()
+
+    def run(
+        self,
+        timeout: Optional[float] = None,
+        stop_event: Optional[threading.Event] = None,
+    ) -> Dict[str, Optional[str]]:
+        """
+        Poll until every task settles, reporting changes to the callbacks only
+
+        Args:
+            timeout: Stop polling after this many seconds (check `done`)
+            stop_event: Stop polling once this event is set
+
+        Returns:
+            Last known status of every task (None if it does not exist)
+        """
+        for _ in self.watch(timeout=timeout, stop_event=stop_event):
+            pass
+        return dict(self.statuses)
+
+
+class AsyncTaskWatcher(_WatchState):
+    """
+    Async counterpart of TaskWatcher for AsyncTapdataClient
+
+    Callbacks may be plain functions or coroutine functions.
+
+    Examples:
+        >>> async for change in client.tasks.watch(task_ids, until=[Status.RUNNING]):
+        ...     print(change.task_id, change.status)
+    """
+
+    async def _dispatch(self, events: List[TaskStatusChange]) -> None:
+        for event in events:
+            for callback in self._callbacks:
+                try:
+                    result = callback(event)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception:
+                    logger.exception(f"Task watcher callback {callback!r} failed")
+
+    async def poll(self) -> List[TaskStatusChange]:
+        """Fetch the status of the pending tasks once, see TaskWatcher.poll"""
+        events = []
+        for chunk, query in self._queries():
+            events += self._update(chunk, await self.client.tasks.list(query=query))
+        await self._dispatch(events)
+        return events
+
+    async def watch(
+        self,
+        timeout: Optional[float] = None,
+        stop_event: Optional[asyncio.Event] = None,
+    ) -> AsyncIterator[TaskStatusChange]:
+        """Poll until every task settles, see TaskWatcher.watch"""
+        stop_event = stop_event or asyncio.Event()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        backoff = Backoff(initial=self.interval, maximum=self.max_interval)
+
+        while not stop_event.is_set():
+            events = await self.poll()
+            for event in events:
+                yield event
+            if self.done:
+                return
+
+            if events:
+                backoff.reset()
+            delay = backoff.next()
+            if deadline is not None:
+                delay = min(delay, deadline - time.monotonic())
+                if delay <= 0:
+                    return
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def __aiter__(self) -> AsyncIterator[TaskStatusChange]:
+        return self.watch()
+
+    async def run(
+        self,
+        timeout: Optional[float] = None,
+        stop_event: Optional[asyncio.Event] = None,
+    ) -> Dict[str, Optional[str]]:
+        """Poll until every task settles, see TaskWatcher.run"""
+        async for _ in self.watch(timeout=timeout, stop_event=stop_event):
+            pass
+        return dict(self.statuses)
@@ -1,6 +1,9 @@
 """
 单元测试示例
 """
+import asyncio
+import json
+
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 
@@ -11,8 +14,11 @@ from tapdata_sdk import (
     Status,
     TapdataError,
     TapdataAuthError,
+    TapdataTaskStateError,
+    TapdataTimeoutError,
+    Query,
 )
-from tapdata_sdk.models import Connection, Task
+from tapdata_sdk.models import Connection, Task, TaskDetail
 
 
 class TestTapdataClient:
@@ -95,8 +101,36 @@ class TestTapdataClient:
             access_token="test-token"
         )
         
+        session = client.session
+        
         client.logout()
         assert client.access_token is None
+        assert client.session is session
+    
+    def test_pool_options(self):
+        """测试连接池配置"""
+        client = TapdataClient(
+            "http://localhost:3030",
+            pool_maxsize=64,
+            pool_block=True,
+        )
+        adapter = client.session.get_adapter("http://localhost:3030")
+        assert adapter._pool_maxsize == 64
+        assert adapter._pool_block is True
+    
+    def test_shared_session(self):
+        """测试多个客户端共享连接池"""
+        from tapdata_sdk.transport import create_session
+        
+        session = create_session(pool_maxsize=16)
+        first = TapdataClient("http://localhost:3030", session=session)
+        second = TapdataClient("http://localhost:3030", session=session)
+        
+        assert first.session is second.session
+        
+        with patch.object(session, "close") as mock_close:
+            first.close()
+        mock_close.assert_not_called()
     
     def test_is_authenticated(self):
         """测试认证状态检查"""
@@ -247,6 +281,686 @@ class TestTaskClient:
         assert result["code"] == "ok"
 
 
+class TestBatchOperations:
+    """测试批量任务操作"""
+    
+    @patch('requests.Session.request')
+    def test_stop_many_parses_results(self, mock_request):
+        """测试批量停止并解析每个任务的结果"""
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            "code": "ok",
+            "data": [
+                {"id": "task1", "code": "ok"},
+                {"id": "task2", "code": "Task.StatusError", "message": "invalid status"},
+            ]
+        }
+        mock_request.return_value = mock_response
+        
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token"
+        )
+        
+        results = client.tasks.stop_many(["task1", "task2", "task1"])
+        
+        assert mock_request.call_count == 1
+        params = mock_request.call_args.kwargs["params"]
+        assert params["taskIds"] == "task1,task2"
+        assert [r.task_id for r in results] == ["task1", "task2"]
+        assert results[0].ok
+        assert not results[1].ok
+        assert results[1].message == "invalid status"
+    
+    @patch('requests.Session.request')
+    def test_start_many_chunks_and_isolates_failures(self, mock_request):
+        """测试按批次拆分且单批失败不影响其他批次"""
+        ok_response = Mock()
+        ok_response.json.return_value = {"code": "ok", "data": None}
+        error_response = Mock()
+        error_response.json.return_value = {"code": "SystemError", "message": "boom"}
+        mock_request.side_effect = [ok_response, error_response]
+        
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token"
+        )
+        
+        results = client.tasks.start_many(["a", "b", "c", "d"], max_batch_size=2)
+        
+        assert mock_request.call_count == 2
+        assert [r.ok for r in results] == [True, True, False, False]
+        assert results[2].code == "SystemError"
+    
+    def test_chunk_ids_respects_length(self):
+        """测试按 URL 长度拆分"""
+        from tapdata_sdk.utils import chunk_ids
+        
+        # 逗号编码为 %2C，两个 ID 合计 23 个字符
+        chunks = list(chunk_ids(["a" * 10, "b" * 10, "c" * 10], max_length=23))
+        assert chunks == [["a" * 10, "b" * 10], ["c" * 10]]
+
+
+class TestTableRelations:
+    """测试批量获取表映射关系"""
+    
+    @staticmethod
+    def _respond(method, url, **kwargs):
+        response = Mock()
+        path = url.split("3030", 1)[1]
+        if path.startswith("/api/Task/"):
+            task_id = path.rsplit("/", 1)[1]
+            if task_id == "broken":
+                response.json.return_value = {"code": "Task.NotFound", "message": "missing"}
+                return response
+            response.json.return_value = {"code": "ok", "data": {
+                "id": task_id, "name": task_id, "type": "sync", "status": "running",
+                "dag": {"nodes": [
+                    {"id": "n1", "connectionId": "shared-source"},
+                    {"id": "n2", "connectionId": f"target-{task_id}", "syncObjects": [
+                        {"tableNameRelation": {"t": f"t_{task_id}"}}
+                    ]},
+                ]},
+            }}
+        else:
+            conn_id = path.rsplit("/", 1)[1]
+            response.json.return_value = {"code": "ok", "data": {
+                "id": conn_id, "name": conn_id, "connection_type": "source",
+                "status": "ready", "config": {},
+            }}
+        return response
+    
+    @patch('requests.Session.request')
+    def test_get_table_relations_dedupes_connections(self, mock_request):
+        """测试共享连接只请求一次，失败任务不影响其他任务"""
+        mock_request.side_effect = self._respond
+        
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token"
+        )
+        
+        relations = client.tasks.get_table_relations(
+            ["task1", "broken", "task2"],
+            return_exceptions=True,
+        )
+        
+        assert list(relations) == ["task1", "broken", "task2"]
+        assert isinstance(relations["broken"], TapdataError)
+        assert relations["task1"].source_conn.id == "shared-source"
+        assert relations["task2"].target_conn.id == "target-task2"
+        assert relations["task2"].table_name_relation == {"t": "t_task2"}
+        
+        urls = [call.kwargs["url"] for call in mock_request.call_args_list]
+        assert urls.count("http://localhost:3030/api/Connections/shared-source") == 1
+        
+        relations = client.tasks.get_table_relations(["task1", "broken"])
+        assert list(relations) == ["task1"]
+
+
+class TestTaskDetail:
+    """测试任务详情的惰性解析与字段投影"""
+
+    DETAIL = (
+        b'{"code":"ok","data":{"id":"task1","name":"t1","type":"sync","status":"running",'
+        b'"dag":{"nodes":[{"id":"n1","connectionId":"c1","attrs":{"connectionName":"src"}},'
+        b'{"id":"n2","connectionId":"c2"},'
+        b'{"id":"n3","connectionId":"c3","syncObjects":[{"tableNameRelation":{"a":"b"}}]}]}}}'
+    )
+
+    def test_nodes_are_parsed_on_access(self):
+        """测试节点按需解析"""
+        from tapdata_sdk.models import TaskDetail, TaskRelation
+
+        detail = TaskDetail.from_dict({"id": "task1", "dag": {"nodes": [
+            {"id": "n1", "connectionId": "c1"},
+            {"id": "n2", "connectionId": "c2"},
+            {"id": "n3", "connectionId": "c3", "syncObjects": [{"tableNameRelation": {"a": "b"}}]},
+        ]}})
+
+        assert detail.status is None
+        relation = TaskRelation.from_detail(detail)
+        assert relation.target_connection_id == "c3"
+        assert detail.nodes._nodes[1] is None
+        assert len(detail.nodes) == 3
+        assert detail.nodes[1]["connectionId"] == "c2"
+        assert [node["id"] for node in detail.nodes[::2]] == ["n1", "n3"]
+
+    def test_to_dict_is_json_serializable(self):
+        """测试 to_dict 输出可直接序列化为 JSON"""
+        from tapdata_sdk.models import TaskRelation
+
+        detail = TaskDetail.from_dict(json.loads(self.DETAIL)["data"])
+
+        data = json.loads(json.dumps(detail.to_dict()))
+        assert isinstance(detail.to_dict()["nodes"], list)
+        assert [node["id"] for node in data["nodes"]] == ["n1", "n2", "n3"]
+        assert TaskRelation.from_dict(data).table_name_relation == {"a": "b"}
+
+    def test_codecs_decode_detail(self):
+        """测试各后端解码任务详情"""
+        for codec in TestCodec._codecs():
+            detail = codec.loads_object(self.DETAIL, TaskDetail)["data"]
+            assert isinstance(detail, TaskDetail), codec.name
+            assert detail.status == "running"
+            assert detail.nodes[0]["connectionName"] == "src"
+            assert detail.nodes[-1]["syncObjects"] == [{"tableNameRelation": {"a": "b"}}]
+
+    @patch('requests.Session.request')
+    def test_get_with_fields(self, mock_request):
+        """测试字段投影"""
+        response = Mock()
+        response.json.return_value = {"code": "ok", "data": {"id": "task1", "status": "stop"}}
+        mock_request.return_value = response
+
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token"
+        )
+        detail = client.tasks.get("task1", fields=["status", "task_record_id"])
+
+        assert detail.status == "stop"
+        assert detail.name is None
+        assert list(detail.nodes) == []
+        params = mock_request.call_args.kwargs["params"]
+        assert params["filter"] == '{"fields":{"status":true,"taskRecordId":true,"id":true}}'
+
+
+class TestResponseCache:
+    """测试响应缓存"""
+    
+    @staticmethod
+    def _respond(method, url, **kwargs):
+        response = Mock()
+        item_id = url.rsplit("/", 1)[1]
+        response.json.return_value = {"code": "ok", "data": {
+            "id": item_id, "name": item_id, "type": "sync", "status": "running",
+            "connection_type": "source", "config": {},
+        }}
+        return response
+    
+    @patch('requests.Session.request')
+    def test_connection_get_is_cached(self, mock_request):
+        """测试连接详情命中缓存"""
+        mock_request.side_effect = self._respond
+        
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token",
+            cache=True,
+        )
+        
+        first = client.connections.get("conn1")
+        first.name = "changed"
+        second = client.connections.get("conn1")
+        second.status = "changed"
+        third = client.connections.get("conn1")
+        
+        assert second is not third
+        assert (second.name, third.name, third.status) == ("conn1", "conn1", "running")
+        assert mock_request.call_count == 1
+        stats = client.cache.stats()
+        assert (stats.hits, stats.misses) == (2, 1)
+    
+    @patch('requests.Session.request')
+    def test_task_mutation_invalidates(self, mock_request):
+        """测试任务变更后缓存失效"""
+        from tapdata_sdk.cache import ResponseCache
+        
+        mock_request.side_effect = self._respond
+        
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token",
+            cache=ResponseCache(ttls={"/api/Task/{id}": 60}),
+        )
+        
+        client.tasks.get("task1")
+        client.tasks.get("task2")
+        client.tasks.stop("task1")
+        client.tasks.get("task1")
+        client.tasks.get("task2")
+        
+        urls = [call.kwargs["url"] for call in mock_request.call_args_list]
+        assert urls.count("http://localhost:3030/api/Task/task1") == 2
+        assert urls.count("http://localhost:3030/api/Task/task2") == 1
+    
+    def test_lru_eviction_and_ttl(self):
+        """测试 LRU 淘汰与过期"""
+        from tapdata_sdk.cache import ResponseCache
+        
+        cache = ResponseCache(maxsize=2)
+        cache.set("a", 1, ttl=60)
+        cache.set("b", 2, ttl=60)
+        cache.get("a")
+        cache.set("c", 3, ttl=60)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        
+        with patch("tapdata_sdk.cache.time.monotonic", return_value=10 ** 9):
+            assert cache.get("c") is None
+        
+        stats = cache.stats()
+        assert stats.evictions == 1
+        assert stats.expirations == 1
+
+
+class TestLogTailing:
+    """测试日志跟踪"""
+    
+    @staticmethod
+    def _log(timestamp, message):
+        return {
+            "taskId": "task1", "taskRecordId": "record1", "taskName": "Sync Task",
+            "nodeId": "n1", "level": "INFO", "message": message,
+            "timestamp": timestamp, "date": str(timestamp),
+        }
+    
+    @patch('requests.Session.request')
+    def test_tail_logs_dedupes_boundary(self, mock_request):
+        """测试跨窗口去重并从上次时间戳继续"""
+        pages = [
+            [self._log(100, "a"), self._log(100, "b"), self._log(200, "c")],
+            [],
+            [self._log(200, "c"), self._log(300, "d")],
+        ]
+        bodies = []
+        
+        def respond(method, url, json=None, **kwargs):
+            bodies.append(dict(json))
+            response = Mock()
+            items = pages.pop(0) if pages else []
+            response.json.return_value = {"code": "ok", "data": {"items": items}}
+            return response
+        
+        mock_request.side_effect = respond
+        
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token"
+        )
+        
+        tail = client.tasks.tail_logs("task1", "record1", start=50, page_size=3, min_interval=0)
+        messages = [next(tail).message for _ in range(4)]
+        tail.close()
+        
+        assert messages == ["a", "b", "c", "d"]
+        assert bodies[0]["start"] == 50
+        assert bodies[1]["page"] == 2
+        assert bodies[2]["start"] == 200
+        assert bodies[2]["page"] == 1
+    
+    @patch('requests.Session.request')
+    def test_export_logs_shards_in_order(self, mock_request):
+        """测试按时间分片并按顺序导出 JSON Lines"""
+        import io
+        import json
+        import time
+        
+        def respond(method, url, json=None, **kwargs):
+            # 让靠前的分片返回得更慢，验证输出仍按时间排序
+            time.sleep((10000 - json["start"]) / 1000000)
+            response = Mock()
+            response.json.return_value = {"code": "ok", "data": {"items": [
+                TestLogTailing._log(json["start"], f"{json['start']}-{json['end']}")
+            ]}}
+            return response
+        
+        mock_request.side_effect = respond
+        
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token"
+        )
+        
+        sink = io.StringIO()
+        count = client.tasks.export_logs(
+            "task1", "record1", start=0, end=9999, sink=sink, shard_ms=2500,
+        )
+        
+        lines = [json.loads(line) for line in sink.getvalue().splitlines()]
+        assert count == 4
+        assert [line["message"] for line in lines] == [
+            "0-2499", "2500-4999", "5000-7499", "7500-9999",
+        ]
+        assert lines[0]["timestamp"] == 0
+        
+        # 分片溢写到磁盘临时文件时输出不变
+        client.tasks.EXPORT_SPOOL_SIZE = 1
+        spilled = io.StringIO()
+        client.tasks.export_logs(
+            "task1", "record1", start=0, end=9999, sink=spilled, shard_ms=2500,
+        )
+        assert spilled.getvalue() == sink.getvalue()
+    
+    @patch('requests.Session.request')
+    def test_export_logs_failure_closes_spools(self, mock_request):
+        """测试某个分片失败时已完成分片的临时文件被关闭"""
+        import io
+        import tempfile
+        import time
+        
+        def respond(method, url, json=None, **kwargs):
+            response = Mock()
+            if json["start"] == 0:
+                # 第一个分片最慢且失败，其余分片已先完成
+                time.sleep(0.05)
+                response.json.return_value = {"code": "SystemError", "message": "boom"}
+            else:
+                response.json.return_value = {"code": "ok", "data": {"items": [
+                    TestLogTailing._log(json["start"], "line")
+                ]}}
+            return response
+        
+        mock_request.side_effect = respond
+        spools = []
+        spooled = tempfile.SpooledTemporaryFile
+        
+        def track(*args, **kwargs):
+            spools.append(spooled(*args, **kwargs))
+            return spools[-1]
+        
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token"
+        )
+        
+        with patch("tapdata_sdk.client.tempfile.SpooledTemporaryFile", side_effect=track):
+            with pytest.raises(TapdataError):
+                client.tasks.export_logs(
+                    "task1", "record1", start=0, end=9999,
+                    sink=io.StringIO(), shard_ms=2500, max_workers=4,
+                )
+        
+        assert len(spools) == 4
+        assert all(spool.closed for spool in spools)
+    
+    def test_backoff(self):
+        """测试退避间隔"""
+        from tapdata_sdk.utils import Backoff
+        
+        backoff = Backoff(initial=1, maximum=5)
+        assert [backoff.next() for _ in range(4)] == [1, 2, 4, 5]
+        backoff.reset()
+        assert backoff.next() == 1
+
+
+class TestRetry:
+    """测试重试策略"""
+    
+    @staticmethod
+    def _unavailable(retry_after=None):
+        import requests
+        
+        response = Mock()
+        response.status_code = 503
+        response.headers = {"Retry-After": retry_after} if retry_after else {}
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            "503 Service Unavailable", response=response
+        )
+        return response
+    
+    @staticmethod
+    def _ok():
+        response = Mock()
+        response.json.return_value = {"code": "ok", "data": {
+            "id": "conn1", "name": "conn1", "connection_type": "source",
+            "status": "ready", "config": {},
+        }}
+        return response
+    
+    @patch('tapdata_sdk.client.time.sleep')
+    @patch('requests.Session.request')
+    def test_get_is_retried(self, mock_request, mock_sleep):
+        """测试 GET 在 503 后自动重试并遵循 Retry-After"""
+        mock_request.side_effect = [self._unavailable("2"), self._ok()]
+        
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token"
+        )
+        
+        conn = client.connections.get("conn1")
+        
+        assert conn.id == "conn1"
+        mock_sleep.assert_called_once_with(2.0)
+        stats = client.metrics.snapshot()["GET /api/Connections/{id}"]
+        assert (stats["requests"], stats["errors"], stats["retries"]) == (2, 1, 1)
+    
+    @patch('tapdata_sdk.client.time.sleep')
+    @patch('requests.Session.request')
+    def test_mutation_needs_opt_in(self, mock_request, mock_sleep):
+        """测试非幂等请求默认不重试"""
+        from tapdata_sdk import RetryPolicy, TapdataHTTPError
+        
+        mock_request.side_effect = [self._unavailable(), self._ok()]
+        
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token"
+        )
+        
+        with pytest.raises(TapdataHTTPError) as exc_info:
+            client.tasks.stop("task1")
+        assert exc_info.value.status_code == 503
+        assert mock_request.call_count == 1
+        
+        mock_request.side_effect = [self._unavailable(), self._ok()]
+        client.retry = RetryPolicy(retry_non_idempotent=True, jitter=0)
+        
+        assert client.tasks.stop("task1")["code"] == "ok"
+        mock_sleep.assert_called_once_with(0.5)
+    
+    def test_business_errors_are_not_retried(self):
+        """测试业务错误不重试"""
+        from tapdata_sdk import RetryPolicy
+        
+        policy = RetryPolicy()
+        assert not policy.is_retryable(TapdataAuthError({"code": "UNAUTHORIZED"}))
+        assert policy.allows_method("GET")
+        assert not policy.allows_method("DELETE")
+        assert policy.allows_method("POST", idempotent=True)
+
+
+class TestRequestGovernor:
+    """测试限流与并发控制"""
+    
+    @patch('requests.Session.request')
+    def test_max_in_flight_is_shared(self, mock_request):
+        """测试所有子客户端共享并发上限"""
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from tapdata_sdk.throttle import Limit, RequestGovernor
+        
+        lock = threading.Lock()
+        state = {"current": 0, "peak": 0}
+        
+        def respond(method, url, **kwargs):
+            with lock:
+                state["current"] += 1
+                state["peak"] = max(state["peak"], state["current"])
+            time.sleep(0.01)
+            with lock:
+                state["current"] -= 1
+            return TestRetry._ok()
+        
+        mock_request.side_effect = respond
+        
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token",
+            governor=RequestGovernor(read=Limit(max_in_flight=2)),
+        )
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(client.connections.get, [f"conn{i}" for i in range(16)]))
+        
+        assert mock_request.call_count == 16
+        assert state["peak"] == 2
+    
+    def test_rate_wait_does_not_hold_slot(self):
+        """测试等待令牌时不占用并发槽位"""
+        from tapdata_sdk.throttle import Limit, RequestGovernor
+        
+        governor = RequestGovernor(read=Limit(rate=1000, max_in_flight=1))
+        slots = governor._slots["read"]
+        in_flight = []
+        governor._buckets["read"].acquire = lambda: in_flight.append(slots.in_flight)
+        
+        with governor.slot("GET", "/api/Task"):
+            assert slots.in_flight == 1
+        
+        assert in_flight == [0]
+        assert slots.in_flight == 0
+    
+    def test_token_bucket_reservations(self):
+        """测试令牌桶预约等待时间"""
+        from tapdata_sdk.throttle import TokenBucket
+        
+        with patch("tapdata_sdk.throttle.time.monotonic", return_value=100.0):
+            bucket = TokenBucket(rate=10, burst=2)
+            delays = [bucket.reserve() for _ in range(4)]
+        
+        assert delays[:2] == [0.0, 0.0]
+        assert delays[2] == pytest.approx(0.1)
+        assert delays[3] == pytest.approx(0.2)
+    
+    def test_classify(self):
+        """测试请求分类"""
+        from tapdata_sdk.throttle import RequestGovernor
+        
+        assert RequestGovernor.classify("GET", "/api/Task/{id}") == "read"
+        assert RequestGovernor.classify("PUT", "/api/Task/batchStop") == "mutation"
+        assert RequestGovernor.classify("POST", "/api/MonitoringLogs/query") == "logs"
+
+
+class TestInstrumentation:
+    """测试请求钩子与延迟统计"""
+    
+    @patch('requests.Session.request')
+    def test_hooks_receive_events(self, mock_request):
+        """测试前后钩子收到端点模板与耗时"""
+        mock_request.return_value = TestRetry._ok()
+        
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token"
+        )
+        before, after = [], []
+        client.add_request_hook(before=before.append, after=after.append)
+        client.add_request_hook(after=Mock(side_effect=RuntimeError("broken hook")))
+        
+        client.connections.get("conn1")
+        
+        assert len(before) == len(after) == 1
+        event = after[0]
+        assert event.endpoint == "/api/Connections/{id}"
+        assert event.url == "http://localhost:3030/api/Connections/conn1"
+        assert event.error is None
+        assert {"total", "decode"} <= set(event.timings)
+        
+        snapshot = client.metrics.snapshot()["GET /api/Connections/{id}"]
+        assert snapshot["latency"]["count"] == 1
+    
+    def test_histogram_percentiles(self):
+        """测试直方图分位数估计"""
+        from tapdata_sdk.metrics import LatencyHistogram
+        
+        histogram = LatencyHistogram(buckets=(0.1, 0.2, 0.5))
+        for _ in range(90):
+            histogram.observe(0.05)
+        for _ in range(10):
+            histogram.observe(0.4)
+        
+        assert histogram.percentile(50) <= 0.1
+        assert 0.2 < histogram.percentile(99) <= 0.4
+        assert histogram.cumulative()[-1] == (float("inf"), 100)
+    
+    def test_prometheus_exposition(self):
+        """测试 Prometheus 文本格式输出"""
+        from tapdata_sdk.metrics import ClientMetrics, RequestEvent
+        
+        metrics = ClientMetrics()
+        metrics.observe(RequestEvent(
+            method="GET", endpoint="/api/Task/{id}", url="", timings={"total": 0.02},
+        ))
+        text = metrics.to_prometheus()
+        
+        assert 'tapdata_client_requests_total{method="GET",endpoint="/api/Task/{id}"} 1' in text
+        assert 'tapdata_client_request_duration_seconds_bucket{method="GET",endpoint="/api/Task/{id}",le="+Inf"} 1' in text
+        assert "# TYPE tapdata_client_request_duration_seconds histogram" in text
+
+
+class TestCodec:
+    """测试 JSON 编解码后端"""
+
+    PAGE = (
+        b'{"code":"ok","data":{"total":1,"items":[{"id":"task1","name":"t1",'
+        b'"type":"initial_sync","status":"running","taskRecordId":"r1",'
+        b'"dag":{"nodes":[{"id":"n1"}]}}]}}'
+    )
+
+    @staticmethod
+    def _codecs():
+        from tapdata_sdk.codec import CODECS
+
+        codecs = []
+        for name, codec_class in CODECS.items():
+            try:
+                codecs.append(codec_class())
+            except ImportError:
+                pass
+        return codecs
+
+    def test_loads_page_builds_models(self):
+        """测试各后端将分页结果直接解码为模型"""
+        for codec in self._codecs():
+            data = codec.loads_page(self.PAGE, Task)
+            assert data["data"]["items"] == [
+                Task("task1", "t1", "initial_sync", "running", "r1")
+            ], codec.name
+            assert data["data"]["total"] == 1
+
+            error = codec.loads_page(b'{"code":"SystemError","message":"boom"}', Task)
+            assert error == {"code": "SystemError", "message": "boom"}
+
+            with pytest.raises(ValueError):
+                codec.loads(b"{not json")
+
+    def test_get_codec(self):
+        """测试后端选择"""
+        from tapdata_sdk.codec import JSONCodec, get_codec
+
+        assert get_codec("json").name == "json"
+        assert isinstance(get_codec("auto"), JSONCodec)
+        codec = JSONCodec()
+        assert get_codec(codec) is codec
+        with pytest.raises(ValueError):
+            get_codec("yaml")
+
+    @patch('requests.Session.request')
+    def test_client_decodes_raw_body(self, mock_request):
+        """测试客户端使用编解码器解析响应体"""
+        response = Mock(status_code=200, content=self.PAGE)
+        mock_request.return_value = response
+
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token",
+            codec="json",
+        )
+        tasks = client.tasks.list()
+
+        assert tasks == [Task("task1", "t1", "initial_sync", "running", "r1")]
+        response.json.assert_not_called()
+
+        response.content = b"<html>"
+        with pytest.raises(TapdataError, match="Invalid JSON"):
+            client.tasks.list()
+
+
 class TestModels:
     """测试数据模型"""
     
@@ -283,6 +997,1355 @@ class TestModels:
         assert task.name == "Test Task"
         assert task.task_record_id == "record1"
 
+    def test_slotted_and_frozen_models(self):
+        """测试 __slots__ 模型与不可变变体"""
+        import dataclasses
+        import pickle
+        from tapdata_sdk import FrozenTask, FrozenTaskDetail, SlottedTask
+
+        task = Task("task1", "Test Task", "sync", "running")
+        task.extra = 1  # 基础模型保持普通 dataclass
+
+        slotted = SlottedTask.from_dict(task.to_dict())
+        assert not hasattr(slotted, "__dict__")
+        assert slotted.to_dict() == task.to_dict()
+        slotted.status = "stop"
+        with pytest.raises(AttributeError):
+            slotted.extra = 1
+
+        frozen = FrozenTask.from_dict(task.to_dict())
+        assert not hasattr(frozen, "__dict__")
+        assert frozen.to_dict() == task.to_dict()
+        assert {frozen, FrozenTask(*dataclasses.astuple(task))} == {frozen}
+        assert pickle.loads(pickle.dumps(frozen)) == frozen
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            frozen.status = "stop"
+
+        raw = {"id": "task1", "dag": {"nodes": [{"id": "n1", "connectionId": "c1"}]}}
+        detail = FrozenTaskDetail.from_dict(raw)
+        assert hash(detail) == hash(FrozenTaskDetail.from_dict(raw))
+        assert {detail, FrozenTaskDetail.from_dict(raw)} == {detail}
+        assert detail != FrozenTaskDetail.from_dict({"id": "task1"})
+
+
+class TestTaskLogBatch:
+    """测试列式日志批次"""
+
+    @staticmethod
+    def _logs(count):
+        from tapdata_sdk.models import TaskLog
+
+        return [
+            TaskLog(
+                "task1", "record1", "Test Task", f"node{i % 2}", f"Node {i % 2}",
+                "ERROR" if i % 3 == 0 else "INFO", f"message {i}", 1000 + i,
+                "2026-01-01 00:00:01",
+            )
+            for i in range(count)
+        ]
+
+    def test_roundtrip_and_interning(self):
+        """测试行列转换与字符串去重"""
+        from tapdata_sdk import TaskLogBatch
+
+        logs = self._logs(6)
+        batch = TaskLogBatch.from_logs(logs)
+
+        assert len(batch) == 6
+        assert list(batch) == logs
+        assert batch[4] == logs[4]
+        assert batch.to_rows() == [log.to_dict() for log in logs]
+        assert batch.categories("level") == ["ERROR", "INFO"]
+        assert batch.categories("node_id") == ["node0", "node1"]
+
+        columns = batch.to_columns()
+        assert columns["timestamp"] == [1000, 1001, 1002, 1003, 1004, 1005]
+        assert columns["level"][:2] == ["ERROR", "INFO"]
+
+    def test_slicing(self):
+        """测试切片返回新批次，非整数下标报错"""
+        from tapdata_sdk import TaskLogBatch
+
+        logs = self._logs(6)
+        batch = TaskLogBatch.from_logs(logs)
+
+        tail = batch[-3:]
+        assert isinstance(tail, TaskLogBatch)
+        assert list(tail) == logs[-3:]
+        assert list(batch[::2]) == logs[::2]
+        assert len(batch[10:]) == 0
+        assert batch[-1] == logs[-1]
+        with pytest.raises(TypeError, match="must be integers"):
+            batch["1"]
+
+    def test_from_api_dicts(self):
+        """测试直接由 API 记录构建"""
+        from tapdata_sdk import TaskLogBatch
+
+        batch = TaskLogBatch.from_dicts([{
+            "taskId": "task1", "taskRecordId": "record1", "taskName": "Test Task",
+            "level": "WARN", "message": "slow", "timestamp": 5, "date": "d",
+        }])
+
+        assert batch[0].node_id == ""
+        assert batch.to_columns()["level"] == ["WARN"]
+
+    def test_to_pandas_and_arrow(self):
+        """测试转换为 pandas / pyarrow"""
+        from tapdata_sdk import TaskLogBatch
+
+        pd = pytest.importorskip("pandas")
+        pa = pytest.importorskip("pyarrow")
+        batch = TaskLogBatch.from_logs(self._logs(4))
+
+        df = batch.to_pandas()
+        assert isinstance(df["level"].dtype, pd.CategoricalDtype)
+        assert df["timestamp"].tolist() == [1000, 1001, 1002, 1003]
+
+        table = batch.to_arrow()
+        assert pa.types.is_dictionary(table.schema.field("level").type)
+        assert table.column("message").to_pylist()[-1] == "message 3"
+
+
+class TestPagination:
+    """测试自动分页"""
+    
+    @staticmethod
+    def _page_response(start, count):
+        response = Mock()
+        response.json.return_value = {
+            "code": "ok",
+            "data": {
+                "items": [
+                    {
+                        "id": f"task{i}",
+                        "name": f"Task {i}",
+                        "type": "sync",
+                        "status": "running",
+                    }
+                    for i in range(start, start + count)
+                ]
+            }
+        }
+        return response
+    
+    @patch('requests.Session.request')
+    def test_iter_all_walks_pages(self, mock_request):
+        """测试逐页遍历直到最后一页"""
+        mock_request.side_effect = [
+            self._page_response(0, 2),
+            self._page_response(2, 2),
+            self._page_response(4, 1),
+        ]
+        
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token"
+        )
+        
+        tasks = list(client.tasks.iter_all(page_size=2))
+        
+        assert [task.id for task in tasks] == [f"task{i}" for i in range(5)]
+        assert mock_request.call_count == 3
+    
+    @patch('requests.Session.request')
+    def test_list_all_with_prefetch(self, mock_request):
+        """测试后台预取下一页"""
+        mock_request.side_effect = [
+            self._page_response(0, 2),
+            self._page_response(2, 0),
+        ]
+        
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token"
+        )
+        
+        tasks = client.tasks.list_all(page_size=2, prefetch=True)
+        
+        assert [task.id for task in tasks] == ["task0", "task1"]
+        assert mock_request.call_count == 2
+
+
+class TestQuery:
+    """测试查询构造器"""
+
+    def test_build_filter(self):
+        """测试条件、投影、排序与分页"""
+        base = Query().where(type="initial_sync")
+        query = (
+            base
+            .where_in("status", [Status.RUNNING, Status.ERROR])
+            .gte("last_updated", "2024-01-01")
+            .lt("last_updated", "2024-02-01")
+            .fields("name", "status")
+            .order_by("-last_updated", "name")
+            .skip(10)
+            .limit(50)
+        )
+
+        filter_dict = query.to_filter()
+        assert filter_dict["where"] == {
+            "type": "initial_sync",
+            "status": {"$in": ["running", "error"]},
+            "last_updated": {"$gte": "2024-01-01", "$lt": "2024-02-01"},
+        }
+        assert filter_dict["fields"] == {"name": True, "status": True, "id": True}
+        assert filter_dict["order"] == ["last_updated DESC", "name ASC"]
+        assert filter_dict["skip"] == 10
+        assert filter_dict["limit"] == 50
+        # 查询不可变，基础查询不受影响
+        assert base.to_filter()["where"] == {"type": "initial_sync"}
+
+    def test_page_respects_skip_and_limit(self):
+        """测试分页查询受总数上限约束"""
+        query = Query().skip(5).limit(25)
+
+        assert query.page(0, 10).to_filter()["skip"] == 5
+        assert query.page(20, 10).to_filter()["limit"] == 5
+        assert query.page(25, 10) is None
+
+    def test_page_order_is_stable(self):
+        """测试分页遍历默认按 id 稳定排序"""
+        assert Query().page(0, 10).to_filter()["order"] == "id ASC"
+        assert Query().order_by("-last_updated").page(0, 10).to_filter()["order"] == [
+            "last_updated DESC", "id ASC",
+        ]
+        assert Query().order_by("-id").page(0, 10).to_filter()["order"] == "id DESC"
+
+    @patch('requests.Session.request')
+    def test_list_merges_query(self, mock_request):
+        """测试 list 合并查询条件"""
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            "code": "ok",
+            "data": {"items": [{"id": "task1", "status": "error"}]}
+        }
+        mock_request.return_value = mock_response
+
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token"
+        )
+
+        tasks = client.tasks.list(
+            name="orders",
+            query=Query().ne("status", Status.RUNNING).fields("status"),
+        )
+
+        filter_dict = json.loads(mock_request.call_args[1]["params"]["filter"])
+        assert filter_dict["where"]["name"] == {"like": "orders", "options": "i"}
+        assert filter_dict["where"]["status"] == {"$ne": "running"}
+        assert filter_dict["fields"] == {"status": True, "id": True}
+        # 投影之外的字段为 None
+        assert tasks[0].name is None
+        assert tasks[0].status == "error"
+
+    @patch('requests.Session.request')
+    def test_list_all_stops_at_limit(self, mock_request):
+        """测试 list_all 按查询上限停止翻页"""
+        mock_request.side_effect = [
+            TestPagination._page_response(0, 2),
+            TestPagination._page_response(2, 1),
+        ]
+
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token"
+        )
+
+        tasks = client.tasks.list_all(page_size=2, query=Query().limit(3))
+
+        assert len(tasks) == 3
+        assert mock_request.call_count == 2
+        last_filter = json.loads(mock_request.call_args[1]["params"]["filter"])
+        assert last_filter["skip"] == 2
+        assert last_filter["limit"] == 1
+
+
+class TestTaskWatcher:
+    """测试任务状态监听"""
+
+    @staticmethod
+    def _status_responses(*rounds):
+        """每轮轮询返回一组 {task_id: status}"""
+        responses = []
+        for statuses in rounds:
+            response = Mock()
+            response.json.return_value = {
+                "code": "ok",
+                "data": {
+                    "items": [
+                        {"id": task_id, "status": status}
+                        for task_id, status in statuses.items()
+                    ]
+                }
+            }
+            responses.append(response)
+        return responses
+
+    @patch('requests.Session.request')
+    def test_poll_uses_single_query(self, mock_request):
+        """测试一次请求轮询全部任务并上报状态变化"""
+        mock_request.side_effect = self._status_responses(
+            {"task1": "stopping", "task2": "running"},
+            {"task1": "stop", "task2": "running"},
+        )
+
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token"
+        )
+        watcher = client.tasks.watch(["task1", "task2", "task3"], until=[Status.STOP])
+        seen = []
+        watcher.on_change(seen.append)
+
+        first = watcher.poll()
+        assert mock_request.call_count == 1
+        filter_dict = json.loads(mock_request.call_args[1]["params"]["filter"])
+        assert filter_dict["where"] == {"id": {"$in": ["task1", "task2", "task3"]}}
+        assert filter_dict["fields"] == {"status": True, "id": True}
+        assert [(e.task_id, e.previous, e.status) for e in first] == [
+            ("task1", None, "stopping"),
+            ("task2", None, "running"),
+            ("task3", None, None),
+        ]
+        # 不存在的任务不再轮询
+        assert watcher.pending == ["task1", "task2"]
+
+        second = watcher.poll()
+        assert [(e.task_id, e.previous, e.status) for e in second] == [
+            ("task1", "stopping", "stop"),
+        ]
+        assert seen == first + second
+        assert watcher.pending == ["task2"]
+
+    @patch('requests.Session.request')
+    def test_iterate_until_settled(self, mock_request):
+        """测试迭代直到全部任务到达目标状态"""
+        mock_request.side_effect = self._status_responses(
+            {"task1": "wait_start", "task2": "wait_start"},
+            {"task1": "running", "task2": "wait_run"},
+            {"task2": "error"},
+        )
+
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token"
+        )
+        watcher = client.tasks.watch(
+            ["task1", "task2"],
+            until=[Status.RUNNING, Status.ERROR],
+            interval=0.001,
+        )
+
+        changes = [(e.task_id, e.status) for e in watcher]
+
+        assert changes[-2:] == [("task2", "wait_run"), ("task2", "error")]
+        assert watcher.done
+        assert watcher.statuses == {"task1": "running", "task2": "error"}
+        assert mock_request.call_count == 3
+        last_filter = json.loads(mock_request.call_args[1]["params"]["filter"])
+        assert last_filter["where"]["id"] == {"$in": ["task2"]}
+
+
+class TestWaitForOperation:
+    """测试 start/stop/reset 等待任务状态稳定"""
+
+    @staticmethod
+    def _client():
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token"
+        )
+        client.tasks.WAIT_INTERVAL = 0.001
+        client.tasks.WAIT_MAX_INTERVAL = 0.001
+        return client
+
+    @staticmethod
+    def _responses(before, *statuses):
+        """操作前状态、操作响应，以及之后每次轮询的状态"""
+        operation = Mock()
+        operation.json.return_value = {"code": "ok", "data": [{"id": "task1", "code": "ok"}]}
+        before, *polls = TestTaskWatcher._status_responses(
+            {"task1": before}, *({"task1": status} for status in statuses)
+        )
+        return [before, operation] + polls
+
+    @patch('requests.Session.request')
+    def test_start_wait_returns_task(self, mock_request):
+        """测试等待启动完成并返回最终任务"""
+        mock_request.side_effect = self._responses("stop", "wait_start", "running")
+
+        task = self._client().tasks.start("task1", wait=True)
+
+        assert isinstance(task, Task)
+        assert task.status == "running"
+        assert mock_request.call_count == 4
+
+    @patch('requests.Session.request')
+    def test_reset_wait_detects_failure(self, mock_request):
+        """测试重置失败状态抛出异常"""
+        mock_request.side_effect = self._responses("stop", "renewing", "renew_failed")
+
+        with pytest.raises(TapdataTaskStateError) as exc_info:
+            self._client().tasks.reset("task1", wait=True)
+
+        assert exc_info.value.task_id == "task1"
+        assert exc_info.value.status == "renew_failed"
+
+    @patch('requests.Session.request')
+    def test_restart_ignores_stale_error(self, mock_request):
+        """测试重启出错任务时忽略操作前的 error 状态"""
+        mock_request.side_effect = self._responses("error", "error", "wait_run", "running")
+
+        task = self._client().tasks.start("task1", wait=True)
+
+        assert task.status == "running"
+
+    @patch('requests.Session.request')
+    def test_start_from_complete_waits_for_run(self, mock_request):
+        """测试启动已完成任务时不会把操作前的 complete 状态当作成功"""
+        mock_request.side_effect = self._responses("complete", "complete", "wait_run", "complete")
+
+        task = self._client().tasks.start("task1", wait=True)
+
+        assert task.status == "complete"
+        assert mock_request.call_count == 5
+
+    @patch('requests.Session.request')
+    def test_reset_from_edit_waits_for_change(self, mock_request):
+        """测试重置 edit 状态的任务时等待经过 renewing"""
+        mock_request.side_effect = self._responses("edit", "edit", "renewing", "edit")
+
+        task = self._client().tasks.reset("task1", wait=True)
+
+        assert task.status == "edit"
+        assert mock_request.call_count == 5
+
+    @patch('requests.Session.request')
+    def test_already_settled_returns_at_once(self, mock_request):
+        """测试停止已停止的任务、启动运行中的任务时无需轮询立即返回"""
+        mock_request.side_effect = self._responses("stop")
+        task = self._client().tasks.stop("task1", wait=True)
+        assert task.status == "stop"
+        assert mock_request.call_count == 2
+
+        mock_request.reset_mock()
+        mock_request.side_effect = self._responses("running")
+        task = self._client().tasks.start("task1", wait=True)
+        assert task.status == "running"
+        assert mock_request.call_count == 2
+
+    @patch('requests.Session.request')
+    def test_rejected_operation_raises(self, mock_request):
+        """测试服务端拒绝操作时立即抛出异常而不是等到超时"""
+        responses = self._responses("stop")
+        responses[1].json.return_value = {"code": "ok", "data": [
+            {"id": "task1", "code": "Task.StartCheckFailed", "message": "source offline"}
+        ]}
+        mock_request.side_effect = responses
+
+        with pytest.raises(TapdataError) as exc_info:
+            self._client().tasks.start("task1", wait=True)
+
+        assert exc_info.value.code == "Task.StartCheckFailed"
+        assert "source offline" in exc_info.value.message
+        assert mock_request.call_count == 2
+
+    @patch('requests.Session.request')
+    def test_wait_timeout(self, mock_request):
+        """测试等待超时"""
+        responses = self._responses("running", "stopping")
+        mock_request.side_effect = lambda *args, **kwargs: (
+            responses.pop(0) if responses
+            else TestTaskWatcher._status_responses({"task1": "stopping"})[0]
+        )
+
+        with pytest.raises(TapdataTimeoutError):
+            self._client().tasks.stop("task1", wait=True, timeout=0.05)
+
+
+class TestSnapshotStore:
+    """测试本地元数据快照"""
+
+    @staticmethod
+    def _page(*items):
+        response = Mock()
+        response.json.return_value = {"code": "ok", "data": {"items": list(items)}}
+        return response
+
+    @staticmethod
+    def _connection(conn_id, last_updated, status="ready"):
+        return {
+            "id": conn_id,
+            "name": f"MySQL {conn_id}",
+            "connection_type": "source",
+            "database_type": "Mysql",
+            "status": status,
+            "last_updated": last_updated,
+            "config": {"host": "db.local", "port": 3306, "password": "secret"},
+        }
+
+    @staticmethod
+    def _task(task_id, last_updated, status="running"):
+        return {
+            "id": task_id,
+            "name": f"Task {task_id}",
+            "type": "initial_sync",
+            "status": status,
+            "taskRecordId": f"record-{task_id}",
+            "last_updated": last_updated,
+        }
+
+    @patch('requests.Session.request')
+    def test_incremental_refresh(self, mock_request, tmp_path):
+        """测试按 last_updated 水位增量刷新"""
+        from tapdata_sdk.snapshot import SnapshotStore
+
+        mock_request.side_effect = [
+            self._page(self._connection("conn2", 200), self._connection("conn1", 100)),
+            self._page(self._task("task2", 20), self._task("task1", 10)),
+            self._page(self._connection("conn2", 200)),
+            self._page(self._task("task1", 30, status="error"), self._task("task2", 20)),
+        ]
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token"
+        )
+        path = str(tmp_path / "snapshot.db")
+
+        with SnapshotStore(path) as store:
+            stats = store.refresh(client)
+            assert (stats.connections, stats.tasks, stats.full) == (2, 2, True)
+            assert store.watermark("connections") == 200
+            assert store.watermark("tasks") == 20
+
+            stats = store.refresh(client)
+            assert (stats.connections, stats.tasks, stats.full) == (1, 2, False)
+            assert store.watermark("tasks") == 30
+            task_filter = json.loads(mock_request.call_args[1]["params"]["filter"])
+            assert task_filter["where"]["last_updated"] == {"$gte": 20}
+            assert task_filter["order"] == ["last_updated DESC", "id ASC"]
+
+        # 离线读取，无需请求
+        with SnapshotStore(path) as store:
+            assert [task.id for task in store.tasks(status=Status.ERROR)] == ["task1"]
+            assert store.task("task2").task_record_id == "record-task2"
+            connection = store.connection("conn1")
+            assert connection.endpoint == "db.local"
+            assert "secret" not in json.dumps(connection.to_dict())
+            assert len(store.connections(database_type=DatabaseType.MYSQL, name="mysql")) == 2
+        assert mock_request.call_count == 4
+
+    @patch('requests.Session.request')
+    def test_full_refresh_drops_deleted(self, mock_request):
+        """测试全量刷新删除已不存在的记录"""
+        from tapdata_sdk.snapshot import SnapshotStore
+
+        mock_request.side_effect = [
+            self._page(self._connection("conn1", 100)),
+            self._page(self._task("task2", 20), self._task("task1", 10)),
+            self._page(self._connection("conn1", 100)),
+            self._page(self._task("task2", 20)),
+            self._page(),
+        ]
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token"
+        )
+
+        store = SnapshotStore()
+        store.refresh(client)
+        stats = store.refresh(client, full=True)
+
+        assert stats.deleted == 1
+        assert store.task("task1") is None
+        assert [task.id for task in store.tasks()] == ["task2"]
+        lookup = json.loads(mock_request.call_args[1]["params"]["filter"])
+        assert lookup["where"]["id"] == {"$in": ["task1"]}
+
+    @patch('requests.Session.request')
+    def test_full_refresh_keeps_records_skipped_by_the_walk(self, mock_request):
+        """测试全量刷新时翻页错位漏掉的记录经确认仍存在则保留"""
+        from tapdata_sdk.snapshot import SnapshotStore
+
+        mock_request.side_effect = [
+            self._page(self._connection("conn1", 100)),
+            self._page(self._task("task2", 20), self._task("task1", 10)),
+            self._page(self._connection("conn1", 100)),
+            # task1 被翻页错位跳过，但按 ID 查询仍存在
+            self._page(self._task("task2", 20)),
+            self._page(self._task("task1", 10, status="error")),
+        ]
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token"
+        )
+
+        store = SnapshotStore()
+        store.refresh(client)
+        stats = store.refresh(client, full=True)
+
+        assert stats.deleted == 0
+        assert stats.tasks == 2
+        assert store.task("task1").status == "error"
+        assert store.task("task1").last_updated == 10
+        assert "last_updated" not in store.task("task1").to_dict()
+
+
+class TestTokenStore:
+    """测试 token 持久化与自动重新登录"""
+
+    @staticmethod
+    def _login_responses(token, ttl=1209600):
+        timestamp = Mock()
+        timestamp.json.return_value = {"code": "ok", "data": 1234567890}
+        login = Mock()
+        login.json.return_value = {"code": "ok", "data": {"id": token, "ttl": ttl}}
+        return [timestamp, login]
+
+    @staticmethod
+    def _tasks_response():
+        response = Mock()
+        response.json.return_value = {"code": "ok", "data": {"items": []}}
+        return response
+
+    @patch('requests.Session.request')
+    def test_reuse_stored_token(self, mock_request, tmp_path):
+        """测试跨客户端复用未过期的 token"""
+        from tapdata_sdk import FileTokenStore
+
+        mock_request.side_effect = self._login_responses("token-1")
+        store = FileTokenStore(str(tmp_path / "tokens.json"))
+
+        first = TapdataClient("http://localhost:3030", token_store=store)
+        assert first.login("admin@test.com", "password") == "token-1"
+        assert mock_request.call_count == 2
+
+        second = TapdataClient("http://localhost:3030", token_store=store)
+        with patch("tapdata_sdk.client.rc4_encrypt") as encrypt:
+            assert second.login("admin@test.com", "password") == "token-1"
+        # 不再发起登录请求，也不加密密码
+        assert mock_request.call_count == 2
+        encrypt.assert_not_called()
+
+    def test_incomplete_store_fails_at_construction(self):
+        """测试未实现全部方法的存储在构造时报错"""
+        from tapdata_sdk import TokenStore
+
+        class LoadOnlyStore(TokenStore):
+            def load(self, key):
+                return None
+
+        with pytest.raises(TypeError):
+            LoadOnlyStore()
+
+    @patch('requests.Session.request')
+    def test_expired_token_logs_in(self, mock_request):
+        """测试过期 token 触发重新登录"""
+        from tapdata_sdk import MemoryTokenStore, StoredToken
+        from tapdata_sdk.auth import token_key
+
+        mock_request.side_effect = self._login_responses("token-2")
+        store = MemoryTokenStore()
+        store.save(
+            token_key("http://localhost:3030", "admin@test.com"),
+            StoredToken("token-1", expires_at=1.0),
+        )
+
+        client = TapdataClient("http://localhost:3030", token_store=store)
+
+        assert client.login("admin@test.com", "password") == "token-2"
+        assert mock_request.call_count == 2
+
+    @patch('requests.Session.request')
+    def test_relogin_and_replay(self, mock_request):
+        """测试 token 失效后自动重新登录并重放请求"""
+        rejected = Mock()
+        rejected.json.return_value = {"code": "UNAUTHORIZED", "message": "token expired"}
+        mock_request.side_effect = (
+            self._login_responses("token-1")
+            + [rejected]
+            + self._login_responses("token-2")
+            + [self._tasks_response()]
+        )
+
+        client = TapdataClient("http://localhost:3030")
+        client.login("admin@test.com", "password")
+
+        assert client.tasks.list() == []
+        assert client.access_token == "token-2"
+        assert mock_request.call_count == 6
+        assert mock_request.call_args[1]["params"]["access_token"] == "token-2"
+
+    @patch('requests.Session.request')
+    def test_no_relogin_without_login(self, mock_request):
+        """测试未调用 login 时不自动重新登录"""
+        rejected = Mock()
+        rejected.json.return_value = {"code": "UNAUTHORIZED", "message": "token expired"}
+        mock_request.return_value = rejected
+
+        client = TapdataClient("http://localhost:3030", access_token="test-token")
+
+        with pytest.raises(TapdataAuthError):
+            client.tasks.list()
+        assert mock_request.call_count == 1
+
+
+class TestThreadSafety:
+    """测试多线程共享客户端"""
+
+    def test_shared_registry(self):
+        """测试 shared() 按 base_url 返回同一客户端"""
+        try:
+            first = TapdataClient.shared("http://localhost:3030/", timeout=5)
+            second = TapdataClient.shared("http://localhost:3030")
+            other = TapdataClient.shared("http://localhost:4040")
+
+            assert first is second
+            assert first.timeout == 5
+            assert other is not first
+        finally:
+            TapdataClient.close_shared()
+        assert TapdataClient.shared("http://localhost:3030") is not first
+        TapdataClient.close_shared()
+
+    @patch('requests.Session.request')
+    def test_concurrent_relogin_once(self, mock_request):
+        """测试多个线程同时遇到 token 失效时只重新登录一次"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        logins = []
+
+        def respond(method, url, params=None, **kwargs):
+            response = Mock()
+            if url.endswith("/api/timeStamp"):
+                response.json.return_value = {"code": "ok", "data": 1234567890}
+            elif url.endswith("/api/users/login"):
+                logins.append(url)
+                response.json.return_value = {"code": "ok", "data": {"id": f"token-{len(logins)}"}}
+            elif params.get("access_token") == "token-1":
+                response.json.return_value = {"code": "UNAUTHORIZED", "message": "expired"}
+            else:
+                response.json.return_value = {"code": "ok", "data": {"items": []}}
+            return response
+
+        mock_request.side_effect = respond
+        client = TapdataClient("http://localhost:3030")
+        client.login("admin@test.com", "password")
+        params = {"filter": {"limit": 1}}
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(
+                lambda _: client._request("GET", "/api/Task", params=params),
+                range(16),
+            ))
+
+        assert all(result["code"] == "ok" for result in results)
+        # 初次登录 + 一次重新登录
+        assert len(logins) == 2
+        assert client.access_token == "token-2"
+        # 调用方的参数不被修改
+        assert params == {"filter": {"limit": 1}}
+
+
+class TestRequestCoalescing:
+    """测试相同并发请求合并"""
+
+    @patch('requests.Session.request')
+    def test_concurrent_gets_share_one_request(self, mock_request):
+        """测试并发获取同一连接只发送一次请求"""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        release = threading.Event()
+
+        def respond(method, url, **kwargs):
+            release.wait(5)
+            response = Mock()
+            response.json.return_value = {
+                "code": "ok",
+                "data": {"id": "conn-1", "name": "mysql", "connection_type": "source"},
+            }
+            return response
+
+        mock_request.side_effect = respond
+        client = TapdataClient("http://localhost:3030", access_token="token")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(client.connections.get, "conn-1") for _ in range(8)]
+            while len(client.coalescer) == 0:
+                pass
+            release.set()
+            results = [future.result() for future in futures]
+
+        assert all(result.name == "mysql" for result in results)
+        results[0].name = "changed"
+        assert [result.name for result in results[1:]] == ["mysql"] * 7
+        stats = client.metrics.snapshot()["GET /api/Connections/{id}"]
+        assert mock_request.call_count == stats["requests"]
+        assert stats["requests"] + stats["coalesced"] == 8
+        assert len(client.coalescer) == 0
+
+    def test_errors_reach_every_waiter(self):
+        """测试进行中请求的异常传给所有等待者"""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        from tapdata_sdk.coalesce import RequestCoalescer
+
+        coalescer = RequestCoalescer()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def fail():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            raise TapdataError({"message": "boom"})
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            leader = executor.submit(coalescer.do, "key", fail)
+            started.wait(5)
+            waiters = [executor.submit(coalescer.do, "key", fail) for _ in range(3)]
+            release.set()
+            for future in [leader] + waiters:
+                with pytest.raises(TapdataError, match="boom"):
+                    future.result()
+
+        assert len(calls) <= 4
+        assert coalescer.do("key", lambda: "fresh") == ("fresh", False)
+
+    @patch('requests.Session.request')
+    def test_coalesce_disabled(self, mock_request):
+        """测试关闭合并和非 GET 请求"""
+        mock_request.return_value.json.return_value = {"code": "ok", "data": {}}
+
+        client = TapdataClient("http://localhost:3030", coalesce=False)
+        assert client.coalescer is None
+        client._request("GET", "/api/Task")
+
+        client = TapdataClient("http://localhost:3030")
+        client._request("POST", "/api/Task/batchStart", json={})
+        assert mock_request.call_count == 2
+        assert len(client.coalescer) == 0
+
+    def test_async_coalescer(self):
+        """测试异步合并及调用方取消"""
+        from tapdata_sdk.coalesce import AsyncRequestCoalescer
+
+        async def scenario():
+            coalescer = AsyncRequestCoalescer()
+            calls = []
+
+            async def fetch():
+                calls.append(1)
+                await asyncio.sleep(0.05)
+                return {"code": "ok"}
+
+            first = asyncio.ensure_future(coalescer.do("key", fetch))
+            second = asyncio.ensure_future(coalescer.do("key", fetch))
+            third = asyncio.ensure_future(coalescer.do("key", fetch))
+            await asyncio.sleep(0)
+            first.cancel()
+            results = await asyncio.gather(second, third)
+            assert first.cancelled()
+            assert results == [({"code": "ok"}, True), ({"code": "ok"}, True)]
+            assert results[0][0] is not results[1][0]
+            assert len(calls) == 1
+            assert len(coalescer) == 0
+
+        asyncio.run(scenario())
+
+
+class TestStreaming:
+    """测试分页响应流式解析"""
+
+    PAGE = {
+        "code": "ok",
+        "data": {
+            "items": [
+                {"id": f"task{i}", "name": f"Task {i}", "type": "sync", "status": "running",
+                 "dag": {"nodes": [{"id": "n1", "name": "节点 😀"}]}}
+                for i in range(50)
+            ],
+            "total": 50,
+        },
+    }
+
+    @staticmethod
+    def _chunks(raw: bytes, size: int):
+        return [raw[i:i + size] for i in range(0, len(raw), size)]
+
+    def test_parser_any_chunking(self):
+        """测试任意分块方式下解析结果一致"""
+        from tapdata_sdk.stream import JSONItemParser
+
+        raw = json.dumps(self.PAGE, ensure_ascii=False, indent=1).encode()
+        for size in (1, 3, 17, 4096, len(raw)):
+            parser = JSONItemParser()
+            items = []
+            for chunk in self._chunks(raw, size):
+                items += parser.feed(chunk)
+            items += parser.close()
+            assert items == self.PAGE["data"]["items"]
+            assert parser.envelope == {"code": "ok", "total": 50}
+
+        # 数字在 "e"、"." 或符号之后被切断
+        raw = b'{"code":"ok","data":{"items":[1e3,-2.5E-4,12.75,7],"total":4}}'
+        for split in range(1, len(raw)):
+            parser = JSONItemParser()
+            items = parser.feed(raw[:split]) + parser.feed(raw[split:]) + parser.close()
+            assert items == [1e3, -2.5E-4, 12.75, 7], split
+            assert parser.envelope == {"code": "ok", "total": 4}
+
+    def test_parser_is_abstract(self):
+        """测试解析器基类不能直接实例化"""
+        from tapdata_sdk.stream import ItemParser
+
+        with pytest.raises(TypeError):
+            ItemParser()
+
+    def test_parser_rejects_truncated_body(self):
+        """测试截断的响应体"""
+        from tapdata_sdk.stream import JSONItemParser
+
+        parser = JSONItemParser()
+        parser.feed(json.dumps(self.PAGE).encode()[:-10])
+        with pytest.raises(ValueError):
+            parser.close()
+
+    @patch('requests.Session.request')
+    def test_stream_tasks(self, mock_request):
+        """测试逐条返回任务"""
+        raw = json.dumps(self.PAGE).encode()
+        mock_request.return_value.iter_content.return_value = self._chunks(raw, 100)
+
+        client = TapdataClient("http://localhost:3030", access_token="test-token")
+        tasks = client.tasks.stream(limit=50)
+        # 开始迭代后才发送请求
+        assert mock_request.call_count == 0
+
+        first = next(tasks)
+        assert isinstance(first, Task)
+        assert first.id == "task0"
+        assert [task.id for task in tasks] == [f"task{i}" for i in range(1, 50)]
+        assert mock_request.call_args.kwargs["stream"] is True
+        assert mock_request.return_value.close.called
+        stats = client.metrics.snapshot()["GET /api/Task"]
+        assert stats["requests"] == 1
+        assert stats["bytes_received"] == len(raw)
+
+    @patch('requests.Session.request')
+    def test_stream_error_and_relogin(self, mock_request):
+        """测试流式请求的业务错误和重新登录"""
+        def respond(method, url, params=None, **kwargs):
+            response = Mock()
+            if url.endswith("/api/timeStamp"):
+                response.json.return_value = {"code": "ok", "data": 1234567890}
+            elif url.endswith("/api/users/login"):
+                response.json.return_value = {"code": "ok", "data": {"id": "token-2"}}
+            elif params["access_token"] == "token-1":
+                response.iter_content.return_value = [b'{"code": "UNAUTHORIZED", "message": "expired"}']
+            else:
+                response.iter_content.return_value = [json.dumps(self.PAGE).encode()]
+            return response
+
+        mock_request.side_effect = respond
+        client = TapdataClient("http://localhost:3030", access_token="token-1")
+        with pytest.raises(TapdataAuthError):
+            list(client.tasks.stream())
+
+        client._credentials = ("admin@test.com", "pwd", "secret")
+        tasks = list(client.tasks.stream(limit=50))
+        assert len(tasks) == 50
+        assert client.access_token == "token-2"
+
+
+    @patch('requests.Session.request')
+    def test_nested_request_does_not_deadlock(self, mock_request):
+        """测试流式循环内的请求不会因并发上限为 1 而死锁"""
+        import threading
+        from tapdata_sdk.throttle import Limit, RequestGovernor
+
+        def respond(method, url, **kwargs):
+            response = Mock()
+            if kwargs.get("stream"):
+                response.iter_content.return_value = [json.dumps(self.PAGE).encode()]
+            else:
+                task_id = url.rsplit("/", 1)[-1]
+                response.json.return_value = {"code": "ok", "data": {
+                    "id": task_id, "name": task_id, "type": "sync", "status": "running",
+                }}
+            return response
+
+        mock_request.side_effect = respond
+        client = TapdataClient(
+            "http://localhost:3030",
+            access_token="test-token",
+            governor=RequestGovernor(read=Limit(max_in_flight=1)),
+        )
+        details = []
+
+        def consume():
+            for task in client.tasks.stream(limit=5):
+                details.append(client.tasks.get(task.id))
+
+        worker = threading.Thread(target=consume, daemon=True)
+        worker.start()
+        worker.join(timeout=5)
+
+        assert not worker.is_alive()
+        assert len(details) == 50
+        assert client.governor._slots["read"].in_flight == 0
+
+
+class TestCompression:
+    """测试响应压缩协商与解压"""
+
+    def test_accept_encoding(self):
+        """测试 Accept-Encoding 协商"""
+        from tapdata_sdk.compression import accept_encoding
+
+        supported = ["br", "gzip", "deflate"]
+        assert accept_encoding("auto", supported) == "br, gzip, deflate"
+        assert accept_encoding(None, supported) == "identity"
+        assert accept_encoding(["gzip", "br"], supported) == "gzip, br"
+        with pytest.raises(ValueError):
+            accept_encoding("zstd", supported)
+
+    def test_streaming_decompression(self):
+        """测试分块解压 gzip 和 deflate"""
+        import gzip
+        import zlib
+        from tapdata_sdk.compression import Decompressor, decompressor
+
+        body = json.dumps({"code": "ok", "data": {"items": ["x" * 100] * 100}}).encode()
+        raw_deflate = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        encoded = {
+            "gzip": gzip.compress(body),
+            "deflate": zlib.compress(body),
+            "DEFLATE": raw_deflate.compress(body) + raw_deflate.flush(),
+        }
+        for encoding, data in encoded.items():
+            decoder = decompressor(encoding)
+            parts = [decoder.decompress(data[i:i + 7]) for i in range(0, len(data), 7)]
+            assert b"".join(parts) + decoder.flush() == body
+
+        assert decompressor(None) is None
+        with pytest.raises(TypeError):
+            Decompressor()
+        with pytest.raises(ValueError):
+            decompressor("gzip").decompress(b"not gzip")
+        with pytest.raises(ValueError):
+            decompressor("compress")
+
+    @patch('requests.Session.request')
+    def test_sync_headers_and_metrics(self, mock_request):
+        """测试同步客户端的请求头和压缩字节统计"""
+        response = mock_request.return_value
+        response.json.return_value = {"code": "ok", "data": {"items": []}}
+        response.headers = {"Content-Encoding": "gzip"}
+        response.raw.tell.return_value = 120
+
+        client = TapdataClient("http://localhost:3030", access_token="test-token")
+        events = []
+        client.add_request_hook(after=events.append)
+        client._request("GET", "/api/Task")
+        assert mock_request.call_args.kwargs["headers"]["Accept-Encoding"] == "gzip, deflate"
+        assert events[0].content_encoding == "gzip"
+        assert client.metrics.snapshot()["GET /api/Task"]["bytes_received_wire"] == 120
+
+        client = TapdataClient("http://localhost:3030", compression=None)
+        client._request("GET", "/api/Task", headers={"X-Trace": "1"})
+        headers = mock_request.call_args.kwargs["headers"]
+        assert headers == {"Accept-Encoding": "identity", "X-Trace": "1"}
+
+    def test_async_gzip_response(self):
+        """测试异步客户端解压 gzip 响应并统计字节数"""
+        import gzip
+        from aiohttp import web
+        from tapdata_sdk import AsyncTapdataClient
+
+        page = {"code": "ok", "data": {"items": [
+            {"id": f"task{i}", "name": "Sync Task", "type": "sync", "status": "running"}
+            for i in range(200)
+        ]}}
+        body = json.dumps(page).encode()
+
+        async def list_tasks(request):
+            assert "gzip" in request.headers["Accept-Encoding"]
+            return web.Response(
+                body=gzip.compress(body),
+                headers={"Content-Encoding": "gzip", "Content-Type": "application/json"},
+            )
+
+        async def scenario(url):
+            async with AsyncTapdataClient(url, access_token="test-token") as client:
+                tasks = await client.tasks.list(limit=200)
+                streamed = [task async for task in client.tasks.stream(limit=200)]
+                return tasks, streamed, client.metrics.snapshot()["GET /api/Task"]
+
+        tasks, streamed, stats = _run_with_server([("GET", "/api/Task", list_tasks)], scenario)
+        assert len(tasks) == len(streamed) == 200
+        assert stats["bytes_received"] == 2 * len(body)
+        assert stats["bytes_received_wire"] == 2 * len(gzip.compress(body))
+
+
+class TestInventoryReport:
+    """测试任务清单报表"""
+
+    @staticmethod
+    def _respond(method, url, **kwargs):
+        response = Mock()
+        response.headers = {}
+        path = url.split("3030", 1)[1]
+        if path == "/api/Task":
+            response.json.return_value = {"code": "ok", "data": {"items": [
+                {"id": "task1", "name": "orders", "type": "initial_sync+cdc", "status": "running"},
+                {"id": "task2", "name": "users", "type": "initial_sync", "status": "error",
+                 "taskRecordId": "rec2"},
+                {"id": "broken", "name": "legacy", "type": "initial_sync", "status": "error",
+                 "taskRecordId": "rec3"},
+            ]}}
+        elif path == "/api/MonitoringLogs/query":
+            body = kwargs["json"]
+            assert body["order"] == "desc" and body["levels"] == ["ERROR"]
+            response.json.return_value = {"code": "ok", "data": {"items": [
+                {"taskId": body["taskId"], "taskRecordId": body["taskRecordId"],
+                 "taskName": "users", "level": "ERROR", "message": f"failure {n}",
+                 "timestamp": n, "date": "2024-01-01 00:00:00"}
+                for n in range(3, 3 - body["pageSize"], -1)
+            ]}}
+        elif path.startswith("/api/Task/"):
+            return TestTableRelations._respond(method, url, **kwargs)
+        else:
+            conn_id = path.rsplit("/", 1)[1]
+            response.json.return_value = {"code": "ok", "data": {
+                "id": conn_id, "name": conn_id, "connection_type": "source",
+                "database_type": "Mysql", "status": "ready",
+                "config": {"host": "db.local", "port": 3306},
+            }}
+        return response
+
+    @patch('requests.Session.request')
+    def test_inventory(self, mock_request):
+        """测试按状态和类型汇总、关联连接与最近错误日志"""
+        mock_request.side_effect = self._respond
+        client = TapdataClient("http://localhost:3030", access_token="test-token")
+
+        inventory = client.reports.inventory(error_log_lines=2)
+
+        assert inventory.by_status == {"running": 1, "error": 2}
+        assert inventory.summary() == {
+            "running": {"initial_sync+cdc": 1},
+            "error": {"initial_sync": 2},
+        }
+        task1, task2, broken = inventory.tasks
+        assert task1.relation.source_conn.id == "shared-source"
+        assert task1.error_logs == []
+        assert [entry.task.id for entry in inventory.error_tasks] == ["task2", "broken"]
+        assert [log.message for log in task2.error_logs] == ["failure 2", "failure 3"]
+        assert broken.relation is None and broken.problems == ["relation: missing"]
+
+        params = mock_request.call_args_list[0].kwargs["params"]
+        assert json.loads(params["filter"])["fields"]["taskRecordId"] is True
+        urls = [call.kwargs["url"] for call in mock_request.call_args_list]
+        assert urls.count("http://localhost:3030/api/Connections/shared-source") == 1
+
+    @patch('requests.Session.request')
+    def test_inventory_export(self, mock_request):
+        """测试导出 JSON 和 CSV"""
+        import csv
+        import io
+        from tapdata_sdk.reports import CSV_COLUMNS
+
+        mock_request.side_effect = self._respond
+        client = TapdataClient("http://localhost:3030", access_token="test-token")
+        inventory = client.reports.inventory(relations=False, error_log_lines=1)
+
+        data = json.loads(inventory.to_json())
+        assert data["total"] == 3
+        assert data["tasks"][1]["error_logs"][0]["message"] == "failure 3"
+
+        out = io.StringIO()
+        assert inventory.to_csv(out) == 3
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        assert tuple(rows[0]) == CSV_COLUMNS
+        assert rows[1]["last_error"] == "failure 3"
+        assert rows[1]["source_name"] == ""
+
+        with_relations = client.reports.inventory(error_log_lines=0)
+        row = with_relations.tasks[0].to_row()
+        assert row["source_endpoint"] == "db.local:3306"
+        assert row["tables"] == 1
+
+
+def _run_with_server(handlers, scenario):
+    """在本地 aiohttp 测试服务器上运行异步用例"""
+    web = pytest.importorskip("aiohttp.web")
+    from aiohttp.test_utils import TestServer
+    
+    async def main():
+        app = web.Application()
+        for method, path, handler in handlers:
+            app.router.add_route(method, path, handler)
+        async with TestServer(app) as server:
+            return await scenario(str(server.make_url("")))
+    
+    return asyncio.run(main())
+
+
+class TestAsyncTapdataClient:
+    """测试 AsyncTapdataClient"""
+    
+    def test_list_and_table_relation(self):
+        """测试异步查询任务和表映射关系"""
+        from aiohttp import web
+        from tapdata_sdk import AsyncTapdataClient
+        
+        async def list_tasks(request):
+            assert request.query["access_token"] == "test-token"
+            return web.json_response({"code": "ok", "data": {"items": [
+                {"id": "task1", "name": "Sync Task", "type": "sync", "status": "running"}
+            ]}})
+        
+        async def get_task(request):
+            return web.json_response({"code": "ok", "data": {
+                "id": "task1", "name": "Sync Task", "type": "sync", "status": "running",
+                "dag": {"nodes": [
+                    {"id": "n1", "connectionId": "conn1"},
+                    {"id": "n2", "connectionId": "conn2", "syncObjects": [
+                        {"tableNameRelation": {"a": "b"}}
+                    ]},
+                ]},
+            }})
+        
+        async def get_connection(request):
+            conn_id = request.match_info["id"]
+            return web.json_response({"code": "ok", "data": {
+                "id": conn_id, "name": conn_id, "connection_type": "source",
+                "status": "ready", "config": {"host": "localhost"},
+            }})
+        
+        events = []
+        
+        async def scenario(base_url):
+            async with AsyncTapdataClient(base_url, access_token="test-token") as client:
+                client.add_request_hook(after=events.append)
+                tasks = await client.tasks.list()
+                relation = await client.tasks.get_table_relation("task1")
+            return tasks, relation
+        
+        tasks, relation = _run_with_server(
+            [
+                ("GET", "/api/Task", list_tasks),
+                ("GET", "/api/Task/{id}", get_task),
+                ("GET", "/api/Connections/{id}", get_connection),
+            ],
+            scenario,
+        )
+        
+        assert isinstance(tasks[0], Task)
+        assert tasks[0].status == "running"
+        assert relation.table_name_relation == {"a": "b"}
+        assert relation.source_conn.id == "conn1"
+        assert relation.target_conn.id == "conn2"
+        assert events[0].endpoint == "/api/Task"
+        assert events[0].status == 200
+        assert events[0].bytes_received > 0
+        assert {"server", "download", "decode", "total"} <= set(events[0].timings)
+    
+    def test_auth_error(self):
+        """测试业务错误码映射到异常"""
+        from aiohttp import web
+        from tapdata_sdk import AsyncTapdataClient
+        
+        async def get_connection(request):
+            return web.json_response({"code": "UNAUTHORIZED", "message": "denied"})
+        
+        async def scenario(base_url):
+            async with AsyncTapdataClient(base_url) as client:
+                with pytest.raises(TapdataAuthError):
+                    await client.connections.get("conn1")
+        
+        _run_with_server([("GET", "/api/Connections/{id}", get_connection)], scenario)
+    
+    def test_logins_are_serialized(self):
+        """测试并发登录在认证锁下依次执行"""
+        from aiohttp import web
+        from tapdata_sdk import AsyncTapdataClient
+        
+        in_flight = []
+        peak = []
+        
+        async def timestamp(request):
+            return web.json_response({"code": "ok", "data": 1234567890})
+        
+        async def login(request):
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.02)
+            in_flight.pop()
+            return web.json_response({"code": "ok", "data": {"id": f"token-{len(peak)}"}})
+        
+        async def scenario(base_url):
+            async with AsyncTapdataClient(base_url) as client:
+                await asyncio.gather(*(
+                    client.login("admin@test.com", "password") for _ in range(3)
+                ))
+                return client.access_token
+        
+        token = _run_with_server(
+            [("GET", "/api/timeStamp", timestamp), ("POST", "/api/users/login", login)],
+            scenario,
+        )
+        
+        assert max(peak) == 1
+        assert token == "token-3"
+    
+    def test_star_import_without_aiohttp(self):
+        """测试未安装 aiohttp 时 import * 不会失败且不包含异步客户端"""
+        import subprocess
+        import sys
+        
+        code = (
+            "import sys; sys.modules['aiohttp'] = None\n"
+            "from tapdata_sdk import *\n"
+            "assert 'TapdataClient' in dir() and 'AsyncTapdataClient' not in dir()\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+    
+    def test_batch_concurrency_is_bounded(self):
+        """测试批量操作同时在途的分块数受 max_concurrency 限制"""
+        from aiohttp import web
+        from tapdata_sdk import AsyncTapdataClient
+        
+        in_flight = []
+        peak = []
+        
+        async def batch_stop(request):
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.02)
+            in_flight.pop()
+            return web.json_response({"code": "ok", "data": []})
+        
+        async def scenario(base_url):
+            async with AsyncTapdataClient(base_url, access_token="test-token") as client:
+                return await client.tasks.stop_many(
+                    [f"task{i}" for i in range(10)],
+                    max_batch_size=1,
+                    max_concurrency=2,
+                )
+        
+        results = _run_with_server([("PUT", "/api/Task/batchStop", batch_stop)], scenario)
+        
+        assert [r.task_id for r in results] == [f"task{i}" for i in range(10)]
+        assert len(peak) == 10
+        assert max(peak) == 2
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])